@@ -0,0 +1,67 @@
+# benchmarks/bench_fact_queries.py
+"""Latencia de las consultas de queries/ contra sus versiones en queries/fact/.
+
+Uso:
+    python benchmarks/bench_fact_queries.py [--db RUTA_SQLITE] [--repeat N]
+
+La base debe estar cargada con load() (que materializa fact_order_items).
+"""
+import argparse
+import sys
+from pathlib import Path
+from time import perf_counter
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from pandas import read_sql
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+
+from src.config import SQLITE_BD_ABSOLUTE_PATH
+from src.star_schema import build_fact_order_items
+from src.transform import QueryEnum, read_query
+
+
+def best_time(database: Engine, query_name: str, repeat: int) -> float:
+    """Mejor tiempo (segundos) de `repeat` ejecuciones de una consulta."""
+    query = read_query(query_name)
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        read_sql(query, database)
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main(db_path: str, repeat: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    start = perf_counter()
+    rows = build_fact_order_items(engine)
+    elapsed = perf_counter() - start
+    print(f"fact_order_items: {rows} filas construidas en {elapsed:.2f}s")
+
+    print(f"{'consulta':<40} {'original':>10} {'fact':>10} {'speedup':>8}")
+    total_old = total_new = 0.0
+    for query in QueryEnum:
+        old = best_time(engine, query.value, repeat)
+        new = best_time(engine, f"fact/{query.value}", repeat)
+        total_old += old
+        total_new += new
+        print(
+            f"{query.value:<40} {old * 1000:>8.1f}ms {new * 1000:>8.1f}ms "
+            f"{old / new:>7.1f}x"
+        )
+    print(
+        f"{'TOTAL':<40} {total_old * 1000:>8.1f}ms {total_new * 1000:>8.1f}ms "
+        f"{total_old / total_new:>7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=SQLITE_BD_ABSOLUTE_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.db, args.repeat)
@@ -0,0 +1,80 @@
+# benchmarks/bench_load.py
+"""Compara la carga con DataFrame.to_sql contra la carga masiva de src.sqlite_bulk.
+
+Uso:
+    python benchmarks/bench_load.py [--dataset CARPETA] [--repeat N]
+
+Cada corrida carga las nueve tablas de Olist en una base SQLite nueva en disco.
+"""
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Dict
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+
+from pandas import DataFrame
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+
+from src.config import DATASET_ROOT_PATH, get_csv_to_table_mapping
+from src.extract import extract
+from src.load import TABLE_NAME_MAPPING, get_sql_dtypes
+from src.sqlite_bulk import bulk_load
+
+
+def load_with_to_sql(data_frames: Dict[str, DataFrame], database: Engine) -> None:
+    """Camino anterior: to_sql con la configuración por defecto."""
+    for table_name, df in data_frames.items():
+        df.to_sql(
+            name=TABLE_NAME_MAPPING.get(table_name, table_name),
+            con=database,
+            if_exists="replace",
+            index=False,
+            dtype=get_sql_dtypes(table_name),
+        )
+
+
+def load_with_bulk(data_frames: Dict[str, DataFrame], database: Engine) -> None:
+    bulk_load(data_frames, database, TABLE_NAME_MAPPING)
+
+
+def time_loader(
+    loader: Callable[[Dict[str, DataFrame], Engine], None],
+    data_frames: Dict[str, DataFrame],
+    repeat: int,
+) -> float:
+    """Mejor tiempo (segundos) de `repeat` cargas en bases nuevas."""
+    best = float("inf")
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            engine = create_engine(f"sqlite:///{tmp_dir}/bench.db")
+            start = perf_counter()
+            loader(data_frames, engine)
+            best = min(best, perf_counter() - start)
+            engine.dispose()
+    return best
+
+
+def main(dataset: str, repeat: int) -> None:
+    data_frames = extract(dataset, get_csv_to_table_mapping(), None)
+    rows = sum(len(df) for df in data_frames.values())
+    print(f"{len(data_frames)} tablas, {rows} filas (mejor de {repeat})")
+
+    results = {}
+    for name, loader in (("to_sql", load_with_to_sql), ("bulk", load_with_bulk)):
+        results[name] = time_loader(loader, data_frames, repeat)
+        rate = rows / results[name]
+        print(f"{name:>8}: {results[name]:8.2f}s  ({rate:,.0f} filas/s)")
+    print(f" speedup: {results['to_sql'] / results['bulk']:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dataset", default=DATASET_ROOT_PATH)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    main(args.dataset, args.repeat)
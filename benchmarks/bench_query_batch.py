@@ -0,0 +1,83 @@
+# benchmarks/bench_query_batch.py
+"""Latencia de las nueve consultas de queries/ por separado contra el plan por lotes.
+
+Uso:
+    python benchmarks/bench_query_batch.py [--db RUTA_SQLITE] [--repeat N]
+
+El plan por lotes (src.transform.run_query_batch, el que usa run_queries() sobre
+las tablas crudas) construye una vez la base de pedidos entregados y evalúa
+sobre ella las cinco consultas que la comparten.
+La caché de resultados se desactiva para medir solo la ejecución en SQLite.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+os.environ["QUERY_CACHE_ENABLED"] = "0"
+
+from pandas import read_sql
+from sqlalchemy import create_engine
+
+from src.config import SQLITE_BD_ABSOLUTE_PATH
+from src.transform import QUERY_BATCHES, QueryEnum, read_query, run_query_batch
+
+
+def main(db_path: str, repeat: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    best_independent = best_batched = float("inf")
+    independent_timings = {}
+    batched_timings = {}
+    for _ in range(repeat):
+        timings = {}
+        start = perf_counter()
+        for query in QueryEnum:
+            query_start = perf_counter()
+            read_sql(read_query(query.value), engine)
+            timings[query.value] = perf_counter() - query_start
+        elapsed = perf_counter() - start
+        if elapsed < best_independent:
+            best_independent, independent_timings = elapsed, timings
+
+        timings = {}
+        start = perf_counter()
+        batched = set()
+        for base_name, queries in QUERY_BATCHES.items():
+            run_query_batch(engine, base_name, queries, timings)
+            batched.update(query.value for query in queries)
+        for query in QueryEnum:
+            if query.value not in batched:
+                query_start = perf_counter()
+                read_sql(read_query(query.value), engine)
+                timings[query.value] = perf_counter() - query_start
+        elapsed = perf_counter() - start
+        if elapsed < best_batched:
+            best_batched, batched_timings = elapsed, timings
+
+    print(f"{'consulta':<40} {'separada':>10} {'lote':>10}")
+    for base_name in QUERY_BATCHES:
+        print(
+            f"{base_name + ' (base)':<40} {'':>10} "
+            f"{batched_timings[base_name] * 1000:>8.1f}ms"
+        )
+    for query in QueryEnum:
+        print(
+            f"{query.value:<40} {independent_timings[query.value] * 1000:>8.1f}ms "
+            f"{batched_timings[query.value] * 1000:>8.1f}ms"
+        )
+    print(
+        f"{'TOTAL':<40} {best_independent * 1000:>8.1f}ms "
+        f"{best_batched * 1000:>8.1f}ms {best_independent / best_batched:>7.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=SQLITE_BD_ABSOLUTE_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.db, args.repeat)
@@ -0,0 +1,69 @@
+# benchmarks/bench_query_engines.py
+"""Latencia de cada consulta con el motor "sql" y con el motor "pandas".
+
+Uso:
+    python benchmarks/bench_query_engines.py [--db RUTA_SQLITE] [--repeat N]
+
+Para cada consulta de src.transform.get_all_queries() mide el mejor tiempo con
+cada motor, verifica que ambos devuelvan lo mismo y muestra el más rápido, para
+elegir el valor de src.transform.QUERY_ENGINES por consulta.
+La caché de resultados se desactiva para medir la ejecución real.
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from time import perf_counter
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+os.environ["QUERY_CACHE_ENABLED"] = "0"
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from src.config import SQLITE_BD_ABSOLUTE_PATH
+from src.transform import get_all_queries
+
+
+def best_time(query, database, engine: str, repeat: int):
+    """Mejor tiempo (segundos) de `repeat` ejecuciones y el último resultado."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        query_result = query(database, engine)
+        best = min(best, perf_counter() - start)
+    return best, query_result.result
+
+
+def same_result(sql_df: pd.DataFrame, pandas_df: pd.DataFrame) -> bool:
+    try:
+        pd.testing.assert_frame_equal(
+            sql_df, pandas_df, check_dtype=False, check_exact=False, rtol=0, atol=0.011
+        )
+    except AssertionError:
+        return False
+    return True
+
+
+def main(db_path: str, repeat: int) -> None:
+    database = create_engine(f"sqlite:///{db_path}")
+
+    print(f"{'consulta':<40} {'sql':>10} {'pandas':>10} {'igual':>6} {'motor':>7}")
+    for query in get_all_queries():
+        sql_time, sql_df = best_time(query, database, "sql", repeat)
+        pandas_time, pandas_df = best_time(query, database, "pandas", repeat)
+        faster = "sql" if sql_time <= pandas_time else "pandas"
+        print(
+            f"{query.__name__.replace('query_', ''):<40} "
+            f"{sql_time * 1000:>8.1f}ms {pandas_time * 1000:>8.1f}ms "
+            f"{'sí' if same_result(sql_df, pandas_df) else 'NO':>6} {faster:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", default=SQLITE_BD_ABSOLUTE_PATH)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.db, args.repeat)
@@ -0,0 +1,288 @@
+# benchmarks/bench_scale.py
+"""Escalabilidad del pipeline con datos sintéticos de Olist a distintas escalas.
+
+Uso:
+    python benchmarks/bench_scale.py [--scales 1 10 100] [--repeat N]
+        [--workdir CARPETA] [--output RESULTADO.json] [--compare ANTERIOR.json]
+
+Para cada factor de escala genera el dataset con src.synthetic (sin conexión:
+los feriados también son sintéticos), y mide extract, load, cada consulta de
+QueryEnum, transform completo (también en modo particionado, src.partitioned)
+y las consultas que lee el dashboard. De cada fase se registra el tiempo de
+reloj y de CPU, y el pico de memoria residente (RSS) del proceso durante esa
+fase. El resultado se guarda en JSON junto con el
+commit y las versiones del entorno, para comparar corridas con --compare.
+Los datasets generados se reutilizan entre corridas si no cambian escala,
+semilla ni el generador.
+"""
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter, process_time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, no se registra el pico de RSS
+    resource = None
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.append(str(PROJECT_ROOT))
+os.environ["QUERY_CACHE_ENABLED"] = "0"
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from src.cache import fingerprint, hash_file
+from src.config import EXTRACT_EXECUTOR, EXTRACT_MAX_WORKERS, get_csv_to_table_mapping
+from src.dashboard_cube import dashboard_frames, get_filter_options
+from src.dashboard_data import DashboardData
+from src.extract import extract
+from src.load import load
+from src.partitioned import run_partitioned
+from src.synthetic import (
+    GENERATOR_CHUNK_ROWS,
+    generate_dataset,
+    synthetic_public_holidays,
+)
+from src.transform import get_all_queries, run_queries
+
+# Marca que deja cada dataset generado, con la huella de sus parámetros
+DATASET_MARKER = "_synthetic.json"
+
+
+def reset_peak_rss() -> None:
+    """Reinicia el pico de RSS del proceso (Linux); en otros sistemas no hace nada."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de RSS desde el último reset_peak_rss (o desde que arrancó el proceso)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024**2 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(fn: Callable[[], Any], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Ejecuta `fn` `repeat` veces y devuelve el mejor tiempo de reloj, el tiempo
+    de CPU de esa ejecución, el pico de RSS y el resultado de la última.
+    """
+    best: Optional[Dict[str, float]] = None
+    reset_peak_rss()
+    for _ in range(repeat):
+        wall, cpu = perf_counter(), process_time()
+        result = fn()
+        wall, cpu = perf_counter() - wall, process_time() - cpu
+        if best is None or wall < best["wall_s"]:
+            best = {"wall_s": round(wall, 4), "cpu_s": round(cpu, 4)}
+    return {**best, "peak_rss_mb": peak_rss_mb(), "result": result}
+
+
+def prepare_dataset(csv_folder: Path, scale: float, seed: int) -> Dict[str, Any]:
+    """Genera el dataset de una escala, salvo que ya exista con iguales parámetros."""
+    params = {
+        "scale": scale,
+        "seed": seed,
+        "chunk_rows": GENERATOR_CHUNK_ROWS,
+        "generator": hash_file(PROJECT_ROOT / "src" / "synthetic.py"),
+    }
+    marker = csv_folder / DATASET_MARKER
+    if marker.exists():
+        with open(marker, "r", encoding="utf-8") as f:
+            previous = json.load(f)
+        if previous["fingerprint"] == fingerprint(params):
+            return {**previous["generate"], "reused": True}
+
+    stats = measure(lambda: generate_dataset(str(csv_folder), scale, seed))
+    generate = {
+        "wall_s": stats["wall_s"],
+        "cpu_s": stats["cpu_s"],
+        "peak_rss_mb": stats["peak_rss_mb"],
+        "rows": stats["result"],
+        "csv_mb": round(
+            sum(p.stat().st_size for p in csv_folder.glob("*.csv")) / 1024**2, 1
+        ),
+    }
+    with open(marker, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint(params), "generate": generate}, f)
+    return {**generate, "reused": False}
+
+
+def bench_scale(workdir: Path, scale: float, seed: int, repeat: int) -> Dict[str, Any]:
+    """Mide todas las fases del pipeline para un factor de escala."""
+    csv_folder = workdir / f"sf{scale:g}"
+    stages: Dict[str, Dict[str, Any]] = {}
+    print(f"🔹 escala {scale:g}: generando datos en {csv_folder}...")
+    generate = prepare_dataset(csv_folder, scale, seed)
+    rows = generate.pop("rows")
+    stages["generate"] = generate
+
+    def run_extract():
+        data_frames = extract(
+            str(csv_folder),
+            get_csv_to_table_mapping(),
+            None,
+            max_workers=EXTRACT_MAX_WORKERS,
+            executor=EXTRACT_EXECUTOR,
+        )
+        data_frames["public_holidays"] = synthetic_public_holidays()
+        return data_frames
+
+    stats = measure(run_extract)
+    data_frames = stats.pop("result")
+    stats["memory_mb"] = round(
+        sum(df.memory_usage(deep=True).sum() for df in data_frames.values())
+        / 1024**2,
+        1,
+    )
+    stages["extract"] = stats
+
+    db_path = csv_folder / "bench.db"
+    db_path.unlink(missing_ok=True)
+    database = create_engine(f"sqlite:///{db_path}")
+    stats = measure(lambda: load(data_frames, database))
+    stats.pop("result")
+    stats["db_mb"] = round(db_path.stat().st_size / 1024**2, 1)
+    stages["load"] = stats
+    del data_frames
+
+    queries = {}
+    for query in get_all_queries():
+        stats = measure(lambda: query(database), repeat)
+        query_result = stats.pop("result")
+        stats["rows"] = len(query_result.result)
+        queries[query_result.query] = stats
+
+    stats = measure(lambda: run_queries(database), repeat)
+    stats.pop("result")
+    stages["transform"] = stats
+
+    # Primer snapshot del dashboard (src.dashboard_data), sin el hilo de refresco
+    dashboard = DashboardData(str(db_path))
+    stats = measure(lambda: DashboardData(str(db_path)).refresh(), repeat)
+    stats.pop("result")
+    stages["dashboard"] = stats
+
+    # Un cambio de filtros del dashboard: cortar y volver a agregar el cubo
+    dashboard.refresh()
+    cube = dashboard.snapshot().cube
+    options = get_filter_options(cube)
+    stats = measure(
+        lambda: dashboard_frames(
+            cube, options["year"][-1:], options["state"][:3], options["category"][:5]
+        ),
+        repeat,
+    )
+    stats.pop("result")
+    stages["dashboard_filter"] = stats
+
+    # Al final: el modo particionado reemplaza la tabla de hechos y los rollups
+    stats = measure(lambda: run_partitioned(database), repeat)
+    stats.pop("result")
+    stages["partitioned"] = stats
+
+    dashboard.stop()
+    database.dispose()
+    db_path.unlink(missing_ok=True)
+    for stage, values in stages.items():
+        print(f"   {stage:<16} {values['wall_s']:>9.2f}s  {values['peak_rss_mb']} MB")
+    return {"rows": rows, "stages": stages, "queries": queries}
+
+
+def get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], previous: Dict[str, Any]) -> None:
+    """Muestra la relación de tiempos (actual / anterior) de cada fase y consulta."""
+    print(f"comparando con {previous.get('commit')} ({previous.get('created_at')})")
+    print(f"{'escala':>6} {'fase':<40} {'anterior':>10} {'actual':>10} {'ratio':>7}")
+    for scale, result in current["scales"].items():
+        before = previous["scales"].get(scale)
+        if before is None:
+            continue
+        for group in ("stages", "queries"):
+            for name, values in result[group].items():
+                old = before[group].get(name)
+                if old is None or not old["wall_s"]:
+                    continue
+                ratio = values["wall_s"] / old["wall_s"]
+                print(
+                    f"{scale:>6} {name:<40} {old['wall_s']:>9.3f}s "
+                    f"{values['wall_s']:>9.3f}s {ratio:>6.2f}x"
+                )
+
+
+def main(
+    scales, seed: int, repeat: int, workdir: str, output: str, baseline: Optional[str]
+) -> None:
+    workdir_path = Path(workdir)
+    workdir_path.mkdir(parents=True, exist_ok=True)
+    result = {
+        "commit": get_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "seed": seed,
+        "repeat": repeat,
+        "scales": {
+            f"{scale:g}": bench_scale(workdir_path, scale, seed, repeat)
+            for scale in scales
+        },
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(f"✅ resultados en {output}")
+
+    if baseline:
+        with open(baseline, "r", encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--workdir", default=str(Path(tempfile.gettempdir()) / "olist_bench")
+    )
+    parser.add_argument("--output", default="bench_scale.json")
+    parser.add_argument("--compare", dest="baseline")
+    args = parser.parse_args()
+    main(args.scales, args.seed, args.repeat, args.workdir, args.output, args.baseline)
@@ -1,186 +1,77 @@
 # dashboard/app.py
+import sys
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-import pandas as pd
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
-
-from dash import Dash, dcc, html
+from dash import Dash, Input, Output, State, dcc, html, no_update
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import plotly.graph_objects as go
 
 # ------------------------------------------------------------------------------
 # Config
 # ------------------------------------------------------------------------------
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
-QUERIES_DIR = PROJECT_ROOT / "queries"
 DEFAULT_DB_PATH = PROJECT_ROOT / "olist_dw_debug.db"  # DB fija en disco
-
-SQL_FILES = {
-    "revenue_by_month_year": "revenue_by_month_year.sql",
-    "top_10_revenue_categories": "top_10_revenue_categories.sql",
-    "top_10_least_revenue_categories": "top_10_least_revenue_categories.sql",
-    "delivery_date_difference": "delivery_date_difference.sql",
-    "real_vs_estimated_delivered_time": "real_vs_estimated_delivered_time.sql",
-}
+sys.path.append(str(PROJECT_ROOT))
+
+from src.config import DASHBOARD_REFRESH_SECONDS
+from src.dashboard_cube import dashboard_frames, get_filter_options
+from src.dashboard_data import DashboardData, DashboardSnapshot
+from src.dashboard_figures import (
+    GRAPHS,
+    build_dashboard_figures,
+    build_error_figures,
+)
 
 # ------------------------------------------------------------------------------
 # Data helpers
 # ------------------------------------------------------------------------------
-def get_engine(db_path: Path = DEFAULT_DB_PATH) -> Engine:
-    if not db_path.exists():
-        raise FileNotFoundError(
-            f"No se encontró la base de datos en {db_path}.\n"
-            "Genera olist_dw_debug.db antes de abrir el dashboard."
-        )
-    return create_engine(f"sqlite:///{db_path}")
-
-def run_sql_file(engine: Engine, sql_filename: str) -> pd.DataFrame:
-    file_path = QUERIES_DIR / sql_filename
-    if not file_path.exists():
-        raise FileNotFoundError(f"No existe el archivo SQL: {file_path}")
-    with open(file_path, "r", encoding="utf-8") as f:
-        sql_text = f.read()
-    return pd.read_sql_query(text(sql_text), engine)
-
-def safe_df(fn, *args, **kwargs) -> Tuple[pd.DataFrame, str]:
-    try:
-        df = fn(*args, **kwargs)
-        return df, ""
-    except Exception as e:
-        return pd.DataFrame(), f"{type(e).__name__}: {e}"
-
-def empty_figure_with_message(title: str, msg: str) -> go.Figure:
-    fig = go.Figure()
-    fig.add_annotation(
-        text=f"<b>{title}</b><br>{msg}",
-        showarrow=False, x=0.5, y=0.5, xref="paper", yref="paper", align="center"
-    )
-    fig.update_layout(margin=dict(l=40, r=40, t=60, b=40), template="simple_white")
-    return fig
+# Cubo en memoria por versión de datos; nada se lee al importar el módulo: el
+# primer callback carga el snapshot publicado por el pipeline (src.publish, sin
+# tocar SQLite) o, si no hay, arma el cubo desde la DB, y arranca el refresco.
+# Los filtros se resuelven sobre el cubo
+data = DashboardData(str(DEFAULT_DB_PATH))
 
 # ------------------------------------------------------------------------------
-# Figures
+# Figuras por versión de datos y filtros (se construyen en los callbacks;
+# los constructores están en src/dashboard_figures.py)
 # ------------------------------------------------------------------------------
-def figure_revenue_heatmap(df: pd.DataFrame) -> go.Figure:
-    if df.empty:
-        return empty_figure_with_message("Revenue por mes/año", "Sin datos")
-    if "month_no" in df.columns:
-        df = df.sort_values("month_no")
-    year_cols = [c for c in df.columns if c.startswith("Year")] or \
-                [c for c in df.columns if any(y in c for y in ["2016","2017","2018"])]
-    months = df["month"].tolist() if "month" in df.columns else df["month_no"].tolist()
-    z = df[year_cols].T.values
-    fig = go.Figure(data=go.Heatmap(
-        z=z, x=months, y=year_cols,
-        colorbar=dict(title="Revenue"),
-        hovertemplate="Mes: %{x}<br>Año: %{y}<br>Revenue: %{z:.2f}<extra></extra>"
-    ))
-    fig.update_layout(
-        title="Revenue por mes (2016–2018)",
-        xaxis_title="Mes", yaxis_title="Año",
-        margin=dict(l=24, r=16, t=50, b=24), template="simple_white",
-    )
-    return fig
-
-def figure_top_categories(df: pd.DataFrame, title: str) -> go.Figure:
-    if df.empty:
-        return empty_figure_with_message(title, "Sin datos")
-    sort_col = "Revenue" if "Revenue" in df.columns else df.columns[-1]
-    df = df.sort_values(sort_col, ascending=False)
-    fig = px.bar(
-        df, x="Revenue", y="Category", orientation="h",
-        hover_data=[c for c in df.columns if c not in ["Category","Revenue"]],
-        template="simple_white",
-    )
-    fig.update_layout(
-        title=title, xaxis_title="Revenue", yaxis_title="Categoría",
-        margin=dict(l=24, r=16, t=50, b=24), bargap=0.15,
-    )
-    return fig
-
-def figure_bottom_categories(df: pd.DataFrame, title: str) -> go.Figure:
-    if df.empty:
-        return empty_figure_with_message(title, "Sin datos")
-    sort_col = "Revenue" if "Revenue" in df.columns else df.columns[-1]
-    df = df.sort_values(sort_col, ascending=True)
-    fig = px.bar(
-        df, x="Revenue", y="Category", orientation="h",
-        hover_data=[c for c in df.columns if c not in ["Category","Revenue"]],
-        template="simple_white",
-    )
-    fig.update_layout(
-        title=title, xaxis_title="Revenue", yaxis_title="Categoría",
-        margin=dict(l=24, r=16, t=50, b=24), bargap=0.15,
-    )
-    return fig
-
-def figure_delivery_diff(df: pd.DataFrame) -> go.Figure:
-    if df.empty:
-        return empty_figure_with_message("Diferencia estimado vs real por estado", "Sin datos")
-    df = df.sort_values(["Delivery_Difference","State"], ascending=[True, True])
-    fig = px.bar(df, x="Delivery_Difference", y="State", orientation="h", template="simple_white")
-    fig.update_layout(
-        title="Diferencia entre fecha estimada y entrega real (días) por estado",
-        xaxis_title="(+) Antes de lo estimado | (−) Después",
-        yaxis_title="Estado",
-        margin=dict(l=24, r=16, t=50, b=24), bargap=0.15,
-    )
-    return fig
-
-def figure_real_vs_estimated(df: pd.DataFrame) -> go.Figure:
-    if df.empty:
-        return empty_figure_with_message("Tiempo real vs estimado", "Sin datos")
-    def find_col(options: List[str]) -> str:
-        for opt in options:
-            for c in df.columns:
-                if opt == c.lower():
-                    return c
-        return ""
-    month_col = find_col(["month","mes","month_name"]) or \
-                next((c for c in df.columns if "month" in c.lower() or "mes" in c.lower()), df.columns[0])
-    real_col  = find_col(["real","real_days","real_time","real_delivery_time"]) or \
-                next((c for c in df.columns if "real" in c.lower()), df.columns[1])
-    est_col   = find_col(["estimated","estimated_days","estimated_time","estimated_delivery_time"]) or \
-                next((c for c in df.columns if "estim" in c.lower()), df.columns[2 if len(df.columns)>2 else 1])
-
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(x=df[month_col], y=df[real_col], mode="lines+markers", name="Real"))
-    fig.add_trace(go.Scatter(x=df[month_col], y=df[est_col],  mode="lines+markers", name="Estimado"))
-    fig.update_layout(
-        title="Tiempo de entrega: Real vs Estimado",
-        xaxis_title="Mes", yaxis_title="Días",
-        margin=dict(l=24, r=16, t=50, b=24), template="simple_white",
+# Figuras ya construidas en este worker por (versión, filtros); se vacía al
+# cambiar la versión o al llegar a FIGURE_CACHE_SIZE combinaciones
+FIGURE_CACHE_SIZE = 128
+_figures: Dict[tuple, Tuple[Any, ...]] = {}
+
+def build_figures(
+    snapshot: DashboardSnapshot,
+    years: Optional[List[int]] = None,
+    states: Optional[List[str]] = None,
+    categories: Optional[List[str]] = None,
+) -> Tuple[Any, ...]:
+    """
+    Figuras de un snapshot para los filtros dados (listas vacías: sin filtro).
+    Sin filtros se sirven las figuras publicadas, si el snapshot las trae.
+    """
+    key = (
+        snapshot.version,
+        tuple(sorted(years or [])),
+        tuple(sorted(states or [])),
+        tuple(sorted(categories or [])),
     )
-    return fig
-
-# ------------------------------------------------------------------------------
-# Carga una vez y construye figuras
-# ------------------------------------------------------------------------------
-engine = None
-try:
-    engine = get_engine(DEFAULT_DB_PATH)
-except Exception as e:
-    err = f"{type(e).__name__}: {e}"
-    fig1 = empty_figure_with_message("Revenue por mes/año", err)
-    fig2 = empty_figure_with_message("Top 10 categorías por Revenue", err)
-    fig3 = empty_figure_with_message("Bottom 10 categorías por Revenue", err)
-    fig4 = empty_figure_with_message("Diferencia estimado vs real por estado", err)
-    fig5 = empty_figure_with_message("Tiempo real vs estimado", err)
-else:
-    df_rev_heat, err1 = safe_df(run_sql_file, engine, SQL_FILES["revenue_by_month_year"])
-    df_top10,    err2 = safe_df(run_sql_file, engine, SQL_FILES["top_10_revenue_categories"])
-    df_bottom10, err3 = safe_df(run_sql_file, engine, SQL_FILES["top_10_least_revenue_categories"])
-    df_deliv,    err4 = safe_df(run_sql_file, engine, SQL_FILES["delivery_date_difference"])
-    df_realest,  err5 = safe_df(run_sql_file, engine, SQL_FILES["real_vs_estimated_delivered_time"])
-
-    fig1 = figure_revenue_heatmap(df_rev_heat) if not err1 else empty_figure_with_message("Revenue por mes/año", err1)
-    fig2 = figure_top_categories(df_top10, "Top 10 categorías por Revenue") if not err2 else empty_figure_with_message("Top 10 categorías por Revenue", err2)
-    fig3 = figure_bottom_categories(df_bottom10, "Bottom 10 categorías por Revenue") if not err3 else empty_figure_with_message("Bottom 10 categorías por Revenue", err3)
-    fig4 = figure_delivery_diff(df_deliv) if not err4 else empty_figure_with_message("Diferencia estimado vs real por estado", err4)
-    fig5 = figure_real_vs_estimated(df_realest) if not err5 else empty_figure_with_message("Tiempo real vs estimado", err5)
+    figures = _figures.get(key)
+    if figures is not None:
+        return figures
+    if snapshot.cube is None:
+        by_id = build_error_figures(snapshot.error)
+    elif snapshot.figures is not None and not any([years, states, categories]):
+        by_id = snapshot.figures
+    else:
+        by_id = build_dashboard_figures(
+            dashboard_frames(snapshot.cube, years, states, categories)
+        )
+    figures = tuple(by_id[graph_id] for graph_id, *_ in GRAPHS)
+    if len(_figures) >= FIGURE_CACHE_SIZE or any(k[0] != key[0] for k in _figures):
+        _figures.clear()
+    _figures[key] = figures
+    return figures
 
 # ------------------------------------------------------------------------------
 # App (Bootstrap)
@@ -220,18 +111,24 @@ navbar = dbc.Navbar(
 )
 
 # Cards helper
-def graph_card(title: str, figure: go.Figure, icon: str = "bi-bar-chart"):
+def graph_card(title: str, graph_id: str, icon: str = "bi-bar-chart"):
     return dbc.Card(
         [
             dbc.CardHeader(
                 html.Span([html.I(className=f"{icon} me-2"), title]),
                 className="fw-semibold",
             ),
-            dbc.CardBody(dcc.Graph(figure=figure, config={"displayModeBar": False})),
+            dbc.CardBody(
+                dcc.Loading(dcc.Graph(id=graph_id, config={"displayModeBar": False}))
+            ),
         ],
         class_name="shadow-sm h-100",
     )
 
+# Filtros: multi-selección; vacío = todos
+def filter_dropdown(filter_id: str, placeholder: str):
+    return dcc.Dropdown(id=filter_id, multi=True, placeholder=placeholder)
+
 # Layout con grid Bootstrap
 app.layout = dbc.Container(
     [
@@ -246,42 +143,106 @@ app.layout = dbc.Container(
             ),
             class_name="mb-2",
         ),
+        # Filtros (año, estado del cliente, categoría), resueltos sobre el cubo
+        dbc.Row(
+            [
+                dbc.Col(filter_dropdown("filter-year", "Año (todos)"), width=2),
+                dbc.Col(filter_dropdown("filter-state", "Estado (todos)"), width=4),
+                dbc.Col(filter_dropdown("filter-category", "Categoría (todas)"), width=6),
+            ],
+            class_name="mb-3",
+        ),
         # Fila 1: heatmap ancho
         dbc.Row(
             [
-                dbc.Col(graph_card("Revenue por mes (2016–2018)", fig1, "bi-grid-1x2"), width=12),
+                dbc.Col(graph_card("Revenue por mes (2016–2018)", "graph-revenue-heatmap", "bi-grid-1x2"), width=12),
             ],
             class_name="mb-3",
         ),
         # Fila 2: Top / Bottom categorías
         dbc.Row(
             [
-                dbc.Col(graph_card("Top 10 categorías por Revenue", fig2, "bi-trophy"), width=6),
-                dbc.Col(graph_card("Bottom 10 categorías por Revenue", fig3, "bi-arrow-down"), width=6),
+                dbc.Col(graph_card("Top 10 categorías por Revenue", "graph-top-categories", "bi-trophy"), width=6),
+                dbc.Col(graph_card("Bottom 10 categorías por Revenue", "graph-bottom-categories", "bi-arrow-down"), width=6),
             ],
             class_name="mb-3",
         ),
         # Fila 3: Entregas (dos gráficos)
         dbc.Row(
             [
-                dbc.Col(graph_card("Diferencia estimado vs real por estado", fig4, "bi-truck"), width=6),
-                dbc.Col(graph_card("Tiempo de entrega: Real vs Estimado", fig5, "bi-stopwatch"), width=6),
+                dbc.Col(graph_card("Diferencia estimado vs real por estado", "graph-delivery-diff", "bi-truck"), width=6),
+                dbc.Col(graph_card("Tiempo de entrega: Real vs Estimado", "graph-real-vs-estimated", "bi-stopwatch"), width=6),
             ],
             class_name="mb-4",
         ),
         dbc.Row(
             dbc.Col(
                 html.Footer(
-                    html.Small("Fuente: Olist (SQLite) · Dashboard estático — regenerar DB para actualizar."),
+                    html.Small(id="data-status"),
                     className="text-muted",
                 ),
                 width=12,
             )
         ),
+        # Versión de datos que muestra la página; el intervalo la vuelve a pedir
+        dcc.Store(id="data-version"),
+        dcc.Interval(id="refresh-interval", interval=DASHBOARD_REFRESH_SECONDS * 1000),
     ],
     fluid=True,
     class_name="py-2",
 )
 
+# ------------------------------------------------------------------------------
+# Callbacks
+# ------------------------------------------------------------------------------
+@app.callback(
+    Output("data-version", "data"),
+    Input("refresh-interval", "n_intervals"),
+    State("data-version", "data"),
+)
+def poll_data_version(_, current: Optional[dict]):
+    # Solo lee el snapshot en memoria: el hilo de refresco es el que consulta
+    snapshot = data.snapshot()
+    if current is not None and current["version"] == snapshot.version:
+        return no_update
+    return {"version": snapshot.version}
+
+@app.callback(
+    Output("filter-year", "options"),
+    Output("filter-state", "options"),
+    Output("filter-category", "options"),
+    Input("data-version", "data"),
+)
+def update_filter_options(version: Optional[dict]):
+    snapshot = data.snapshot()
+    if version is None or snapshot.cube is None:
+        return [], [], []
+    options = get_filter_options(snapshot.cube)
+    return options["year"], options["state"], options["category"]
+
+@app.callback(
+    [Output(graph_id, "figure") for graph_id, *_ in GRAPHS]
+    + [Output("data-status", "children")],
+    Input("data-version", "data"),
+    Input("filter-year", "value"),
+    Input("filter-state", "value"),
+    Input("filter-category", "value"),
+)
+def update_figures(
+    version: Optional[dict],
+    years: Optional[List[int]],
+    states: Optional[List[str]],
+    categories: Optional[List[str]],
+):
+    if version is None:
+        return [no_update] * (len(GRAPHS) + 1)
+    snapshot = data.snapshot()
+    status = (
+        "Fuente: Olist (SQLite) · Datos del "
+        f"{snapshot.refreshed_at.isoformat(sep=' ', timespec='seconds')} "
+        f"— se actualizan solos cada {DASHBOARD_REFRESH_SECONDS:g}s."
+    )
+    return [*build_figures(snapshot, years, states, categories), status]
+
 if __name__ == "__main__":
     app.run_server(debug=True)
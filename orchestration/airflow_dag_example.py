@@ -1,18 +1,100 @@
+import re
 from datetime import datetime, timedelta
+from pathlib import Path
 from airflow import DAG
 from airflow.operators.python import PythonOperator
-from src import extract, load, transform
+from sqlalchemy import create_engine
+from src import artifacts, checkpoints, extract, load, publish, transform
+from src.config import (
+    ARTIFACT_ROOT_PATH,
+    DATASET_ROOT_PATH,
+    QUERY_ENGINE,
+    SQLITE_BD_ABSOLUTE_PATH,
+    get_csv_to_table_mapping,
+)
+from src.query_cache import get_data_version
+
+# Cada tarea registra su checkpoint (src.checkpoints) en la base: un reintento o
+# una nueva ejecución omite las tareas que ya terminaron con las mismas entradas
 
 def run_extract(**kwargs):
-    return extract.run_all()
+    # Solo se extraen las tablas cuyo csv cambió desde la última carga
+    engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+    fingerprints = load.get_changed_tables(
+        engine, DATASET_ROOT_PATH, get_csv_to_table_mapping()
+    )
+    kwargs['ti'].xcom_push(key='fingerprints', value=fingerprints)
+    tables = set(fingerprints)
+    if tables:
+        tables.add('public_holidays')
+    # Las tablas viajan como archivos en ARTIFACT_ROOT_PATH/<run_id>; por XCom
+    # solo pasa el manifiesto (rutas, sha256 y filas)
+    run_dir = Path(ARTIFACT_ROOT_PATH) / re.sub(r"[^\w.-]", "_", kwargs['run_id'])
+    # Si una ejecución anterior ya extrajo estas mismas fuentes y sus archivos
+    # siguen ahí, se reutiliza su manifiesto
+    previous = checkpoints.get_checkpoint(engine, 'extract') or {}
+    artifacts_exist = all(
+        Path(entry['path']).exists()
+        for entry in (previous.get('output') or {}).values()
+    )
+    _, manifest = checkpoints.run_checkpointed(
+        engine,
+        'extract',
+        checkpoints.fingerprint({'tables': sorted(tables), 'sources': fingerprints}),
+        lambda: artifacts.write_artifacts(
+            extract.run_all(tables=tables), str(run_dir)
+        ),
+        force=not artifacts_exist,
+    )
+    return manifest
 
 def run_load(**kwargs):
     ti = kwargs['ti']
-    data_frames = ti.xcom_pull(task_ids='extract_task')
-    load.run_all(data_frames=data_frames)
+    manifest = ti.xcom_pull(task_ids='extract_task')
+    fingerprints = ti.xcom_pull(task_ids='extract_task', key='fingerprints')
+    engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+    checkpoints.run_checkpointed(
+        engine,
+        'load',
+        checkpoints.fingerprint(
+            {table: entry['sha256'] for table, entry in manifest.items()}
+        ),
+        lambda: load.run_artifacts(
+            manifest, fingerprints=fingerprints, engine=engine
+        ),
+    )
 
 def run_transform(**kwargs):
-    transform.run_all()
+    engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+    checkpoints.run_checkpointed(
+        engine,
+        'transform',
+        checkpoints.fingerprint(
+            {
+                'data_version': get_data_version(engine),
+                'queries': checkpoints.get_queries_fingerprint(),
+                'query_engine': QUERY_ENGINE,
+            }
+        ),
+        lambda: transform.run_all(engine=engine),
+        output=lambda results: {name: len(df) for name, df in results.items()},
+    )
+
+def run_publish(**kwargs):
+    engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+    checkpoints.run_checkpointed(
+        engine,
+        'publish',
+        checkpoints.fingerprint(
+            {
+                'data_version': get_data_version(engine),
+                'queries': checkpoints.get_queries_fingerprint(),
+                'format': publish.SNAPSHOT_FORMAT,
+            }
+        ),
+        lambda: publish.run_all(engine=engine),
+        output=lambda path: path.name,
+    )
 
 default_args = {
     'owner': 'Carlos Gomez',
@@ -44,4 +126,9 @@ with DAG(
         python_callable=run_transform
     )
 
-    extract_task >> load_task >> transform_task
+    publish_task = PythonOperator(
+        task_id='publish_task',
+        python_callable=run_publish
+    )
+
+    extract_task >> load_task >> transform_task >> publish_task
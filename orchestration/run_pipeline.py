@@ -1,6 +1,7 @@
 # orchestration/run_pipeline.py
 import sys
 import os
+import argparse
 from pathlib import Path
 
 # ✅ Asegura acceso a la carpeta src/
@@ -8,9 +9,29 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.append(str(PROJECT_ROOT))
 
 from datetime import datetime
-import time
+from functools import partial
+import json
 import logging
-from src import extract, load, transform
+from time import perf_counter
+from typing import Any, Callable, Optional, Tuple
+from pandas import DataFrame
+from sqlalchemy import create_engine
+from src import checkpoints, export, extract, load, partitioned, publish, transform
+from src.config import (
+    DATASET_ROOT_PATH,
+    EXPORT_FORMAT,
+    PARTITION_BY,
+    PARTITION_MAX_WORKERS,
+    QUERY_ENGINE,
+    SQLITE_BD_ABSOLUTE_PATH,
+    get_csv_to_table_mapping,
+)
+from src.query_cache import get_data_version
+
+try:
+    import resource
+except ImportError:  # Windows: sin getrusage, no se registra el pico de RSS
+    resource = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -19,22 +40,222 @@ logging.basicConfig(
     filemode="a"
 )
 
-def main():
+def cpu_seconds() -> float:
+    """Tiempo de CPU (usuario + sistema) del proceso y de sus hijos terminados."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+def peak_rss_mb() -> Optional[float]:
+    """Pico de memoria residente del proceso (o de un hijo) hasta ahora, en MB."""
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # ru_maxrss está en bytes en macOS y en KB en Linux
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def count_rows(result: Any) -> Optional[int]:
+    """Filas de un dict {tabla: DataFrame} o {tabla: filas} devuelto por una fase."""
+    if not isinstance(result, dict):
+        return None
+    return sum(
+        len(value) if isinstance(value, DataFrame) else int(value)
+        for value in result.values()
+    )
+
+def run_stage(
+    stage: str,
+    fn: Callable[[], Any],
+    rows: Callable[[Any], Optional[int]] = count_rows,
+) -> Any:
+    """
+    Ejecuta una fase y registra en pipeline_log.txt una línea JSON con su
+    estado, tiempo de reloj y de CPU, pico de RSS y filas procesadas.
+    """
+    wall_start, cpu_start = perf_counter(), cpu_seconds()
+    status, result = "error", None
+    try:
+        result = fn()
+        status = "ok"
+        return result
+    finally:
+        record = {
+            "event": "stage",
+            "stage": stage,
+            "status": status,
+            "wall_s": round(perf_counter() - wall_start, 3),
+            "cpu_s": round(cpu_seconds() - cpu_start, 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "rows": rows(result) if status == "ok" else None,
+        }
+        logging.info(json.dumps(record, ensure_ascii=False))
+
+def run_step(
+    engine,
+    stage: str,
+    input_fingerprint: str,
+    fn: Callable[[], Any],
+    rows: Callable[[Any], Optional[int]] = count_rows,
+    force: bool = False,
+) -> Tuple[bool, Any]:
+    """
+    Fase con checkpoint (src.checkpoints) y métricas (run_stage): se omite si
+    ya terminó con la misma huella de entrada y force es False. Devuelve
+    (se ejecutó, resultado).
+    """
+    ran, result = checkpoints.run_checkpointed(
+        engine,
+        stage,
+        input_fingerprint,
+        lambda: run_stage(stage, fn, rows),
+        output=rows,
+        force=force,
+    )
+    if not ran:
+        logging.info(
+            json.dumps({"event": "stage", "stage": stage, "status": "skipped"})
+        )
+    return ran, result
+
+def main(
+    stream: bool = False,
+    use_cache: bool = True,
+    incremental: bool = False,
+    resume: bool = True,
+    use_partitions: bool = False,
+):
+    """
+    Ejecuta el pipeline. Con resume=True retoma desde la primera fase que no
+    terminó o cuyas entradas cambiaron (src.checkpoints); las siguientes se
+    ejecutan siempre. Con use_partitions=True las tablas resumen se construyen
+    en la fase de transformación, en paralelo por partición (src.partitioned),
+    en lugar de al final de la carga.
+    """
     start_time = datetime.now()
     logging.info("🚀 Inicio del pipeline ELT")
+    # Una sola conexión para todas las fases
+    engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
 
     try:
-        logging.info("🔹 Fase 1: Extracción de datos")
-        extract.run_all()
-        time.sleep(1)
+        force = not resume
+        sources = checkpoints.get_sources_fingerprint(
+            DATASET_ROOT_PATH, get_csv_to_table_mapping()
+        )
+        if incremental or stream:
+            mode = "incremental" if incremental else "stream"
+            logging.info(f"🔹 Fases 1+2: Extracción y carga ({mode})")
+            if incremental:
+                run = partial(load.run_incremental, use_cache=use_cache, engine=engine)
+            else:
+                run = partial(load.run_stream, engine=engine)
+            load_fingerprint = checkpoints.fingerprint({"mode": mode, **sources})
+            ran, _ = run_step(
+                engine,
+                "extract+load",
+                load_fingerprint,
+                run,
+                force=force,
+            )
+            force = force or ran
+        else:
+            extract_fingerprint = checkpoints.fingerprint({"mode": "full", **sources})
+            load_fingerprint = checkpoints.fingerprint(
+                {"extract": extract_fingerprint, "build_derived": not use_partitions}
+            )
+            # Los DataFrames de extract viven solo en memoria: si hay que cargar,
+            # también hay que volver a extraer
+            force = force or not checkpoints.is_stage_done(
+                engine, "load", load_fingerprint
+            )
+
+            logging.info("🔹 Fase 1: Extracción de datos")
+            ran, data_frames = run_step(
+                engine,
+                "extract",
+                extract_fingerprint,
+                lambda: extract.run_all(use_cache=use_cache),
+                force=force,
+            )
+            force = force or ran
+
+            logging.info("🔹 Fase 2: Carga de datos al Data Warehouse (SQLite)")
+            # Los DataFrames de extract pasan tal cual a load, sin copias
+            ran, _ = run_step(
+                engine,
+                "load",
+                load_fingerprint,
+                lambda: load.run_all(
+                    data_frames=data_frames,
+                    engine=engine,
+                    build_derived=not use_partitions,
+                ),
+                rows=lambda _: count_rows(data_frames),
+                force=force,
+            )
+            force = force or ran
+            del data_frames
 
-        logging.info("🔹 Fase 2: Carga de datos al Data Warehouse (SQLite)")
-        load.run_all()
-        time.sleep(1)
+        queries = checkpoints.get_queries_fingerprint()
+        data_version = get_data_version(engine)
 
         logging.info("🔹 Fase 3: Transformación SQL")
-        transform.run_all()
-        time.sleep(1)
+        if use_partitions:
+            # El modo particionado reescribe las tablas resumen y cambia la versión
+            # de datos (bump_data_version): su entrada es la carga, no la versión
+            transform_inputs = {
+                "load": load_fingerprint,
+                "partition_by": PARTITION_BY,
+                "workers": PARTITION_MAX_WORKERS,
+            }
+            run = partial(partitioned.run_all, engine=engine)
+        else:
+            transform_inputs = {
+                "data_version": data_version,
+                "query_engine": QUERY_ENGINE,
+            }
+            run = partial(transform.run_all, engine=engine)
+        ran, _ = run_step(
+            engine,
+            "transform",
+            checkpoints.fingerprint({"queries": queries, **transform_inputs}),
+            run,
+            force=force,
+        )
+        force = force or ran
+        data_version = get_data_version(engine)
+
+        logging.info("🔹 Fase 4: Publicación del snapshot del dashboard")
+        ran, _ = run_step(
+            engine,
+            "publish",
+            checkpoints.fingerprint(
+                {
+                    "data_version": data_version,
+                    "queries": queries,
+                    "format": publish.SNAPSHOT_FORMAT,
+                }
+            ),
+            lambda: publish.run_all(engine=engine),
+            force=force,
+        )
+        force = force or ran
+
+        logging.info("🔹 Fase 5: Exportación de resultados (Parquet / Arrow IPC)")
+        run_step(
+            engine,
+            "export",
+            checkpoints.fingerprint(
+                {
+                    "data_version": data_version,
+                    "queries": queries,
+                    "format": EXPORT_FORMAT,
+                }
+            ),
+            lambda: export.run_all(engine=engine),
+            force=force,
+        )
 
         end_time = datetime.now()
         logging.info(f"✅ Pipeline completado exitosamente en {end_time - start_time}")
@@ -42,5 +263,41 @@ def main():
     except Exception as e:
         logging.error(f"❌ Error en el pipeline: {e}")
 
+    finally:
+        engine.dispose()
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Pipeline ELT Olist")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Extrae y carga cada csv por chunks con memoria acotada",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignora la caché columnar y vuelve a parsear todos los csv",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Recarga solo las tablas cuyo csv cambió desde la última carga",
+    )
+    parser.add_argument(
+        "--no-resume",
+        action="store_true",
+        help="Ignora los checkpoints y ejecuta todas las fases",
+    )
+    parser.add_argument(
+        "--partitioned",
+        action="store_true",
+        help="Construye las tablas resumen en paralelo, una partición por proceso",
+    )
+    args = parser.parse_args()
+    main(
+        stream=args.stream,
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+        resume=not args.no_resume,
+        use_partitions=args.partitioned,
+    )
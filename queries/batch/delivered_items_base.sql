@@ -0,0 +1,23 @@
+-- delivered_items_base.sql
+-- Base compartida del lote de pedidos entregados: ítems de pedidos con estado
+-- 'delivered' unidos a cliente, producto y traducción de la categoría. Se
+-- materializa una vez como tabla temporal y cada consulta del lote la filtra.
+SELECT
+  o.order_id,
+  oi.order_item_id,
+  oi.product_id,
+  oi.price,
+  oi.freight_value,
+  CASE WHEN o.order_delivered_customer_date IS NOT NULL THEN 1 ELSE 0 END AS has_delivery_date,
+  o.order_approved_at_year AS approved_year,
+  o.order_approved_at_month AS approved_month,
+  c.customer_state,
+  t.product_category_name_english AS category,
+  p.product_weight_g
+FROM olist_orders_dataset AS o
+JOIN olist_order_items_dataset AS oi USING (order_id)
+LEFT JOIN olist_customers_dataset AS c ON c.customer_id = o.customer_id
+LEFT JOIN olist_products_dataset AS p ON p.product_id = oi.product_id
+LEFT JOIN product_category_name_translation AS t
+  ON t.product_category_name = p.product_category_name
+WHERE o.order_status = 'delivered';
@@ -0,0 +1,9 @@
+-- get_freight_value_weight_relationship.sql (sobre delivered_items_base)
+SELECT
+  product_id,
+  product_weight_g,
+  ROUND(AVG(freight_value), 2) AS avg_freight_value
+FROM delivered_items_base
+WHERE product_weight_g IS NOT NULL
+GROUP BY product_id, product_weight_g
+ORDER BY product_weight_g, avg_freight_value, product_id;
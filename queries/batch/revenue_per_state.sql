@@ -0,0 +1,10 @@
+-- revenue_per_state.sql (sobre delivered_items_base)
+SELECT
+  customer_state,
+  ROUND(SUM(price + freight_value), 2) AS Revenue
+FROM delivered_items_base
+WHERE has_delivery_date = 1
+  AND customer_state IS NOT NULL
+GROUP BY customer_state
+ORDER BY Revenue DESC, customer_state
+LIMIT 10;
@@ -0,0 +1,11 @@
+-- top_10_revenue_categories.sql (sobre delivered_items_base)
+SELECT
+  category AS Category,
+  COUNT(DISTINCT order_id) AS Num_order,
+  ROUND(SUM(COALESCE(price, 0)), 2) AS Revenue
+FROM delivered_items_base
+WHERE has_delivery_date = 1
+  AND category IS NOT NULL
+GROUP BY category
+ORDER BY Revenue DESC, Category
+LIMIT 10;
@@ -0,0 +1,59 @@
+-- cube_deliveries.sql
+-- Tiempos de entrega (en días) de los pedidos entregados por (año, mes de compra,
+-- estado del cliente, categoría): el cubo del dashboard para los gráficos de
+-- entregas. Un pedido con ítems de varias categorías aparece una vez en cada
+-- una; las filas con all_categories = 1 lo cuentan una sola vez y son las que
+-- se usan cuando no se filtra por categoría.
+WITH delivered AS (
+  SELECT
+    o.order_id,
+    o.order_purchase_timestamp_year AS year,
+    o.order_purchase_timestamp_month AS month,
+    c.customer_state AS state,
+    o.order_delivered_customer_date - o.order_purchase_timestamp AS real_days,
+    o.order_estimated_delivery_date - o.order_purchase_timestamp AS estimated_days,
+    CAST(o.order_estimated_delivery_date + 0.5 AS INT)
+      - CAST(o.order_delivered_customer_date + 0.5 AS INT) AS difference_days
+  FROM olist_orders_dataset AS o
+  LEFT JOIN olist_customers_dataset AS c
+    ON c.customer_id = o.customer_id
+  WHERE o.order_status = 'delivered'
+    AND o.order_delivered_customer_date IS NOT NULL
+    AND o.order_estimated_delivery_date IS NOT NULL
+),
+order_categories AS (
+  SELECT DISTINCT
+    oi.order_id,
+    t.product_category_name_english AS category
+  FROM olist_order_items_dataset AS oi
+  JOIN olist_products_dataset AS p USING (product_id)
+  JOIN product_category_name_translation AS t
+    ON t.product_category_name = p.product_category_name
+  WHERE t.product_category_name_english IS NOT NULL
+)
+SELECT
+  year,
+  month,
+  state,
+  NULL AS category,
+  1 AS all_categories,
+  COUNT(*) AS orders,
+  SUM(real_days) AS real_days_sum,
+  SUM(estimated_days) AS estimated_days_sum,
+  SUM(difference_days) AS difference_days_sum
+FROM delivered
+GROUP BY year, month, state
+UNION ALL
+SELECT
+  d.year,
+  d.month,
+  d.state,
+  oc.category,
+  0 AS all_categories,
+  COUNT(*) AS orders,
+  SUM(d.real_days) AS real_days_sum,
+  SUM(d.estimated_days) AS estimated_days_sum,
+  SUM(d.difference_days) AS difference_days_sum
+FROM delivered AS d
+JOIN order_categories AS oc USING (order_id)
+GROUP BY d.year, d.month, d.state, oc.category;
@@ -0,0 +1,23 @@
+-- cube_sales.sql
+-- Ventas de pedidos entregados por (año, mes de aprobación, estado del cliente,
+-- categoría): el cubo del dashboard para los ingresos por mes y por categoría.
+-- Cada pedido cae en un solo mes y un solo estado, así que orders se puede sumar
+-- entre celdas de la misma categoría sin contar dos veces un pedido.
+SELECT
+  o.order_approved_at_year AS year,
+  o.order_approved_at_month AS month,
+  c.customer_state AS state,
+  t.product_category_name_english AS category,
+  COUNT(DISTINCT o.order_id) AS orders,
+  SUM(COALESCE(oi.price, 0)) AS revenue,
+  SUM(oi.price + oi.freight_value) AS revenue_with_freight
+FROM olist_orders_dataset AS o
+JOIN olist_order_items_dataset AS oi USING (order_id)
+LEFT JOIN olist_customers_dataset AS c
+  ON c.customer_id = o.customer_id
+LEFT JOIN olist_products_dataset AS p USING (product_id)
+LEFT JOIN product_category_name_translation AS t
+  ON t.product_category_name = p.product_category_name
+WHERE o.order_status = 'delivered'
+  AND o.order_delivered_customer_date IS NOT NULL
+GROUP BY year, month, state, category;
@@ -16,10 +16,12 @@
 
 SELECT
   c.customer_state AS State,
+  -- Las fechas ya son día juliano (REAL): CAST(x + 0.5 AS INT) es el número de
+  -- día calendario, equivalente a JULIANDAY(DATE(x)) sin parsear texto por fila.
   CAST(
     AVG(
-      JULIANDAY(DATE(o.order_estimated_delivery_date))
-      - JULIANDAY(DATE(o.order_delivered_customer_date))
+      CAST(o.order_estimated_delivery_date + 0.5 AS INT)
+      - CAST(o.order_delivered_customer_date + 0.5 AS INT)
     ) AS INT
   ) AS Delivery_Difference
 FROM olist_orders_dataset AS o
@@ -0,0 +1,11 @@
+-- delivery_date_difference.sql (sobre fact_order_items)
+SELECT
+  customer_state AS State,
+  CAST(AVG(delivery_difference_days) AS INT) AS Delivery_Difference
+FROM fact_order_items
+WHERE is_order_row = 1
+  AND is_delivered = 1
+  AND customer_state IS NOT NULL
+  AND delivery_difference_days IS NOT NULL
+GROUP BY customer_state
+ORDER BY Delivery_Difference ASC, State;
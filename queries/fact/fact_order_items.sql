@@ -0,0 +1,44 @@
+-- fact_order_items.sql
+-- Tabla de hechos desnormalizada a nivel ítem de pedido. Los pedidos sin ítems
+-- (cancelados, no disponibles) conservan una fila con las columnas del ítem en NULL.
+-- is_order_row = 1 marca una sola fila por pedido para las métricas por pedido.
+-- Con el parámetro watermark (día juliano) solo se generan las filas de los pedidos
+-- comprados después de esa fecha; con NULL, las de todos los pedidos.
+SELECT
+  o.order_id,
+  oi.order_item_id,
+  oi.product_id,
+  o.customer_id,
+  c.customer_state,
+  o.order_status,
+  CASE
+    WHEN o.order_status = 'delivered' AND o.order_delivered_customer_date IS NOT NULL
+    THEN 1 ELSE 0
+  END AS is_delivered,
+  CASE
+    WHEN ROW_NUMBER() OVER (PARTITION BY o.order_id ORDER BY oi.order_item_id) = 1
+    THEN 1 ELSE 0
+  END AS is_order_row,
+  p.product_category_name,
+  t.product_category_name_english AS category,
+  DATE(o.order_purchase_timestamp) AS purchase_date,
+  o.order_purchase_timestamp_year AS purchase_year,
+  o.order_purchase_timestamp_month AS purchase_month,
+  o.order_approved_at_year AS approved_year,
+  o.order_approved_at_month AS approved_month,
+  o.order_delivered_customer_date
+    - o.order_purchase_timestamp AS real_delivery_days,
+  o.order_estimated_delivery_date
+    - o.order_purchase_timestamp AS estimated_delivery_days,
+  CAST(o.order_estimated_delivery_date + 0.5 AS INTEGER)
+    - CAST(o.order_delivered_customer_date + 0.5 AS INTEGER) AS delivery_difference_days,
+  oi.price,
+  oi.freight_value,
+  p.product_weight_g
+FROM olist_orders_dataset AS o
+LEFT JOIN olist_order_items_dataset AS oi USING (order_id)
+LEFT JOIN olist_customers_dataset AS c ON c.customer_id = o.customer_id
+LEFT JOIN olist_products_dataset AS p ON p.product_id = oi.product_id
+LEFT JOIN product_category_name_translation AS t
+  ON t.product_category_name = p.product_category_name
+WHERE :watermark IS NULL OR o.order_purchase_timestamp > :watermark;
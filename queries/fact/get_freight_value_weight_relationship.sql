@@ -0,0 +1,11 @@
+-- get_freight_value_weight_relationship.sql (sobre fact_order_items)
+SELECT
+  product_id,
+  product_weight_g,
+  ROUND(AVG(freight_value), 2) AS avg_freight_value
+FROM fact_order_items
+WHERE order_status = 'delivered'
+  AND order_item_id IS NOT NULL
+  AND product_weight_g IS NOT NULL
+GROUP BY product_id, product_weight_g
+ORDER BY product_weight_g, avg_freight_value, product_id;
@@ -0,0 +1,7 @@
+-- global_ammount_order_status.sql (sobre fact_order_items)
+SELECT
+  order_status,
+  SUM(is_order_row) AS Ammount
+FROM fact_order_items
+GROUP BY order_status
+ORDER BY order_status;
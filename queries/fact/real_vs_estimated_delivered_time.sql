@@ -0,0 +1,34 @@
+-- real_vs_estimated_delivered_time.sql (sobre fact_order_items)
+-- Un único GROUP BY por año/mes y pivot con CASE (sin subconsultas correlacionadas)
+WITH agg AS (
+  SELECT
+    purchase_year AS y,
+    purchase_month AS m,
+    AVG(real_delivery_days) AS avg_real,
+    AVG(estimated_delivery_days) AS avg_est
+  FROM fact_order_items
+  WHERE is_order_row = 1
+    AND is_delivered = 1
+    AND estimated_delivery_days IS NOT NULL
+  GROUP BY y, m
+),
+months(month_no, m, month) AS (
+  SELECT '01', 1, 'Jan' UNION ALL SELECT '02', 2, 'Feb' UNION ALL SELECT '03', 3, 'Mar' UNION ALL
+  SELECT '04', 4, 'Apr' UNION ALL SELECT '05', 5, 'May' UNION ALL SELECT '06', 6, 'Jun' UNION ALL
+  SELECT '07', 7, 'Jul' UNION ALL SELECT '08', 8, 'Aug' UNION ALL SELECT '09', 9, 'Sep' UNION ALL
+  SELECT '10', 10, 'Oct' UNION ALL SELECT '11', 11, 'Nov' UNION ALL SELECT '12', 12, 'Dec'
+)
+SELECT
+  months.month_no,
+  months.month,
+  ROUND(MAX(CASE WHEN agg.y = 2016 THEN agg.avg_real END), 2) AS Year2016_real_time,
+  ROUND(MAX(CASE WHEN agg.y = 2017 THEN agg.avg_real END), 2) AS Year2017_real_time,
+  ROUND(MAX(CASE WHEN agg.y = 2018 THEN agg.avg_real END), 2) AS Year2018_real_time,
+  ROUND(MAX(CASE WHEN agg.y = 2016 THEN agg.avg_est END), 2) AS Year2016_estimated_time,
+  ROUND(MAX(CASE WHEN agg.y = 2017 THEN agg.avg_est END), 2) AS Year2017_estimated_time,
+  ROUND(MAX(CASE WHEN agg.y = 2018 THEN agg.avg_est END), 2) AS Year2018_estimated_time
+FROM months
+LEFT JOIN agg
+  ON agg.m = months.m
+GROUP BY months.month_no, months.month
+ORDER BY months.month_no;
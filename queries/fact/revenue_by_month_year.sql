@@ -0,0 +1,37 @@
+-- revenue_by_month_year.sql (sobre fact_order_items)
+WITH base AS (
+  SELECT
+    approved_year AS y,
+    approved_month AS m,
+    SUM(COALESCE(price, 0)) AS revenue
+  FROM fact_order_items
+  WHERE is_delivered = 1
+    AND order_item_id IS NOT NULL
+    AND approved_year IS NOT NULL
+  GROUP BY y, m
+),
+months(month_no, m, month) AS (
+  SELECT '01', 1, 'Jan' UNION ALL
+  SELECT '02', 2, 'Feb' UNION ALL
+  SELECT '03', 3, 'Mar' UNION ALL
+  SELECT '04', 4, 'Apr' UNION ALL
+  SELECT '05', 5, 'May' UNION ALL
+  SELECT '06', 6, 'Jun' UNION ALL
+  SELECT '07', 7, 'Jul' UNION ALL
+  SELECT '08', 8, 'Aug' UNION ALL
+  SELECT '09', 9, 'Sep' UNION ALL
+  SELECT '10', 10, 'Oct' UNION ALL
+  SELECT '11', 11, 'Nov' UNION ALL
+  SELECT '12', 12, 'Dec'
+)
+SELECT
+  months.month_no,
+  months.month,
+  ROUND(COALESCE(MAX(CASE WHEN base.y = 2016 THEN base.revenue END), 0), 2) AS Year2016,
+  ROUND(COALESCE(MAX(CASE WHEN base.y = 2017 THEN base.revenue END), 0), 2) AS Year2017,
+  ROUND(COALESCE(MAX(CASE WHEN base.y = 2018 THEN base.revenue END), 0), 2) AS Year2018
+FROM months
+LEFT JOIN base
+  ON base.m = months.m
+GROUP BY months.month_no, months.month
+ORDER BY months.month_no;
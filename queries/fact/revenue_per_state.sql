@@ -0,0 +1,11 @@
+-- revenue_per_state.sql (sobre fact_order_items)
+SELECT
+  customer_state,
+  ROUND(SUM(price + freight_value), 2) AS Revenue
+FROM fact_order_items
+WHERE is_delivered = 1
+  AND order_item_id IS NOT NULL
+  AND customer_state IS NOT NULL
+GROUP BY customer_state
+ORDER BY Revenue DESC, customer_state
+LIMIT 10;
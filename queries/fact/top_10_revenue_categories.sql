@@ -0,0 +1,11 @@
+-- top_10_revenue_categories.sql (sobre fact_order_items)
+SELECT
+  category AS Category,
+  COUNT(DISTINCT order_id) AS Num_order,
+  ROUND(SUM(COALESCE(price, 0)), 2) AS Revenue
+FROM fact_order_items
+WHERE is_delivered = 1
+  AND category IS NOT NULL
+GROUP BY category
+ORDER BY Revenue DESC, Category
+LIMIT 10;
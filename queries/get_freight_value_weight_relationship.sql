@@ -8,4 +8,4 @@ JOIN olist_orders_dataset AS o USING (order_id)
 WHERE o.order_status = 'delivered'
   AND p.product_weight_g IS NOT NULL
 GROUP BY p.product_id, p.product_weight_g
-ORDER BY p.product_weight_g, avg_freight_value;
+ORDER BY p.product_weight_g, avg_freight_value, p.product_id;
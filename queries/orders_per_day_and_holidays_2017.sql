@@ -4,19 +4,23 @@ WITH RECURSIVE days(d) AS (
   SELECT date(d, '+1 day') FROM days WHERE d < date('2017-12-31')
 ),
 orders_2017 AS (
-  SELECT date(o.order_purchase_timestamp) AS d, o.order_id
+  SELECT
+    date(o.order_purchase_timestamp) AS d,
+    COUNT(DISTINCT o.order_id) AS num_orders
   FROM olist_orders_dataset AS o
-  WHERE strftime('%Y', o.order_purchase_timestamp) = '2017'
+  WHERE o.order_purchase_timestamp_year = 2017
+  GROUP BY d
 ),
 holidays AS (
-  SELECT date AS d FROM public_holidays WHERE strftime('%Y', date) = '2017'
+  SELECT DISTINCT date(date) AS d
+  FROM public_holidays
+  WHERE strftime('%Y', date) = '2017'
 )
 SELECT
   days.d AS date,
-  COUNT(DISTINCT orders_2017.order_id) AS num_orders,
+  COALESCE(orders_2017.num_orders, 0) AS num_orders,
   CASE WHEN holidays.d IS NOT NULL THEN 1 ELSE 0 END AS is_holiday
 FROM days
 LEFT JOIN orders_2017 ON orders_2017.d = days.d
 LEFT JOIN holidays   ON holidays.d   = days.d
-GROUP BY days.d
 ORDER BY days.d;
\ No newline at end of file
@@ -0,0 +1,9 @@
+-- orders_per_day.sql (rango de años)
+-- Pedidos por día de compra dentro del rango de años de los parámetros.
+SELECT
+  date(o.order_purchase_timestamp) AS date,
+  COUNT(*) AS order_count
+FROM olist_orders_dataset AS o
+WHERE o.order_purchase_timestamp_year BETWEEN :start_year AND :end_year
+GROUP BY date(o.order_purchase_timestamp)
+ORDER BY date;
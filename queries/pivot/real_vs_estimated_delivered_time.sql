@@ -0,0 +1,15 @@
+-- real_vs_estimated_delivered_time.sql (agregado para pivotear por año)
+-- Tiempos promedio real y estimado de entrega (en días) por año/mes de compra,
+-- en una sola pasada; src.transform.pivot_month_year() arma las columnas
+-- Year<año>_real_time y Year<año>_estimated_time.
+SELECT
+  o.order_purchase_timestamp_year AS y,
+  o.order_purchase_timestamp_month AS m,
+  ROUND(AVG(o.order_delivered_customer_date - o.order_purchase_timestamp), 2) AS real_time,
+  ROUND(AVG(o.order_estimated_delivery_date - o.order_purchase_timestamp), 2) AS estimated_time
+FROM olist_orders_dataset AS o
+WHERE o.order_status = 'delivered'
+  AND o.order_delivered_customer_date IS NOT NULL
+  AND o.order_estimated_delivery_date IS NOT NULL
+  AND o.order_purchase_timestamp_year BETWEEN :start_year AND :end_year
+GROUP BY y, m;
@@ -0,0 +1,13 @@
+-- revenue_by_month_year.sql (agregado para pivotear por año)
+-- Ingresos de pedidos entregados por año/mes de aprobación, en una sola pasada;
+-- src.transform.pivot_month_year() arma las columnas Year<año>.
+SELECT
+  o.order_approved_at_year AS y,
+  o.order_approved_at_month AS m,
+  ROUND(SUM(COALESCE(oi.price, 0)), 2) AS revenue
+FROM olist_orders_dataset AS o
+JOIN olist_order_items_dataset AS oi USING (order_id)
+WHERE o.order_status = 'delivered'
+  AND o.order_delivered_customer_date IS NOT NULL
+  AND o.order_approved_at_year BETWEEN :start_year AND :end_year
+GROUP BY y, m;
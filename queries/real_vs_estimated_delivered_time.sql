@@ -17,42 +17,40 @@
 
 
 -- Tiempos real vs estimado por mes y año (2016-2018)
+-- Un solo GROUP BY por año/mes y pivote con CASE (sin subconsultas por fila);
+-- para otros rangos de años ver src.transform.query_year_pivot().
 
-WITH months(month_no, month) AS (
-  SELECT '01','Jan' UNION ALL SELECT '02','Feb' UNION ALL SELECT '03','Mar' UNION ALL
-  SELECT '04','Apr' UNION ALL SELECT '05','May' UNION ALL SELECT '06','Jun' UNION ALL
-  SELECT '07','Jul' UNION ALL SELECT '08','Aug' UNION ALL SELECT '09','Sep' UNION ALL
-  SELECT '10','Oct' UNION ALL SELECT '11','Nov' UNION ALL SELECT '12','Dec'
+WITH months(month_no, month, m) AS (
+  SELECT '01','Jan',1 UNION ALL SELECT '02','Feb',2 UNION ALL SELECT '03','Mar',3 UNION ALL
+  SELECT '04','Apr',4 UNION ALL SELECT '05','May',5 UNION ALL SELECT '06','Jun',6 UNION ALL
+  SELECT '07','Jul',7 UNION ALL SELECT '08','Aug',8 UNION ALL SELECT '09','Sep',9 UNION ALL
+  SELECT '10','Oct',10 UNION ALL SELECT '11','Nov',11 UNION ALL SELECT '12','Dec',12
 ),
-orders_clean AS (
-  -- Órdenes únicas con tiempos (en días)
-  SELECT DISTINCT
-    o.order_id,
-    strftime('%Y', o.order_purchase_timestamp) AS y,
-    strftime('%m', o.order_purchase_timestamp) AS m,
-    (julianday(o.order_delivered_customer_date) - julianday(o.order_purchase_timestamp)) AS real_days,
-    (julianday(o.order_estimated_delivery_date) - julianday(o.order_purchase_timestamp)) AS est_days
+agg AS (
+  -- Tiempos promedio (en días) por año/mes de compra; las fechas ya son día juliano
+  SELECT
+    o.order_purchase_timestamp_year AS y,
+    o.order_purchase_timestamp_month AS m,
+    AVG(o.order_delivered_customer_date - o.order_purchase_timestamp) AS avg_real,
+    AVG(o.order_estimated_delivery_date - o.order_purchase_timestamp) AS avg_est
   FROM olist_orders_dataset AS o
   WHERE o.order_status = 'delivered'
     AND o.order_delivered_customer_date IS NOT NULL
     AND o.order_estimated_delivery_date IS NOT NULL
-),
-agg AS (
-  SELECT
-    y, m,
-    AVG(real_days) AS avg_real,
-    AVG(est_days)  AS avg_est
-  FROM orders_clean
+    AND o.order_purchase_timestamp_year BETWEEN 2016 AND 2018
   GROUP BY y, m
 )
 SELECT
   months.month_no,
   months.month,
-  ROUND((SELECT avg_real FROM agg WHERE y='2016' AND m=months.month_no), 2) AS Year2016_real_time,
-  ROUND((SELECT avg_real FROM agg WHERE y='2017' AND m=months.month_no), 2) AS Year2017_real_time,
-  ROUND((SELECT avg_real FROM agg WHERE y='2018' AND m=months.month_no), 2) AS Year2018_real_time,
-  ROUND((SELECT avg_est  FROM agg WHERE y='2016' AND m=months.month_no), 2) AS Year2016_estimated_time,
-  ROUND((SELECT avg_est  FROM agg WHERE y='2017' AND m=months.month_no), 2) AS Year2017_estimated_time,
-  ROUND((SELECT avg_est  FROM agg WHERE y='2018' AND m=months.month_no), 2) AS Year2018_estimated_time
+  ROUND(MAX(CASE WHEN agg.y = 2016 THEN agg.avg_real END), 2) AS Year2016_real_time,
+  ROUND(MAX(CASE WHEN agg.y = 2017 THEN agg.avg_real END), 2) AS Year2017_real_time,
+  ROUND(MAX(CASE WHEN agg.y = 2018 THEN agg.avg_real END), 2) AS Year2018_real_time,
+  ROUND(MAX(CASE WHEN agg.y = 2016 THEN agg.avg_est END), 2) AS Year2016_estimated_time,
+  ROUND(MAX(CASE WHEN agg.y = 2017 THEN agg.avg_est END), 2) AS Year2017_estimated_time,
+  ROUND(MAX(CASE WHEN agg.y = 2018 THEN agg.avg_est END), 2) AS Year2018_estimated_time
 FROM months
+LEFT JOIN agg
+  ON agg.m = months.m
+GROUP BY months.month_no, months.month
 ORDER BY months.month_no;
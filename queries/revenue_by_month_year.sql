@@ -12,8 +12,8 @@
 -- Ingresos por mes y año (2016–2018) basados en pagos efectivos
 WITH base AS (
   SELECT
-    strftime('%Y', o.order_approved_at) AS y,
-    strftime('%m', o.order_approved_at) AS m,
+    o.order_approved_at_year AS y,
+    o.order_approved_at_month AS m,
     SUM(COALESCE(oi.price, 0)) AS revenue
   FROM olist_orders_dataset AS o
   JOIN olist_order_items_dataset AS oi USING (order_id)
@@ -22,28 +22,28 @@ WITH base AS (
     AND o.order_approved_at IS NOT NULL
   GROUP BY y, m
 ),
-months(month_no, month) AS (
-  SELECT '01', 'Jan' UNION ALL
-  SELECT '02', 'Feb' UNION ALL
-  SELECT '03', 'Mar' UNION ALL
-  SELECT '04', 'Apr' UNION ALL
-  SELECT '05', 'May' UNION ALL
-  SELECT '06', 'Jun' UNION ALL
-  SELECT '07', 'Jul' UNION ALL
-  SELECT '08', 'Aug' UNION ALL
-  SELECT '09', 'Sep' UNION ALL
-  SELECT '10', 'Oct' UNION ALL
-  SELECT '11', 'Nov' UNION ALL
-  SELECT '12', 'Dec'
+months(month_no, month, m) AS (
+  SELECT '01', 'Jan', 1 UNION ALL
+  SELECT '02', 'Feb', 2 UNION ALL
+  SELECT '03', 'Mar', 3 UNION ALL
+  SELECT '04', 'Apr', 4 UNION ALL
+  SELECT '05', 'May', 5 UNION ALL
+  SELECT '06', 'Jun', 6 UNION ALL
+  SELECT '07', 'Jul', 7 UNION ALL
+  SELECT '08', 'Aug', 8 UNION ALL
+  SELECT '09', 'Sep', 9 UNION ALL
+  SELECT '10', 'Oct', 10 UNION ALL
+  SELECT '11', 'Nov', 11 UNION ALL
+  SELECT '12', 'Dec', 12
 )
 SELECT
   months.month_no,
   months.month,
-  ROUND(COALESCE(MAX(CASE WHEN base.y = '2016' AND base.m = months.month_no THEN base.revenue END), 0), 2) AS Year2016,
-  ROUND(COALESCE(MAX(CASE WHEN base.y = '2017' AND base.m = months.month_no THEN base.revenue END), 0), 2) AS Year2017,
-  ROUND(COALESCE(MAX(CASE WHEN base.y = '2018' AND base.m = months.month_no THEN base.revenue END), 0), 2) AS Year2018
+  ROUND(COALESCE(MAX(CASE WHEN base.y = 2016 AND base.m = months.m THEN base.revenue END), 0), 2) AS Year2016,
+  ROUND(COALESCE(MAX(CASE WHEN base.y = 2017 AND base.m = months.m THEN base.revenue END), 0), 2) AS Year2017,
+  ROUND(COALESCE(MAX(CASE WHEN base.y = 2018 AND base.m = months.m THEN base.revenue END), 0), 2) AS Year2018
 FROM months
 LEFT JOIN base
-  ON base.m = months.month_no
+  ON base.m = months.m
 GROUP BY months.month_no, months.month
 ORDER BY months.month_no;
\ No newline at end of file
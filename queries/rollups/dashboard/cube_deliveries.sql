@@ -0,0 +1,12 @@
+-- cube_deliveries.sql (sobre rollup_deliveries_monthly)
+SELECT
+  purchase_year AS year,
+  purchase_month AS month,
+  customer_state AS state,
+  category,
+  all_categories,
+  order_count AS orders,
+  real_delivery_days_sum AS real_days_sum,
+  estimated_delivery_days_sum AS estimated_days_sum,
+  delivery_difference_days_sum AS difference_days_sum
+FROM rollup_deliveries_monthly;
@@ -0,0 +1,12 @@
+-- cube_sales.sql (sobre rollup_sales_daily)
+SELECT
+  approved_year AS year,
+  approved_month AS month,
+  customer_state AS state,
+  category,
+  SUM(order_count) AS orders,
+  SUM(COALESCE(item_revenue, 0)) AS revenue,
+  SUM(item_revenue + freight_value) AS revenue_with_freight
+FROM rollup_sales_daily
+WHERE is_delivered = 1
+GROUP BY year, month, state, category;
@@ -0,0 +1,11 @@
+-- delivery_date_difference.sql (sobre rollup_orders_daily)
+SELECT
+  customer_state AS State,
+  CAST(
+    SUM(delivery_difference_days_sum) * 1.0 / SUM(delivery_difference_count) AS INT
+  ) AS Delivery_Difference
+FROM rollup_orders_daily
+WHERE customer_state IS NOT NULL
+GROUP BY customer_state
+HAVING SUM(delivery_difference_count) > 0
+ORDER BY Delivery_Difference ASC, State;
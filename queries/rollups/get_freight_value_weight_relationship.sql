@@ -0,0 +1,8 @@
+-- get_freight_value_weight_relationship.sql (sobre rollup_product_freight)
+SELECT
+  product_id,
+  product_weight_g,
+  ROUND(freight_value / item_count, 2) AS avg_freight_value
+FROM rollup_product_freight
+WHERE product_weight_g IS NOT NULL
+ORDER BY product_weight_g, avg_freight_value, product_id;
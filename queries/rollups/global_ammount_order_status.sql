@@ -0,0 +1,7 @@
+-- global_ammount_order_status.sql (sobre rollup_orders_daily)
+SELECT
+  order_status,
+  SUM(order_count) AS Ammount
+FROM rollup_orders_daily
+GROUP BY order_status
+ORDER BY order_status;
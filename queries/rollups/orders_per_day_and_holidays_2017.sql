@@ -0,0 +1,24 @@
+-- orders_per_day_and_holidays_2017.sql (sobre rollup_orders_daily)
+WITH RECURSIVE days(d) AS (
+  SELECT date('2017-01-01')
+  UNION ALL
+  SELECT date(d, '+1 day') FROM days WHERE d < date('2017-12-31')
+),
+orders_2017 AS (
+  SELECT purchase_date AS d, SUM(order_count) AS num_orders
+  FROM rollup_orders_daily
+  WHERE purchase_year = 2017
+  GROUP BY purchase_date
+),
+holidays AS (
+  SELECT date(date) AS d FROM public_holidays WHERE strftime('%Y', date) = '2017'
+)
+SELECT
+  days.d AS date,
+  COALESCE(MAX(orders_2017.num_orders), 0) AS num_orders,
+  CASE WHEN holidays.d IS NOT NULL THEN 1 ELSE 0 END AS is_holiday
+FROM days
+LEFT JOIN orders_2017 ON orders_2017.d = days.d
+LEFT JOIN holidays   ON holidays.d   = days.d
+GROUP BY days.d
+ORDER BY days.d;
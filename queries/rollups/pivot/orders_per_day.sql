@@ -0,0 +1,8 @@
+-- orders_per_day.sql (sobre rollup_orders_daily, rango de años)
+SELECT
+  purchase_date AS date,
+  SUM(order_count) AS order_count
+FROM rollup_orders_daily
+WHERE purchase_year BETWEEN :start_year AND :end_year
+GROUP BY purchase_date
+ORDER BY date;
@@ -0,0 +1,11 @@
+-- real_vs_estimated_delivered_time.sql (sobre rollup_orders_daily, agregado para
+-- pivotear por año)
+SELECT
+  purchase_year AS y,
+  purchase_month AS m,
+  ROUND(SUM(real_delivery_days_sum) / SUM(delivery_days_count), 2) AS real_time,
+  ROUND(SUM(estimated_delivery_days_sum) / SUM(delivery_days_count), 2) AS estimated_time
+FROM rollup_orders_daily
+WHERE purchase_year BETWEEN :start_year AND :end_year
+GROUP BY y, m
+HAVING SUM(delivery_days_count) > 0;
@@ -0,0 +1,9 @@
+-- revenue_by_month_year.sql (sobre rollup_sales_daily, agregado para pivotear por año)
+SELECT
+  approved_year AS y,
+  approved_month AS m,
+  ROUND(SUM(COALESCE(item_revenue, 0)), 2) AS revenue
+FROM rollup_sales_daily
+WHERE is_delivered = 1
+  AND approved_year BETWEEN :start_year AND :end_year
+GROUP BY y, m;
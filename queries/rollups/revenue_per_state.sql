@@ -0,0 +1,10 @@
+-- revenue_per_state.sql (sobre rollup_sales_daily)
+SELECT
+  customer_state,
+  ROUND(SUM(item_revenue + freight_value), 2) AS Revenue
+FROM rollup_sales_daily
+WHERE is_delivered = 1
+  AND customer_state IS NOT NULL
+GROUP BY customer_state
+ORDER BY Revenue DESC, customer_state
+LIMIT 10;
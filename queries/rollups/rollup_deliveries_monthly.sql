@@ -0,0 +1,42 @@
+-- rollup_deliveries_monthly.sql
+-- Tiempos de entrega de los pedidos entregados por (año, mes de compra, estado
+-- del cliente, categoría), con las mismas filas que queries/dashboard/cube_deliveries.sql:
+-- all_categories = 1 cuenta cada pedido una sola vez y all_categories = 0 lo
+-- repite en cada categoría de sus ítems. Cada pedido llega completo en un solo
+-- lote, así que las filas de un fold se pueden sumar a las existentes.
+SELECT
+  purchase_year,
+  purchase_month,
+  customer_state,
+  NULL AS category,
+  1 AS all_categories,
+  COUNT(*) AS order_count,
+  SUM(real_delivery_days) AS real_delivery_days_sum,
+  SUM(estimated_delivery_days) AS estimated_delivery_days_sum,
+  SUM(delivery_difference_days) AS delivery_difference_days_sum
+FROM fact_order_items
+WHERE is_order_row = 1
+  AND is_delivered = 1
+  AND estimated_delivery_days IS NOT NULL
+GROUP BY purchase_year, purchase_month, customer_state
+UNION ALL
+SELECT
+  d.purchase_year,
+  d.purchase_month,
+  d.customer_state,
+  oc.category,
+  0 AS all_categories,
+  COUNT(*) AS order_count,
+  SUM(d.real_delivery_days) AS real_delivery_days_sum,
+  SUM(d.estimated_delivery_days) AS estimated_delivery_days_sum,
+  SUM(d.delivery_difference_days) AS delivery_difference_days_sum
+FROM fact_order_items AS d
+JOIN (
+  SELECT DISTINCT order_id, category
+  FROM fact_order_items
+  WHERE category IS NOT NULL
+) AS oc USING (order_id)
+WHERE d.is_order_row = 1
+  AND d.is_delivered = 1
+  AND d.estimated_delivery_days IS NOT NULL
+GROUP BY d.purchase_year, d.purchase_month, d.customer_state, oc.category;
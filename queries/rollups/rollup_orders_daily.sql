@@ -0,0 +1,32 @@
+-- rollup_orders_daily.sql
+-- Resumen a nivel pedido por (fecha de compra, estado del cliente, estado del pedido).
+-- Las sumas y conteos de días permiten recomponer los promedios de entrega
+-- (AVG = SUM(..._sum) / SUM(..._count)) sin volver a recorrer los pedidos.
+SELECT
+  purchase_date,
+  purchase_year,
+  purchase_month,
+  customer_state,
+  order_status,
+  COUNT(*) AS order_count,
+  SUM(is_delivered) AS delivered_count,
+  SUM(
+    CASE WHEN is_delivered = 1 AND estimated_delivery_days IS NOT NULL THEN 1 ELSE 0 END
+  ) AS delivery_days_count,
+  SUM(
+    CASE WHEN is_delivered = 1 AND estimated_delivery_days IS NOT NULL
+    THEN real_delivery_days END
+  ) AS real_delivery_days_sum,
+  SUM(
+    CASE WHEN is_delivered = 1 AND estimated_delivery_days IS NOT NULL
+    THEN estimated_delivery_days END
+  ) AS estimated_delivery_days_sum,
+  SUM(
+    CASE WHEN is_delivered = 1 AND delivery_difference_days IS NOT NULL THEN 1 ELSE 0 END
+  ) AS delivery_difference_count,
+  SUM(
+    CASE WHEN is_delivered = 1 THEN delivery_difference_days END
+  ) AS delivery_difference_days_sum
+FROM fact_order_items
+WHERE is_order_row = 1
+GROUP BY purchase_date, purchase_year, purchase_month, customer_state, order_status;
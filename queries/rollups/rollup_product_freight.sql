@@ -0,0 +1,11 @@
+-- rollup_product_freight.sql
+-- Flete de pedidos entregados por producto (la relación flete/peso es por producto).
+SELECT
+  product_id,
+  product_weight_g,
+  COUNT(*) AS item_count,
+  SUM(freight_value) AS freight_value
+FROM fact_order_items
+WHERE order_status = 'delivered'
+  AND order_item_id IS NOT NULL
+GROUP BY product_id, product_weight_g;
@@ -0,0 +1,20 @@
+-- rollup_sales_daily.sql
+-- Resumen a nivel ítem por (fecha de compra, estado del cliente, categoría),
+-- con el mes de aprobación para los ingresos por mes. Cada pedido cae en una
+-- sola fecha y un solo estado, así que order_count se puede sumar entre filas
+-- de la misma categoría sin contar dos veces un pedido.
+SELECT
+  purchase_date,
+  customer_state,
+  category,
+  approved_year,
+  approved_month,
+  is_delivered,
+  COUNT(DISTINCT order_id) AS order_count,
+  COUNT(*) AS item_count,
+  SUM(price) AS item_revenue,
+  SUM(freight_value) AS freight_value
+FROM fact_order_items
+WHERE order_item_id IS NOT NULL
+GROUP BY
+  purchase_date, customer_state, category, approved_year, approved_month, is_delivered;
@@ -0,0 +1,11 @@
+-- top_10_least_revenue_categories.sql (sobre rollup_sales_daily)
+SELECT
+  category AS Category,
+  SUM(order_count) AS Num_order,
+  ROUND(SUM(item_revenue + freight_value), 2) AS Revenue
+FROM rollup_sales_daily
+WHERE is_delivered = 1
+  AND category IS NOT NULL
+GROUP BY category
+ORDER BY Revenue ASC, Category
+LIMIT 10;
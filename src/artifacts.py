@@ -0,0 +1,111 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+from pandas import DataFrame
+from src.cache import CACHE_SUFFIX, hash_file
+from src.config import LOAD_CHUNK_SIZE
+
+# Manifest written next to the table files of every artifact folder
+ARTIFACT_MANIFEST = "manifest.json"
+
+
+def write_artifacts(
+    data_frames: Dict[str, DataFrame],
+    artifact_dir: str,
+    chunksize: int = LOAD_CHUNK_SIZE,
+) -> Dict[str, Dict[str, Any]]:
+    """Write extracted tables as files so tasks hand off paths, not DataFrames.
+
+    Each table is stored as an uncompressed Feather (Arrow IPC) file split in
+    record batches of ``chunksize`` rows, which readers can memory-map or
+    stream batch by batch. Files are written to a temporary name and renamed.
+
+    Args:
+        data_frames (Dict[str, DataFrame]): Tables returned by extract.
+        artifact_dir (str): Local or shared folder for this run.
+        chunksize (int): Rows per record batch.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Manifest {table: {"path", "sha256", "rows"}},
+        also saved as manifest.json in ``artifact_dir``.
+    """
+    folder = Path(artifact_dir)
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest: Dict[str, Dict[str, Any]] = {}
+    for table_name, df in data_frames.items():
+        path = folder / f"{table_name}{CACHE_SUFFIX}"
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        df.to_feather(tmp_path, compression="uncompressed", chunksize=chunksize)
+        os.replace(tmp_path, path)
+        manifest[table_name] = {
+            "path": str(path.resolve()),
+            "sha256": hash_file(path),
+            "rows": len(df),
+        }
+
+    with open(folder / ARTIFACT_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def read_artifact_manifest(artifact_dir: str) -> Dict[str, Dict[str, Any]]:
+    """Read the manifest.json written by write_artifacts."""
+    with open(Path(artifact_dir) / ARTIFACT_MANIFEST, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _verified_path(entry: Dict[str, Any], verify: bool) -> Path:
+    path = Path(entry["path"])
+    if verify and hash_file(path) != entry["sha256"]:
+        raise ValueError(f"Artifact {path} does not match its manifest hash")
+    return path
+
+
+def read_artifacts(
+    manifest: Dict[str, Dict[str, Any]], verify: bool = True
+) -> Dict[str, DataFrame]:
+    """Read every table of a manifest through a memory map.
+
+    Args:
+        manifest (Dict[str, Dict[str, Any]]): Manifest from write_artifacts.
+        verify (bool): Check each file against its sha256 first.
+
+    Returns:
+        Dict[str, DataFrame]: Tables keyed like the extract output.
+    """
+    return {
+        table_name: feather.read_table(
+            _verified_path(entry, verify), memory_map=True
+        ).to_pandas()
+        for table_name, entry in manifest.items()
+    }
+
+
+def iter_artifact_chunks(
+    manifest: Dict[str, Dict[str, Any]], verify: bool = True
+) -> Iterator[Tuple[str, DataFrame]]:
+    """Stream the tables of a manifest one record batch at a time.
+
+    The (table, chunk) pairs can be passed to load.load_stream, so only one
+    batch is converted to pandas at a time. Empty tables yield one empty chunk
+    so they are still created.
+
+    Args:
+        manifest (Dict[str, Dict[str, Any]]): Manifest from write_artifacts.
+        verify (bool): Check each file against its sha256 first.
+
+    Yields:
+        Tuple[str, DataFrame]: Table name and one chunk of its rows.
+    """
+    for table_name, entry in manifest.items():
+        with pa.memory_map(str(_verified_path(entry, verify))) as source:
+            reader = ipc.open_file(source)
+            if reader.num_record_batches == 0:
+                yield table_name, reader.schema.empty_table().to_pandas()
+            for i in range(reader.num_record_batches):
+                yield table_name, reader.get_batch(i).to_pandas()
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from pandas import DataFrame, read_feather
+from src.config import SCHEMA_VERSION
+
+CACHE_SUFFIX = ".feather"
+
+
+def fingerprint(value: Any) -> str:
+    """Stable hash (sha256 of the JSON with sorted keys) of a value.
+
+    Args:
+        value (Any): JSON serializable value; other objects are passed to str().
+
+    Returns:
+        str: Hex digest of the serialized value.
+    """
+    payload = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def hash_file(file_path: Path, block_size: int = 1024 * 1024) -> str:
+    """Compute the sha256 of a file reading it in blocks.
+
+    Args:
+        file_path (Path): File to hash.
+        block_size (int): Bytes read per iteration.
+
+    Returns:
+        str: Hex digest of the file content.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_cache_path(
+    cache_dir: str, csv_path: Path, schema: Optional[Dict[str, Any]] = None
+) -> Path:
+    """Build the cache file path of a csv file.
+
+    The key combines the csv content hash, a fingerprint of the read_csv
+    arguments the table is parsed with and SCHEMA_VERSION, so editing the
+    file, passing a different schema or bumping the registry produces a
+    different entry.
+
+    Args:
+        cache_dir (str): Cache folder.
+        csv_path (Path): Source csv file.
+        schema (Optional[Dict[str, Any]]): read_csv arguments used to parse it.
+
+    Returns:
+        Path: Path of the Feather file for this csv content and schema.
+    """
+    content_hash = hash_file(csv_path)[:20]
+    schema_hash = fingerprint(schema or {})[:12]
+    file_name = (
+        f"{csv_path.stem}-{content_hash}.{schema_hash}-v{SCHEMA_VERSION}{CACHE_SUFFIX}"
+    )
+    return Path(cache_dir) / file_name
+
+
+def read_cached_table(cache_path: Path) -> Optional[DataFrame]:
+    """Read a cached table, or return None on a cache miss.
+
+    A hit refreshes the file mtime so evict_cache() works as an LRU.
+    """
+    if not cache_path.exists():
+        return None
+    df = read_feather(cache_path)
+    os.utime(cache_path)
+    return df
+
+
+def write_cached_table(df: DataFrame, cache_path: Path) -> None:
+    """Store a parsed table in the cache.
+
+    The file is written to a temporary name and renamed, so concurrent readers
+    never see a partial file. Entries of older csv contents or schemas are left
+    in place; evict_cache() removes them once they are the least recently used.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+    df.to_feather(tmp_path)
+    os.replace(tmp_path, cache_path)
+
+
+def evict_cache(cache_dir: str, max_bytes: int) -> int:
+    """Delete the least recently used entries until the cache fits in max_bytes.
+
+    Args:
+        cache_dir (str): Cache folder.
+        max_bytes (int): Maximum total size of the cache.
+
+    Returns:
+        int: Number of deleted files.
+    """
+    cache_root = Path(cache_dir)
+    if not cache_root.exists():
+        return 0
+
+    entries = sorted(
+        (p.stat().st_mtime, p.stat().st_size, p)
+        for p in cache_root.glob(f"*{CACHE_SUFFIX}")
+    )
+    total = sum(size for _, size, _ in entries)
+    deleted = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+        deleted += 1
+    return deleted
@@ -0,0 +1,126 @@
+# src/checkpoints.py
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Engine
+from src.cache import fingerprint
+from src.config import PUBLIC_HOLIDAYS_URL, QUERIES_ROOT_PATH, SCHEMA_VERSION
+
+# Una fila por fase del pipeline con su marca de finalización
+CHECKPOINT_TABLE = "etl_checkpoints"
+
+STAGE_STARTED = "started"
+STAGE_DONE = "done"
+
+
+def get_sources_fingerprint(
+    csv_folder: str, csv_table_mapping: Dict[str, str]
+) -> Dict[str, Any]:
+    """
+    Entradas de la extracción: tamaño y mtime de cada csv (sin leerlos), la
+    versión del esquema y la url de feriados.
+    """
+    sources = {}
+    for csv_file in sorted(csv_table_mapping):
+        stat = os.stat(Path(csv_folder) / csv_file)
+        sources[csv_file] = [stat.st_size, stat.st_mtime]
+    return {
+        "sources": sources,
+        "schema_version": SCHEMA_VERSION,
+        "public_holidays_url": PUBLIC_HOLIDAYS_URL,
+    }
+
+
+def get_queries_fingerprint(queries_dir: str = QUERIES_ROOT_PATH) -> str:
+    """Huella del contenido de todos los .sql de queries/ (y subcarpetas)."""
+    digest = hashlib.sha256()
+    root = Path(queries_dir)
+    for sql_file in sorted(root.rglob("*.sql")):
+        digest.update(str(sql_file.relative_to(root)).encode("utf-8"))
+        digest.update(sql_file.read_bytes())
+    return digest.hexdigest()
+
+
+def get_checkpoint(database: Engine, stage: str) -> Optional[Dict[str, Any]]:
+    """Marca de una fase (None si nunca empezó)."""
+    if not inspect(database).has_table(CHECKPOINT_TABLE):
+        return None
+    with database.connect() as conn:
+        row = conn.exec_driver_sql(
+            f"SELECT status, input_fingerprint, output, updated_at "
+            f"FROM {CHECKPOINT_TABLE} WHERE stage = ?;",
+            (stage,),
+        ).fetchone()
+    if row is None:
+        return None
+    return {
+        "status": row[0],
+        "input_fingerprint": row[1],
+        "output": None if row[2] is None else json.loads(row[2]),
+        "updated_at": row[3],
+    }
+
+
+def is_stage_done(database: Engine, stage: str, input_fingerprint: str) -> bool:
+    """Indica si la fase terminó con las mismas entradas que ahora."""
+    checkpoint = get_checkpoint(database, stage)
+    return (
+        checkpoint is not None
+        and checkpoint["status"] == STAGE_DONE
+        and checkpoint["input_fingerprint"] == input_fingerprint
+    )
+
+
+def _write_checkpoint(
+    database: Engine, stage: str, status: str, input_fingerprint: str, output: Any
+) -> None:
+    with database.begin() as conn:
+        conn.exec_driver_sql(f"""
+            CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                stage TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                input_fingerprint TEXT NOT NULL,
+                output TEXT,
+                updated_at TEXT NOT NULL
+            );
+        """)
+        conn.exec_driver_sql(
+            f"INSERT OR REPLACE INTO {CHECKPOINT_TABLE} VALUES (?, ?, ?, ?, ?);",
+            (
+                stage,
+                status,
+                input_fingerprint,
+                None if output is None else json.dumps(output, default=str),
+                datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+
+
+def run_checkpointed(
+    database: Engine,
+    stage: str,
+    input_fingerprint: str,
+    fn: Callable[[], Any],
+    output: Callable[[Any], Any] = lambda result: result,
+    force: bool = False,
+) -> Tuple[bool, Any]:
+    """
+    Ejecuta `fn` como la fase `stage` salvo que ya haya terminado con la misma
+    huella de entrada (y force sea False). La marca queda "started" mientras
+    corre, así una fase que falla se vuelve a ejecutar en el siguiente intento;
+    al terminar se guarda "done" con output(resultado) en JSON.
+    Devuelve (se ejecutó, resultado); si se omitió, el resultado es la salida
+    registrada en la ejecución anterior.
+    """
+    if not force and is_stage_done(database, stage, input_fingerprint):
+        return False, get_checkpoint(database, stage)["output"]
+
+    _write_checkpoint(database, stage, STAGE_STARTED, input_fingerprint, None)
+    result = fn()
+    _write_checkpoint(database, stage, STAGE_DONE, input_fingerprint, output(result))
+    return True, result
@@ -1,11 +1,67 @@
+import os
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict
 
 DATASET_ROOT_PATH = str(Path(__file__).parent.parent / "dataset")
 QUERIES_ROOT_PATH = str(Path(__file__).parent.parent / "queries")
 QUERY_RESULTS_ROOT_PATH = str(Path(__file__).parent.parent / "tests/query_results")
+QUERY_BASELINE_PATH = str(Path(__file__).parent.parent / "tests/query_baseline.json")
 PUBLIC_HOLIDAYS_URL = "https://date.nager.at/api/v3/publicholidays"
 SQLITE_BD_ABSOLUTE_PATH = str(Path(__file__).parent.parent / "olist_dw_debug.db")
+CACHE_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "tables")
+QUERY_CACHE_ROOT_PATH = str(Path(__file__).parent.parent / ".cache" / "queries")
+EXPORT_ROOT_PATH = str(Path(__file__).parent.parent / "exports")
+# Carpeta (local o compartida entre workers) para pasar tablas entre tareas del DAG
+ARTIFACT_ROOT_PATH = os.getenv(
+    "ARTIFACT_ROOT_PATH", str(Path(__file__).parent.parent / ".artifacts")
+)
+
+# Extracción concurrente: número de workers y tipo de pool ("thread" o "process")
+EXTRACT_MAX_WORKERS = int(os.getenv("EXTRACT_MAX_WORKERS", os.cpu_count() or 1))
+EXTRACT_EXECUTOR = os.getenv("EXTRACT_EXECUTOR", "thread")
+
+# Consultas concurrentes en transform: workers y tipo de pool ("thread" o "process")
+TRANSFORM_MAX_WORKERS = int(os.getenv("TRANSFORM_MAX_WORKERS", os.cpu_count() or 1))
+TRANSFORM_EXECUTOR = os.getenv("TRANSFORM_EXECUTOR", "thread")
+
+# Modo particionado (src.partitioned): clave que reparte los pedidos entre
+# procesos ("period" o "state") y cantidad de procesos (uno por partición)
+PARTITION_BY = os.getenv("PARTITION_BY", "period")
+PARTITION_MAX_WORKERS = int(os.getenv("PARTITION_MAX_WORKERS", os.cpu_count() or 1))
+
+# Motor por defecto de las consultas de transform: "sql" o "pandas"
+QUERY_ENGINE = os.getenv("QUERY_ENGINE", "sql")
+
+# Versión del registro de esquemas; incrementar al cambiar get_table_schemas()
+# o el formato con el que load escribe las tablas en el Data Warehouse
+SCHEMA_VERSION = 2
+
+# Caché columnar (Feather) de las tablas ya parseadas; límite total en bytes
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 2 * 1024**3))
+
+# Caché de resultados de consultas (Feather), invalidada por la versión de datos
+QUERY_CACHE_ENABLED = os.getenv("QUERY_CACHE_ENABLED", "1") == "1"
+QUERY_CACHE_MAX_BYTES = int(os.getenv("QUERY_CACHE_MAX_BYTES", 256 * 1024**2))
+
+# Tamaño de lote para las inserciones en el Data Warehouse
+LOAD_CHUNK_SIZE = int(os.getenv("LOAD_CHUNK_SIZE", 50_000))
+
+# Modo streaming: filas por chunk al leer cada csv y agregarlo a SQLite
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 100_000))
+
+# Exportación de resultados: "parquet" o "arrow" (Arrow IPC) y filas por lote
+EXPORT_FORMAT = os.getenv("EXPORT_FORMAT", "parquet")
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", 50_000))
+
+# Dashboard: cada cuántos segundos se revisa si cambió la versión de los datos
+DASHBOARD_REFRESH_SECONDS = float(os.getenv("DASHBOARD_REFRESH_SECONDS", 30))
+
+# Snapshots del dashboard publicados al final de transform (src.publish): carpeta
+# local o compartida entre workers y cuántos se conservan
+SNAPSHOT_ROOT_PATH = os.getenv(
+    "SNAPSHOT_ROOT_PATH", str(Path(__file__).parent.parent / ".snapshots")
+)
+SNAPSHOT_KEEP = int(os.getenv("SNAPSHOT_KEEP", 3))
 
 
 def get_csv_to_table_mapping() -> Dict[str, str]:
@@ -31,3 +87,184 @@ def get_csv_to_table_mapping() -> Dict[str, str]:
             ),
         ]
     )
+
+
+def get_table_schemas() -> Dict[str, Dict[str, Any]]:
+    """This function declares how each Olist csv file must be parsed.
+
+    Every entry holds the keyword arguments for ``pandas.read_csv``:
+    ``usecols`` (columns to keep), ``dtype`` (categoricals and downcast
+    numerics) and ``parse_dates`` (timestamp columns). Money columns are kept
+    as float64 so aggregates do not lose precision. The optional
+    ``date_parts`` key lists timestamp columns that load also stores as
+    integer ``<column>_year`` and ``<column>_month`` columns.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Dictionary with keys as the table names and
+        values as the read_csv arguments of each table.
+    """
+    return {
+        "olist_customers": dict(
+            usecols=[
+                "customer_id",
+                "customer_unique_id",
+                "customer_zip_code_prefix",
+                "customer_city",
+                "customer_state",
+            ],
+            dtype={
+                "customer_id": "object",
+                "customer_unique_id": "object",
+                "customer_zip_code_prefix": "int32",
+                "customer_city": "category",
+                "customer_state": "category",
+            },
+            parse_dates=[],
+        ),
+        "olist_geolocation": dict(
+            usecols=[
+                "geolocation_zip_code_prefix",
+                "geolocation_lat",
+                "geolocation_lng",
+                "geolocation_city",
+                "geolocation_state",
+            ],
+            dtype={
+                "geolocation_zip_code_prefix": "int32",
+                "geolocation_lat": "float32",
+                "geolocation_lng": "float32",
+                "geolocation_city": "category",
+                "geolocation_state": "category",
+            },
+            parse_dates=[],
+        ),
+        "olist_order_items": dict(
+            usecols=[
+                "order_id",
+                "order_item_id",
+                "product_id",
+                "seller_id",
+                "shipping_limit_date",
+                "price",
+                "freight_value",
+            ],
+            dtype={
+                "order_id": "object",
+                "order_item_id": "int8",
+                "product_id": "category",
+                "seller_id": "category",
+                "price": "float64",
+                "freight_value": "float64",
+            },
+            parse_dates=["shipping_limit_date"],
+        ),
+        "olist_order_payments": dict(
+            usecols=[
+                "order_id",
+                "payment_sequential",
+                "payment_type",
+                "payment_installments",
+                "payment_value",
+            ],
+            dtype={
+                "order_id": "object",
+                "payment_sequential": "int8",
+                "payment_type": "category",
+                "payment_installments": "int8",
+                "payment_value": "float64",
+            },
+            parse_dates=[],
+        ),
+        "olist_order_reviews": dict(
+            usecols=[
+                "review_id",
+                "order_id",
+                "review_score",
+                "review_comment_title",
+                "review_comment_message",
+                "review_creation_date",
+                "review_answer_timestamp",
+            ],
+            dtype={
+                "review_id": "object",
+                "order_id": "object",
+                "review_score": "int8",
+                "review_comment_title": "category",
+                "review_comment_message": "object",
+            },
+            parse_dates=["review_creation_date", "review_answer_timestamp"],
+        ),
+        "olist_orders": dict(
+            usecols=[
+                "order_id",
+                "customer_id",
+                "order_status",
+                "order_purchase_timestamp",
+                "order_approved_at",
+                "order_delivered_carrier_date",
+                "order_delivered_customer_date",
+                "order_estimated_delivery_date",
+            ],
+            dtype={
+                "order_id": "object",
+                "customer_id": "object",
+                "order_status": "category",
+            },
+            parse_dates=[
+                "order_purchase_timestamp",
+                "order_approved_at",
+                "order_delivered_carrier_date",
+                "order_delivered_customer_date",
+                "order_estimated_delivery_date",
+            ],
+            date_parts=["order_purchase_timestamp", "order_approved_at"],
+        ),
+        "olist_products": dict(
+            usecols=[
+                "product_id",
+                "product_category_name",
+                "product_name_lenght",
+                "product_description_lenght",
+                "product_photos_qty",
+                "product_weight_g",
+                "product_length_cm",
+                "product_height_cm",
+                "product_width_cm",
+            ],
+            dtype={
+                "product_id": "object",
+                "product_category_name": "category",
+                "product_name_lenght": "float32",
+                "product_description_lenght": "float32",
+                "product_photos_qty": "float32",
+                "product_weight_g": "float32",
+                "product_length_cm": "float32",
+                "product_height_cm": "float32",
+                "product_width_cm": "float32",
+            },
+            parse_dates=[],
+        ),
+        "olist_sellers": dict(
+            usecols=[
+                "seller_id",
+                "seller_zip_code_prefix",
+                "seller_city",
+                "seller_state",
+            ],
+            dtype={
+                "seller_id": "object",
+                "seller_zip_code_prefix": "int32",
+                "seller_city": "category",
+                "seller_state": "category",
+            },
+            parse_dates=[],
+        ),
+        "product_category_name_translation": dict(
+            usecols=["product_category_name", "product_category_name_english"],
+            dtype={
+                "product_category_name": "object",
+                "product_category_name_english": "object",
+            },
+            parse_dates=[],
+        ),
+    }
@@ -0,0 +1,231 @@
+# src/dashboard_cube.py
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from sqlalchemy.engine.base import Engine
+from src.query_cache import read_sql_cached
+from src.star_schema import is_fact_current
+from src.transform import read_query
+
+# Consultas de queries/ que muestra dashboard/app.py; el cubo devuelve sus
+# resultados con las mismas columnas (dashboard_frames)
+DASHBOARD_QUERIES = (
+    "revenue_by_month_year",
+    "top_10_revenue_categories",
+    "top_10_least_revenue_categories",
+    "delivery_date_difference",
+    "real_vs_estimated_delivered_time",
+)
+
+MONTHS = DataFrame(
+    {
+        "month_no": [f"{m:02d}" for m in range(1, 13)],
+        "month": [
+            "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+            "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+        ],
+    }
+)
+
+
+class DashboardCube(NamedTuple):
+    """
+    Cubo de agregados del dashboard sobre (año, mes, estado, categoría):
+    `sales` con ingresos y pedidos por mes de aprobación
+    (queries/dashboard/cube_sales.sql) y `deliveries` con sumas de días de
+    entrega por mes de compra (queries/dashboard/cube_deliveries.sql).
+    """
+
+    sales: DataFrame
+    deliveries: DataFrame
+
+
+def _prepare(df: DataFrame) -> DataFrame:
+    # Estado y categoría como category: los filtros comparan códigos enteros
+    return df.astype({"state": "category", "category": "category"})
+
+
+def build_cube(database: Engine) -> DashboardCube:
+    """
+    Arma el cubo con dos consultas agregadas (a través de la caché de
+    resultados, así se calcula una vez por versión de datos). Son unos pocos
+    miles de filas: filtrar y volver a agregar se hace en memoria. Si los
+    rollups están al día (src.star_schema.is_fact_current) se leen de
+    queries/rollups/dashboard/ en vez de recorrer las tablas crudas.
+    """
+    folder = "rollups/dashboard" if is_fact_current(database) else "dashboard"
+    return DashboardCube(
+        sales=_prepare(read_sql_cached(read_query(f"{folder}/cube_sales"), database)),
+        deliveries=_prepare(
+            read_sql_cached(read_query(f"{folder}/cube_deliveries"), database)
+        ),
+    )
+
+
+def get_filter_options(cube: DashboardCube) -> Dict[str, List]:
+    """Valores de cada filtro del dashboard: años, estados y categorías."""
+    years = pd.concat([cube.sales["year"], cube.deliveries["year"]]).dropna()
+    return {
+        "year": sorted(int(year) for year in years.unique()),
+        "state": sorted(cube.sales["state"].dropna().unique()),
+        "category": sorted(cube.sales["category"].dropna().unique()),
+    }
+
+
+def slice_cube(
+    df: DataFrame,
+    years: Optional[Iterable[int]] = None,
+    states: Optional[Iterable[str]] = None,
+    categories: Optional[Iterable[str]] = None,
+) -> np.ndarray:
+    """
+    Máscara de las filas de una tabla del cubo que cumplen los filtros; un
+    filtro vacío o None no filtra. En `deliveries`, sin filtro de categoría se
+    usan las filas de todas las categorías (all_categories = 1), que cuentan
+    cada pedido una vez; con filtro, un pedido con varias de las categorías
+    elegidas suma en cada una.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    if years:
+        mask &= np.isin(df["year"].to_numpy(), list(years))
+    for column, selected in (("state", states), ("category", categories)):
+        if selected:
+            codes = df[column].cat.categories.get_indexer(list(selected))
+            mask &= np.isin(df[column].cat.codes.to_numpy(), codes[codes >= 0])
+    if "all_categories" in df.columns:
+        mask &= df["all_categories"].to_numpy() == (0 if categories else 1)
+    return mask
+
+
+def _sum_by(codes: np.ndarray, size: int, *weights: np.ndarray) -> List[np.ndarray]:
+    """Sumas de cada array de `weights` agrupadas por código (0..size-1)."""
+    valid = codes >= 0
+    return [
+        np.bincount(codes[valid], weights=w[valid], minlength=size) for w in weights
+    ]
+
+
+def _by_month(
+    df: DataFrame, mask: np.ndarray, years: Optional[Iterable[int]], *columns: str
+):
+    """
+    Sumas de `columns` por (mes, año) como matrices de 12 x años, con los años
+    elegidos o, sin filtro, todos los de las filas filtradas.
+    """
+    year = df["year"].to_numpy()[mask]
+    month = df["month"].to_numpy()[mask]
+    if years:
+        pivot_years = sorted(int(y) for y in years)
+    else:
+        pivot_years = sorted(int(y) for y in np.unique(year[~np.isnan(year)]))
+    # Los años nulos quedan después del último (searchsorted) y no se suman
+    year_index = np.searchsorted(pivot_years, year)
+    known = (year_index < len(pivot_years)) & ~np.isnan(month)
+    codes = np.where(known, year_index * 12 + month - 1, -1).astype(np.int64)
+    sums = _sum_by(
+        codes,
+        12 * len(pivot_years),
+        *(df[column].to_numpy(dtype=float)[mask] for column in columns),
+    )
+    return pivot_years, [total.reshape(len(pivot_years), 12).T for total in sums]
+
+
+def _month_table(pivot_years: List[int], values: Dict[str, np.ndarray]) -> DataFrame:
+    """12 filas (month_no, month) y una columna por año y sufijo de `values`."""
+    table = MONTHS.copy()
+    for suffix, matrix in values.items():
+        for i, year in enumerate(pivot_years):
+            table[f"Year{year}{suffix}"] = np.round(matrix[:, i], 2)
+    return table
+
+
+def _top_categories(
+    sales: DataFrame, mask: np.ndarray, revenue: str, ascending: bool
+) -> DataFrame:
+    names = sales["category"].cat.categories
+    codes = np.where(mask, sales["category"].cat.codes.to_numpy(), -1)
+    present, orders, total = _sum_by(
+        codes.astype(np.int64),
+        len(names),
+        np.ones(len(sales)),
+        sales["orders"].to_numpy(dtype=float),
+        sales[revenue].to_numpy(dtype=float),
+    )
+    keep = present > 0
+    top = DataFrame(
+        {
+            "Category": names[keep].astype(str),
+            "Num_order": orders[keep].astype(int),
+            "Revenue": np.round(total[keep], 2),
+        }
+    )
+    return (
+        top.sort_values(["Revenue", "Category"], ascending=[ascending, True])
+        .head(10)
+        .reset_index(drop=True)
+    )
+
+
+def _delivery_difference(deliveries: DataFrame, mask: np.ndarray) -> DataFrame:
+    names = deliveries["state"].cat.categories
+    codes = np.where(mask, deliveries["state"].cat.codes.to_numpy(), -1)
+    difference, orders = _sum_by(
+        codes.astype(np.int64),
+        len(names),
+        deliveries["difference_days_sum"].to_numpy(dtype=float),
+        deliveries["orders"].to_numpy(dtype=float),
+    )
+    keep = orders > 0
+    # CAST(AVG(...) AS INT) de la consulta: trunca hacia cero
+    average = np.trunc(difference[keep] / orders[keep]).astype(int)
+    return DataFrame(
+        {"State": names[keep].astype(str), "Delivery_Difference": average}
+    ).sort_values(["Delivery_Difference", "State"], ignore_index=True)
+
+
+def dashboard_frames(
+    cube: DashboardCube,
+    years: Optional[Iterable[int]] = None,
+    states: Optional[Iterable[str]] = None,
+    categories: Optional[Iterable[str]] = None,
+) -> Dict[str, DataFrame]:
+    """
+    Resultados de DASHBOARD_QUERIES para los filtros dados, con las columnas de
+    las consultas de queries/; sin filtros coinciden con ellas. El año filtra
+    por año de aprobación en los ingresos y por año de compra en las entregas,
+    como las consultas originales. Se agrega con np.bincount sobre los códigos
+    de cada dimensión: unos pocos milisegundos por combinación de filtros.
+    """
+    sales_mask = slice_cube(cube.sales, years, states, categories)
+    deliveries_mask = slice_cube(cube.deliveries, years, states, categories)
+
+    sales_years, (revenue,) = _by_month(cube.sales, sales_mask, years, "revenue")
+    delivery_years, (real, estimated, orders) = _by_month(
+        cube.deliveries,
+        deliveries_mask,
+        years,
+        "real_days_sum",
+        "estimated_days_sum",
+        "orders",
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = {
+            "_real_time": np.where(orders > 0, real / orders, np.nan),
+            "_estimated_time": np.where(orders > 0, estimated / orders, np.nan),
+        }
+
+    return {
+        "revenue_by_month_year": _month_table(sales_years, {"": revenue}),
+        "top_10_revenue_categories": _top_categories(
+            cube.sales, sales_mask, "revenue", False
+        ),
+        "top_10_least_revenue_categories": _top_categories(
+            cube.sales, sales_mask, "revenue_with_freight", True
+        ),
+        "delivery_date_difference": _delivery_difference(
+            cube.deliveries, deliveries_mask
+        ),
+        "real_vs_estimated_delivered_time": _month_table(delivery_years, averages),
+    }
@@ -0,0 +1,188 @@
+# src/dashboard_data.py
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import create_engine
+from src.config import (
+    DASHBOARD_REFRESH_SECONDS,
+    SNAPSHOT_ROOT_PATH,
+    SQLITE_BD_ABSOLUTE_PATH,
+)
+from src.dashboard_cube import DashboardCube, build_cube
+from src.publish import get_latest_snapshot_path, read_snapshot
+from src.query_cache import get_data_version
+
+
+class DashboardSnapshot(NamedTuple):
+    """
+    Cubo del dashboard para una versión de datos (o el error al armarlo) y,
+    si vienen de un snapshot publicado, las figuras sin filtros (Plotly JSON).
+    """
+
+    version: Optional[str]
+    cube: Optional[DashboardCube]
+    error: str
+    refreshed_at: datetime
+    figures: Optional[Dict[str, Any]] = None
+
+
+def get_file_stamp(db_path: str) -> Optional[Tuple[int, int]]:
+    """(mtime en ns, tamaño) del archivo del Data Warehouse, o None si no existe."""
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_warehouse_version(db_path: str) -> Optional[str]:
+    """
+    Versión de los datos del Data Warehouse: el token que escribe load
+    (src.query_cache) o, en una base cargada sin él, la marca del archivo.
+    None si el archivo no existe.
+    """
+    stamp = get_file_stamp(db_path)
+    if stamp is None:
+        return None
+    database = create_engine(f"sqlite:///{db_path}")
+    try:
+        return get_data_version(database) or "file:{}:{}".format(*stamp)
+    finally:
+        database.dispose()
+
+
+class DashboardData:
+    """
+    Caché en memoria, del lado del servidor, del cubo que muestra el dashboard
+    (src.dashboard_cube). No lee nada al crearse: el primer snapshot() carga
+    los datos y arranca un hilo que cada `refresh_seconds` busca cambios; el
+    snapshot nuevo reemplaza al anterior de una vez, así que los callbacks
+    nunca ven datos a medias.
+    Si hay un snapshot publicado por el pipeline en `snapshot_root`
+    (src.publish), se usa el más reciente sin abrir SQLite, ni al arrancar ni
+    en cada refresco: queda mapeado en memoria, compartido entre workers, y se
+    vuelve a cargar cuando SNAPSHOT_LATEST apunta a otro (la fase publish
+    escribe uno por versión de datos). Solo si no hay ninguno publicado se
+    arma el cubo desde el Data Warehouse (a través de la caché de resultados
+    en disco) y se vuelve a armar cuando cambia la marca del archivo y también
+    su token de versión.
+    """
+
+    def __init__(
+        self,
+        db_path: str = SQLITE_BD_ABSOLUTE_PATH,
+        refresh_seconds: float = DASHBOARD_REFRESH_SECONDS,
+        snapshot_root: Optional[str] = SNAPSHOT_ROOT_PATH,
+    ):
+        self.db_path = str(db_path)
+        self.refresh_seconds = refresh_seconds
+        self.snapshot_root = snapshot_root
+        self._snapshot: Optional[DashboardSnapshot] = None
+        self._source_stamp: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _compute(self, version: Optional[str]) -> DashboardSnapshot:
+        cube, error = None, ""
+        if version is None:
+            error = (
+                f"FileNotFoundError: no se encontró la base de datos en "
+                f"{self.db_path}. Ejecuta el pipeline para generarla."
+            )
+        else:
+            database = create_engine(f"sqlite:///{self.db_path}")
+            try:
+                cube = build_cube(database)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                database.dispose()
+        return DashboardSnapshot(version, cube, error, datetime.now())
+
+    def _load_published(self, path: Path) -> DashboardSnapshot:
+        cube, figures, _ = read_snapshot(path)
+        return DashboardSnapshot(path.name, cube, "", datetime.now(), figures)
+
+    def refresh(self) -> bool:
+        """
+        Vuelve a cargar el cubo si SNAPSHOT_LATEST apunta a un snapshot nuevo
+        o, sin snapshots publicados, si la versión de datos cambió desde el
+        último snapshot. Devuelve True si se reemplazó el snapshot.
+        """
+        with self._lock:
+            current = self._snapshot
+            published = None
+            if self.snapshot_root is not None:
+                published = get_latest_snapshot_path(self.snapshot_root)
+            if published is not None:
+                if current is not None and current.version == published.name:
+                    return False
+                self._snapshot = self._load_published(published)
+                self._source_stamp = None
+                return True
+
+            stamp = get_file_stamp(self.db_path)
+            if current is not None and stamp == self._source_stamp:
+                return False
+            # La marca se guarda solo con un snapshot nuevo y sin error: si la
+            # lectura falla (la base a mitad de una carga), la próxima vuelta
+            # lo vuelve a intentar aunque el archivo no haya cambiado
+            version = get_warehouse_version(self.db_path)
+            if current is not None and not current.error and version == current.version:
+                self._source_stamp = stamp
+                return False
+            snapshot = self._compute(version)
+            if snapshot.error:
+                # Un error no reemplaza a un cubo ya cargado
+                if current is not None and current.cube is not None:
+                    return False
+                self._snapshot = snapshot
+                return current is None or (current.version, current.error) != (
+                    snapshot.version,
+                    snapshot.error,
+                )
+            self._snapshot = snapshot
+            self._source_stamp = stamp
+            return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.refresh_seconds):
+            try:
+                self.refresh()
+            except Exception:
+                # Un error de lectura (p. ej. la base a mitad de una carga) se
+                # reintenta en la próxima vuelta con el snapshot anterior
+                pass
+
+    def start(self) -> None:
+        """Arranca el hilo de refresco, si todavía no corre en este proceso."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="dashboard-refresh", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo de refresco."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def snapshot(self) -> DashboardSnapshot:
+        """
+        Snapshot actual; el primero se calcula en esta llamada. También arranca
+        el hilo de refresco: se hace acá y no al crear el objeto para que cada
+        worker (p. ej. de gunicorn, después del fork) tenga el suyo.
+        """
+        if self._snapshot is None:
+            self.refresh()
+        self.start()
+        return self._snapshot
@@ -0,0 +1,215 @@
+# src/dashboard_figures.py
+from typing import Dict, List
+
+import plotly.express as px
+import plotly.graph_objects as go
+from pandas import DataFrame
+
+
+def empty_figure_with_message(title: str, msg: str) -> go.Figure:
+    fig = go.Figure()
+    fig.add_annotation(
+        text=f"<b>{title}</b><br>{msg}",
+        showarrow=False,
+        x=0.5,
+        y=0.5,
+        xref="paper",
+        yref="paper",
+        align="center",
+    )
+    fig.update_layout(margin=dict(l=40, r=40, t=60, b=40), template="simple_white")
+    return fig
+
+
+def figure_revenue_heatmap(df: DataFrame) -> go.Figure:
+    if df.empty:
+        return empty_figure_with_message("Revenue por mes/año", "Sin datos")
+    if "month_no" in df.columns:
+        df = df.sort_values("month_no")
+    year_cols = [c for c in df.columns if c.startswith("Year")] or [
+        c for c in df.columns if any(y in c for y in ["2016", "2017", "2018"])
+    ]
+    months = df["month"].tolist() if "month" in df.columns else df["month_no"].tolist()
+    z = df[year_cols].T.values
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=z,
+            x=months,
+            y=year_cols,
+            colorbar=dict(title="Revenue"),
+            hovertemplate="Mes: %{x}<br>Año: %{y}<br>Revenue: %{z:.2f}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title="Revenue por mes (2016–2018)",
+        xaxis_title="Mes",
+        yaxis_title="Año",
+        margin=dict(l=24, r=16, t=50, b=24),
+        template="simple_white",
+    )
+    return fig
+
+
+def figure_top_categories(df: DataFrame, title: str) -> go.Figure:
+    if df.empty:
+        return empty_figure_with_message(title, "Sin datos")
+    sort_col = "Revenue" if "Revenue" in df.columns else df.columns[-1]
+    df = df.sort_values(sort_col, ascending=False)
+    fig = px.bar(
+        df,
+        x="Revenue",
+        y="Category",
+        orientation="h",
+        hover_data=[c for c in df.columns if c not in ["Category", "Revenue"]],
+        template="simple_white",
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title="Revenue",
+        yaxis_title="Categoría",
+        margin=dict(l=24, r=16, t=50, b=24),
+        bargap=0.15,
+    )
+    return fig
+
+
+def figure_bottom_categories(df: DataFrame, title: str) -> go.Figure:
+    if df.empty:
+        return empty_figure_with_message(title, "Sin datos")
+    sort_col = "Revenue" if "Revenue" in df.columns else df.columns[-1]
+    df = df.sort_values(sort_col, ascending=True)
+    fig = px.bar(
+        df,
+        x="Revenue",
+        y="Category",
+        orientation="h",
+        hover_data=[c for c in df.columns if c not in ["Category", "Revenue"]],
+        template="simple_white",
+    )
+    fig.update_layout(
+        title=title,
+        xaxis_title="Revenue",
+        yaxis_title="Categoría",
+        margin=dict(l=24, r=16, t=50, b=24),
+        bargap=0.15,
+    )
+    return fig
+
+
+def figure_delivery_diff(df: DataFrame) -> go.Figure:
+    if df.empty:
+        return empty_figure_with_message(
+            "Diferencia estimado vs real por estado", "Sin datos"
+        )
+    df = df.sort_values(["Delivery_Difference", "State"], ascending=[True, True])
+    fig = px.bar(
+        df,
+        x="Delivery_Difference",
+        y="State",
+        orientation="h",
+        template="simple_white",
+    )
+    fig.update_layout(
+        title="Diferencia entre fecha estimada y entrega real (días) por estado",
+        xaxis_title="(+) Antes de lo estimado | (−) Después",
+        yaxis_title="Estado",
+        margin=dict(l=24, r=16, t=50, b=24),
+        bargap=0.15,
+    )
+    return fig
+
+
+def figure_real_vs_estimated(df: DataFrame) -> go.Figure:
+    if df.empty:
+        return empty_figure_with_message("Tiempo real vs estimado", "Sin datos")
+
+    def find_col(options: List[str]) -> str:
+        for opt in options:
+            for c in df.columns:
+                if opt == c.lower():
+                    return c
+        return ""
+
+    month_col = find_col(["month", "mes", "month_name"]) or next(
+        (c for c in df.columns if "month" in c.lower() or "mes" in c.lower()),
+        df.columns[0],
+    )
+    real_col = find_col(["real", "real_days", "real_time", "real_delivery_time"]) or (
+        next((c for c in df.columns if "real" in c.lower()), df.columns[1])
+    )
+    est_col = find_col(
+        ["estimated", "estimated_days", "estimated_time", "estimated_delivery_time"]
+    ) or next(
+        (c for c in df.columns if "estim" in c.lower()),
+        df.columns[2 if len(df.columns) > 2 else 1],
+    )
+
+    fig = go.Figure()
+    fig.add_trace(
+        go.Scatter(x=df[month_col], y=df[real_col], mode="lines+markers", name="Real")
+    )
+    fig.add_trace(
+        go.Scatter(
+            x=df[month_col], y=df[est_col], mode="lines+markers", name="Estimado"
+        )
+    )
+    fig.update_layout(
+        title="Tiempo de entrega: Real vs Estimado",
+        xaxis_title="Mes",
+        yaxis_title="Días",
+        margin=dict(l=24, r=16, t=50, b=24),
+        template="simple_white",
+    )
+    return fig
+
+
+# Gráficos del dashboard: (id, consulta de src.dashboard_cube.DASHBOARD_QUERIES,
+# título del mensaje de error, constructor)
+GRAPHS = [
+    (
+        "graph-revenue-heatmap",
+        "revenue_by_month_year",
+        "Revenue por mes/año",
+        figure_revenue_heatmap,
+    ),
+    (
+        "graph-top-categories",
+        "top_10_revenue_categories",
+        "Top 10 categorías por Revenue",
+        lambda df: figure_top_categories(df, "Top 10 categorías por Revenue"),
+    ),
+    (
+        "graph-bottom-categories",
+        "top_10_least_revenue_categories",
+        "Bottom 10 categorías por Revenue",
+        lambda df: figure_bottom_categories(df, "Bottom 10 categorías por Revenue"),
+    ),
+    (
+        "graph-delivery-diff",
+        "delivery_date_difference",
+        "Diferencia estimado vs real por estado",
+        figure_delivery_diff,
+    ),
+    (
+        "graph-real-vs-estimated",
+        "real_vs_estimated_delivered_time",
+        "Tiempo real vs estimado",
+        figure_real_vs_estimated,
+    ),
+]
+
+
+def build_dashboard_figures(frames: Dict[str, DataFrame]) -> Dict[str, go.Figure]:
+    """Figuras del dashboard ({id del gráfico: figura}) según dashboard_frames."""
+    return {
+        graph_id: build(frames[query_name])
+        for graph_id, query_name, _, build in GRAPHS
+    }
+
+
+def build_error_figures(error: str) -> Dict[str, go.Figure]:
+    """Una figura con el mensaje de error en lugar de cada gráfico."""
+    return {
+        graph_id: empty_figure_with_message(title, error)
+        for graph_id, _, title, _ in GRAPHS
+    }
@@ -0,0 +1,197 @@
+# src/export.py
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from pandas import DataFrame, read_sql
+from pyarrow import fs
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+from src.config import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FORMAT,
+    EXPORT_ROOT_PATH,
+    SQLITE_BD_ABSOLUTE_PATH,
+)
+from src.query_cache import get_data_version
+from src.transform import QueryEnum, read_query
+
+# Formatos de exportación -> formato de pyarrow.dataset y extensión de archivo
+EXPORT_FORMATS = {"parquet": ("parquet", ".parquet"), "arrow": ("ipc", ".arrow")}
+
+# {consulta: columna de fecha cuyo año particiona la exportación (year=AAAA/)}
+EXPORT_PARTITIONS = {QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value: "date"}
+
+# Valor de partición para filas sin fecha (el que pyarrow lee como nulo)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+# Archivo con la versión de datos y las filas de cada exportación
+EXPORT_MANIFEST = "_export.json"
+
+
+def _check_format(fmt: str) -> None:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato de exportación no soportado: {fmt}")
+
+
+def _open_writer(path: Path, schema: pa.Schema, fmt: str):
+    """Writer de Parquet o de Arrow IPC (archivo, sin compresión: mapeable)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "parquet":
+        return pq.ParquetWriter(path, schema)
+    return ipc.new_file(str(path), schema)
+
+
+def _arrow_schema(chunk: DataFrame) -> pa.Schema:
+    """Esquema del primer lote; columnas todas nulas se exportan como texto."""
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+    return pa.schema(
+        [
+            field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+            for field in schema
+        ]
+    )
+
+
+def read_export_manifest(path: Path) -> Optional[dict]:
+    manifest_path = path / EXPORT_MANIFEST
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def export_query(
+    database: Engine,
+    query_name: str,
+    export_dir: str = EXPORT_ROOT_PATH,
+    fmt: str = EXPORT_FORMAT,
+    chunksize: int = EXPORT_CHUNK_SIZE,
+) -> int:
+    """
+    Exporta el resultado de una consulta de queries/ a <export_dir>/<consulta>/
+    leyendo el cursor por lotes de `chunksize` filas (read_sql con chunksize,
+    que usa fetchmany), así nunca se materializa el resultado completo. Las
+    consultas de EXPORT_PARTITIONS se escriben particionadas por año
+    (year=AAAA/part-0.parquet). Se escribe en una carpeta temporal que
+    reemplaza a la anterior al terminar, y se omite si la exportación existente
+    ya corresponde a la versión de datos actual.
+    Devuelve la cantidad de filas exportadas.
+    """
+    _check_format(fmt)
+    _, suffix = EXPORT_FORMATS[fmt]
+    path = Path(export_dir) / query_name
+    data_version = get_data_version(database)
+    manifest = read_export_manifest(path)
+    if (
+        data_version is not None
+        and manifest is not None
+        and manifest["data_version"] == data_version
+        and manifest["format"] == fmt
+    ):
+        return manifest["rows"]
+
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    partition_column = EXPORT_PARTITIONS.get(query_name)
+    schema: Optional[pa.Schema] = None
+    writers = {}
+    rows = 0
+    try:
+        with database.connect() as conn:
+            for chunk in read_sql(read_query(query_name), conn, chunksize=chunksize):
+                if schema is None:
+                    schema = _arrow_schema(chunk)
+                rows += len(chunk)
+                if partition_column is None:
+                    parts = [(None, chunk)]
+                else:
+                    years = pd.to_datetime(chunk[partition_column]).dt.year
+                    parts = chunk.groupby(years, dropna=False, sort=False)
+                for year, part in parts:
+                    if year is None:
+                        part_dir = tmp_path
+                    elif pd.isna(year):
+                        part_dir = tmp_path / f"year={NULL_PARTITION}"
+                    else:
+                        part_dir = tmp_path / f"year={int(year)}"
+                    if part_dir not in writers:
+                        writers[part_dir] = _open_writer(
+                            part_dir / f"part-0{suffix}", schema, fmt
+                        )
+                    writers[part_dir].write_table(
+                        pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+                    )
+        if not writers and schema is not None:
+            _open_writer(tmp_path / f"part-0{suffix}", schema, fmt).close()
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    with open(tmp_path / EXPORT_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump({"data_version": data_version, "format": fmt, "rows": rows}, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return rows
+
+
+def export_queries(
+    database: Engine,
+    export_dir: str = EXPORT_ROOT_PATH,
+    fmt: str = EXPORT_FORMAT,
+    chunksize: int = EXPORT_CHUNK_SIZE,
+) -> Dict[str, int]:
+    """Exporta todas las consultas de QueryEnum. Devuelve {consulta: filas}."""
+    return {
+        query.value: export_query(database, query.value, export_dir, fmt, chunksize)
+        for query in QueryEnum
+    }
+
+
+def read_export(
+    query_name: str,
+    export_dir: str = EXPORT_ROOT_PATH,
+    fmt: str = EXPORT_FORMAT,
+    columns: Optional[List[str]] = None,
+) -> DataFrame:
+    """
+    Lee una exportación con los archivos mapeados en memoria, sin volver a
+    ejecutar SQL. En las consultas particionadas se agrega la columna `year`.
+    """
+    _check_format(fmt)
+    dataset_format, _ = EXPORT_FORMATS[fmt]
+    dataset = ds.dataset(
+        str(Path(export_dir) / query_name),
+        format=dataset_format,
+        partitioning="hive",
+        filesystem=fs.LocalFileSystem(use_mmap=True),
+    )
+    return dataset.to_table(columns=columns).to_pandas()
+
+
+def run_all(engine: Optional[Engine] = None):
+    """Exporta los resultados de las consultas a archivos Parquet / Arrow IPC"""
+    print(
+        f"🔹 [EXPORT] Exportando resultados ({EXPORT_FORMAT}) a {EXPORT_ROOT_PATH}..."
+    )
+
+    try:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        rows_exported = export_queries(engine)
+        print(
+            f"✅ [EXPORT] {sum(rows_exported.values())} filas de "
+            f"{len(rows_exported)} consultas exportadas."
+        )
+        return rows_exported
+
+    except Exception as e:
+        print(f"❌ [EXPORT] Error al exportar los resultados: {e}")
+        raise
@@ -1,9 +1,27 @@
-from typing import Dict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from time import perf_counter
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 from pathlib import Path
 
 import requests
 from pandas import DataFrame, read_csv, read_json, to_datetime
-from src.config import DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL, get_csv_to_table_mapping
+from src.cache import (
+    evict_cache,
+    get_cache_path,
+    read_cached_table,
+    write_cached_table,
+)
+from src.config import (
+    CACHE_MAX_BYTES,
+    CACHE_ROOT_PATH,
+    DATASET_ROOT_PATH,
+    EXTRACT_EXECUTOR,
+    EXTRACT_MAX_WORKERS,
+    PUBLIC_HOLIDAYS_URL,
+    STREAM_CHUNK_SIZE,
+    get_csv_to_table_mapping,
+    get_table_schemas,
+)
 
 
 def temp() -> DataFrame:
@@ -29,30 +47,206 @@ def get_public_holidays(public_holidays_url: str, year: str) -> DataFrame:
     return df
 
 
+READ_CSV_KEYS = ("usecols", "dtype", "parse_dates")
+
+
+def get_read_csv_kwargs(schema: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Keep only the schema registry entries that read_csv understands."""
+    return {
+        key: value for key, value in (schema or {}).items() if key in READ_CSV_KEYS
+    }
+
+
+def read_table_csv(
+    csv_path: Path,
+    schema: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+) -> Tuple[DataFrame, float]:
+    """Read one csv file and return it along with the seconds it took to parse.
+
+    Args:
+        csv_path (Path): Path of the csv file.
+        schema (Optional[Dict[str, Any]]): read_csv arguments from the schema
+            registry (usecols, dtype, parse_dates). Default inference if None.
+        cache_dir (Optional[str]): Folder of the columnar cache. On a hit the
+            csv is not parsed; on a miss the parsed table is stored there.
+    """
+    start = perf_counter()
+    read_csv_kwargs = get_read_csv_kwargs(schema)
+    cache_path = (
+        get_cache_path(cache_dir, csv_path, read_csv_kwargs) if cache_dir else None
+    )
+    df = read_cached_table(cache_path) if cache_path else None
+    if df is None:
+        df = read_csv(csv_path, **read_csv_kwargs)
+        if cache_path:
+            write_cached_table(df, cache_path)
+    return df, perf_counter() - start
+
+
+def _timed_public_holidays(
+    public_holidays_url: str, year: str
+) -> Tuple[DataFrame, float]:
+    start = perf_counter()
+    df = get_public_holidays(public_holidays_url, year)
+    return df, perf_counter() - start
+
+
 def extract(
-    csv_folder: str, csv_table_mapping: Dict[str, str], public_holidays_url: str
+    csv_folder: str,
+    csv_table_mapping: Dict[str, str],
+    public_holidays_url: Optional[str],
+    max_workers: int = 1,
+    executor: str = "thread",
+    timings: Optional[Dict[str, float]] = None,
+    table_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
+    cache_dir: Optional[str] = None,
 ) -> Dict[str, DataFrame]:
-    """Extract the data from the csv files and load them into the dataframes."""
-    csv_folder_path = Path(csv_folder)  
-    dataframes = {
-        table_name: read_csv(csv_folder_path / csv_file)  
-        for csv_file, table_name in csv_table_mapping.items()
-    }
+    """Extract the data from the csv files and load them into the dataframes.
+
+    The public holidays request always runs in a background thread so it
+    overlaps with the csv parsing. With ``max_workers > 1`` the csv files are
+    read concurrently using a thread or process pool.
+
+    Args:
+        csv_folder (str): Folder with the csv files.
+        csv_table_mapping (Dict[str, str]): Mapping of csv file names to table names.
+        public_holidays_url (Optional[str]): Base url of the public holidays API.
+            The holidays are not fetched if None.
+        max_workers (int): Number of workers used to read the csv files.
+        executor (str): "thread" or "process".
+        timings (Optional[Dict[str, float]]): If given, it is filled with the
+            seconds spent reading each table.
+        table_schemas (Optional[Dict[str, Dict[str, Any]]]): Per table read_csv
+            arguments. Defaults to the registry in get_table_schemas().
+        cache_dir (Optional[str]): Folder of the columnar cache of parsed
+            tables. The cache is not used if None.
+
+    Returns:
+        Dict[str, DataFrame]: Dictionary with the table names as keys and the
+        dataframes as values.
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Tipo de executor no soportado: {executor}")
 
-    holidays = get_public_holidays(public_holidays_url, "2017")
-    dataframes["public_holidays"] = holidays
-    return dataframes
+    csv_folder_path = Path(csv_folder)
+    schemas = get_table_schemas() if table_schemas is None else table_schemas
+    results: Dict[str, Tuple[DataFrame, float]] = {}
 
+    with ThreadPoolExecutor(max_workers=1) as holidays_pool:
+        holidays_future = None
+        if public_holidays_url is not None:
+            holidays_future = holidays_pool.submit(
+                _timed_public_holidays, public_holidays_url, "2017"
+            )
 
-def run_all():
-    """Ejecuta la fase de extracción de datos"""
+        if max_workers > 1:
+            pool_cls = (
+                ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            )
+            with pool_cls(max_workers=max_workers) as pool:
+                futures = {
+                    table_name: pool.submit(
+                        read_table_csv,
+                        csv_folder_path / csv_file,
+                        schemas.get(table_name),
+                        cache_dir,
+                    )
+                    for csv_file, table_name in csv_table_mapping.items()
+                }
+                results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {
+                table_name: read_table_csv(
+                    csv_folder_path / csv_file, schemas.get(table_name), cache_dir
+                )
+                for csv_file, table_name in csv_table_mapping.items()
+            }
+
+        if holidays_future is not None:
+            results["public_holidays"] = holidays_future.result()
+
+    if cache_dir:
+        evict_cache(cache_dir, CACHE_MAX_BYTES)
+
+    if timings is not None:
+        timings.update({name: seconds for name, (_, seconds) in results.items()})
+    return {name: df for name, (df, _) in results.items()}
+
+
+def extract_stream(
+    csv_folder: str,
+    csv_table_mapping: Dict[str, str],
+    public_holidays_url: str,
+    chunksize: int = STREAM_CHUNK_SIZE,
+    table_schemas: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Iterator[Tuple[str, DataFrame]]:
+    """Extract the data as a stream of (table_name, chunk) pairs.
+
+    Only one chunk of ``chunksize`` rows is held in memory at a time, so the
+    memory used does not depend on the size of the csv files. The public
+    holidays are fetched in the background and yielded last as a single chunk.
+
+    Args:
+        csv_folder (str): Folder with the csv files.
+        csv_table_mapping (Dict[str, str]): Mapping of csv file names to table names.
+        public_holidays_url (str): Base url of the public holidays API.
+        chunksize (int): Number of rows per chunk.
+        table_schemas (Optional[Dict[str, Dict[str, Any]]]): Per table read_csv
+            arguments. Defaults to the registry in get_table_schemas().
+
+    Yields:
+        Tuple[str, DataFrame]: Table name and the next chunk of that table.
+    """
+    csv_folder_path = Path(csv_folder)
+    schemas = get_table_schemas() if table_schemas is None else table_schemas
+
+    with ThreadPoolExecutor(max_workers=1) as holidays_pool:
+        holidays_future = holidays_pool.submit(
+            get_public_holidays, public_holidays_url, "2017"
+        )
+        for csv_file, table_name in csv_table_mapping.items():
+            with read_csv(
+                csv_folder_path / csv_file,
+                chunksize=chunksize,
+                **get_read_csv_kwargs(schemas.get(table_name)),
+            ) as reader:
+                for chunk in reader:
+                    yield table_name, chunk
+
+        yield "public_holidays", holidays_future.result()
+
+
+def run_all(use_cache: bool = True, tables: Optional[Iterable[str]] = None):
+    """
+    Ejecuta la fase de extracción de datos (use_cache=False ignora la caché).
+    Si se indica `tables`, solo se extraen esas tablas (modo incremental) y los
+    feriados únicamente si "public_holidays" está en la lista.
+    """
     from pandas import DataFrame
 
     print("🔹 [EXTRACT] Iniciando extracción de datos...")
     try:
         # Usa las funciones ya definidas en tu módulo
         mapping = get_csv_to_table_mapping()
-        data_frames = extract(DATASET_ROOT_PATH, mapping, PUBLIC_HOLIDAYS_URL)
+        holidays_url = PUBLIC_HOLIDAYS_URL
+        if tables is not None:
+            tables = set(tables)
+            mapping = {csv: t for csv, t in mapping.items() if t in tables}
+            holidays_url = PUBLIC_HOLIDAYS_URL if "public_holidays" in tables else None
+
+        timings: Dict[str, float] = {}
+        data_frames = extract(
+            DATASET_ROOT_PATH,
+            mapping,
+            holidays_url,
+            max_workers=EXTRACT_MAX_WORKERS,
+            executor=EXTRACT_EXECUTOR,
+            timings=timings,
+            cache_dir=CACHE_ROOT_PATH if use_cache else None,
+        )
+        for table_name, seconds in sorted(timings.items(), key=lambda t: -t[1]):
+            print(f"   ⏱ {table_name}: {seconds:.2f}s")
 
         # Validación simple
         if isinstance(data_frames, dict) and all(isinstance(v, DataFrame) for v in data_frames.values()):
@@ -0,0 +1,252 @@
+# src/indexes.py
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Engine
+from src.config import QUERIES_ROOT_PATH
+
+# Índices declarados a mano, además de los que se deducen de queries/*.sql.
+# Compuestos para los filtros de pedidos entregados que usan casi todas las consultas.
+EXTRA_INDEXES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("olist_orders_dataset", ("order_status", "order_delivered_customer_date")),
+    # Rangos de fecha de compra: particiones por período y folds incrementales
+    ("olist_orders_dataset", ("order_purchase_timestamp",)),
+    ("product_category_name_translation", ("product_category_name",)),
+]
+
+# Tablas que no superan este número de filas no se reportan en check_query_plans
+LARGE_TABLE_ROWS = 10_000
+
+_SQL_KEYWORDS = {
+    "on", "using", "where", "join", "left", "right", "inner", "outer", "cross",
+    "group", "order", "limit", "having", "union", "select", "as", "natural",
+}
+_CLAUSE_END = (
+    r"(?=\b(?:JOIN|LEFT|RIGHT|INNER|CROSS|WHERE|GROUP|ORDER|LIMIT|HAVING|UNION)\b"
+    r"|\)|;|$)"
+)
+
+
+def strip_sql_comments(sql: str) -> str:
+    """Quita los comentarios de línea (--) de una consulta."""
+    return re.sub(r"--[^\n]*", "", sql)
+
+
+def resolve_table_name(name: str, table_name_mapping: Dict[str, str]) -> str:
+    """Traduce vistas/nombres cortos (olist_orders) a la tabla física (*_dataset)."""
+    return table_name_mapping.get(name, name)
+
+
+def parse_table_aliases(sql: str) -> Dict[str, str]:
+    """Devuelve {alias: tabla} de las tablas en FROM/JOIN (incluye CTEs)."""
+    aliases: Dict[str, str] = {}
+    pattern = r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?"
+    for table, alias in re.findall(pattern, sql, flags=re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.lower() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def parse_index_columns(sql: str) -> Set[Tuple[str, str]]:
+    """
+    Deduce (tabla, columna) candidatas a índice a partir de una consulta:
+      - columnas de JOIN ... USING (col) y JOIN ... ON a.x = b.y
+      - columnas comparadas por igualdad en WHERE (alias.col = ...)
+      - columnas de GROUP BY (alias.col)
+    Los nombres de tabla pueden ser CTEs; se filtran después contra la base.
+    """
+    sql = strip_sql_comments(sql)
+    aliases = parse_table_aliases(sql)
+    tables = set(aliases.values())
+    candidates: Set[Tuple[str, str]] = set()
+
+    def add_qualified(fragment: str) -> None:
+        for alias, column in re.findall(r"\b(\w+)\.(\w+)\b", fragment):
+            if alias in aliases:
+                candidates.add((aliases[alias], column))
+
+    for columns in re.findall(r"\bUSING\s*\(([^)]*)\)", sql, flags=re.IGNORECASE):
+        for column in columns.split(","):
+            for table in tables:
+                candidates.add((table, column.strip()))
+
+    for condition in re.findall(
+        r"\bON\s+(.+?)" + _CLAUSE_END, sql, flags=re.IGNORECASE | re.DOTALL
+    ):
+        add_qualified(condition)
+
+    for condition in re.findall(
+        r"\bWHERE\s+(.+?)" + _CLAUSE_END, sql, flags=re.IGNORECASE | re.DOTALL
+    ):
+        for alias, column in re.findall(r"\b(\w+)\.(\w+)\s*=", condition):
+            if alias in aliases:
+                candidates.add((aliases[alias], column))
+
+    for columns in re.findall(
+        r"\bGROUP\s+BY\s+(.+?)" + _CLAUSE_END, sql, flags=re.IGNORECASE | re.DOTALL
+    ):
+        add_qualified(columns)
+
+    return candidates
+
+
+def get_index_spec(
+    database: Engine,
+    queries_dir: str = QUERIES_ROOT_PATH,
+    table_name_mapping: Optional[Dict[str, str]] = None,
+) -> List[Tuple[str, Tuple[str, ...]]]:
+    """
+    Índices a crear: los deducidos de queries/*.sql más EXTRA_INDEXES,
+    descartando tablas o columnas que no existen en la base.
+    """
+    from src.load import TABLE_NAME_MAPPING
+
+    table_name_mapping = table_name_mapping or TABLE_NAME_MAPPING
+    inspector = inspect(database)
+    existing_tables = set(inspector.get_table_names())
+    columns_by_table = {
+        table: {col["name"] for col in inspector.get_columns(table)}
+        for table in existing_tables
+    }
+
+    spec: List[Tuple[str, Tuple[str, ...]]] = []
+    for sql_file in sorted(Path(queries_dir).glob("*.sql")):
+        sql = sql_file.read_text(encoding="utf-8")
+        for table, column in parse_index_columns(sql):
+            table = resolve_table_name(table, table_name_mapping)
+            if column in columns_by_table.get(table, set()):
+                spec.append((table, (column,)))
+
+    for table, columns in EXTRA_INDEXES:
+        if set(columns) <= columns_by_table.get(table, set()):
+            spec.append((table, columns))
+
+    # Un índice de una columna sobra si ya es prefijo de un índice compuesto
+    spec = set(spec)
+    redundant = {
+        (table, columns[:1])
+        for table, columns in spec
+        if len(columns) > 1 and (table, columns[:1]) in spec
+    }
+    return sorted(spec - redundant)
+
+
+def get_index_name(table: str, columns: Iterable[str]) -> str:
+    return f"idx_{table}__{'__'.join(columns)}"
+
+
+def build_indexes(
+    database: Engine,
+    tables: Optional[Iterable[str]] = None,
+    queries_dir: str = QUERIES_ROOT_PATH,
+) -> List[str]:
+    """
+    Paso post-carga: crea los índices de get_index_spec() y ejecuta ANALYZE para
+    que el planner de SQLite tenga estadísticas. Si se indica `tables` (nombres
+    físicos), solo se indexan y analizan esas tablas.
+    Devuelve los nombres de los índices asegurados.
+    """
+    tables = None if tables is None else set(tables)
+    spec = [
+        (table, columns)
+        for table, columns in get_index_spec(database, queries_dir)
+        if tables is None or table in tables
+    ]
+
+    index_names = []
+    with database.begin() as conn:
+        for table, columns in spec:
+            index_name = get_index_name(table, columns)
+            column_list = ", ".join(f'"{col}"' for col in columns)
+            conn.exec_driver_sql(
+                f'CREATE INDEX IF NOT EXISTS "{index_name}" '
+                f'ON "{table}" ({column_list});'
+            )
+            index_names.append(index_name)
+
+        if tables is None:
+            conn.exec_driver_sql("ANALYZE;")
+        else:
+            for table in sorted({table for table, _ in spec}):
+                conn.exec_driver_sql(f'ANALYZE "{table}";')
+
+    return index_names
+
+
+def explain_query_plan(
+    database: Engine, sql: str, params: Optional[Dict[str, Any]] = None
+) -> List[str]:
+    """
+    Devuelve las líneas (detail) de EXPLAIN QUERY PLAN de una consulta, con sus
+    parámetros (:nombre) si los tiene.
+    """
+    with database.connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {sql}", params or ()
+        ).fetchall()
+    return [row[-1] for row in rows]
+
+
+def find_unindexed_scans(
+    database: Engine,
+    sql: str,
+    min_rows: int = LARGE_TABLE_ROWS,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[str]:
+    """
+    Pasos del plan que recorren completa una tabla grande sin índice
+    ("SCAN x" sin USING INDEX) o que necesitan un índice automático temporal.
+    """
+    from src.load import TABLE_NAME_MAPPING
+
+    aliases = parse_table_aliases(strip_sql_comments(sql))
+    existing_tables = set(inspect(database).get_table_names())
+    problems = []
+    for detail in explain_query_plan(database, sql, params):
+        match = re.match(r"(SCAN|SEARCH) (\w+)", detail)
+        if not match:
+            continue
+        if match.group(1) == "SCAN" and "INDEX" in detail:
+            continue
+        if match.group(1) == "SEARCH" and "AUTOMATIC" not in detail:
+            continue
+        table = resolve_table_name(
+            aliases.get(match.group(2), match.group(2)), TABLE_NAME_MAPPING
+        )
+        if table not in existing_tables:
+            continue
+        with database.connect() as conn:
+            rows = conn.exec_driver_sql(f'SELECT COUNT(*) FROM "{table}";').scalar()
+        if rows >= min_rows:
+            problems.append(f"{detail} [{table}: {rows} filas]")
+    return problems
+
+
+def check_query_plans(
+    database: Engine,
+    queries_dir: str = QUERIES_ROOT_PATH,
+    min_rows: int = LARGE_TABLE_ROWS,
+) -> Dict[str, List[str]]:
+    """
+    Revisa con EXPLAIN QUERY PLAN las consultas de src.transform.get_all_queries()
+    (el SQL y los parámetros que ejecuta run_queries, según get_query_sql) y
+    devuelve {consulta: problemas} solo para las que todavía recorren sin
+    índice una tabla grande.
+    """
+    from src.transform import QueryEnum, get_query_sql
+
+    report: Dict[str, List[str]] = {}
+    for query in QueryEnum:
+        sql_name, params = get_query_sql(query.value)
+        sql_file = Path(queries_dir) / f"{sql_name}.sql"
+        if not sql_file.exists():
+            continue
+        problems = find_unindexed_scans(
+            database, sql_file.read_text(encoding="utf-8"), min_rows, params
+        )
+        if problems:
+            report[query.value] = problems
+    return report
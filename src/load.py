@@ -1,9 +1,47 @@
 # src/load.py
-from typing import Dict
+import os
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from pandas import DataFrame
 from sqlalchemy.engine.base import Engine
-from sqlalchemy import create_engine
-from src.config import SQLITE_BD_ABSOLUTE_PATH
+from sqlalchemy import DateTime, Float, Integer, Text, create_engine, inspect
+from sqlalchemy.types import TypeEngine
+from src.artifacts import iter_artifact_chunks
+from src.cache import hash_file
+from src.indexes import build_indexes
+from src.query_cache import bump_data_version
+from src.sqlite_bulk import (
+    bulk_load,
+    bulk_load_chunks,
+    get_timestamp_columns,
+    to_julian_day,
+)
+from src.rollups import (
+    ROLLUP_SOURCE_TABLES,
+    ROLLUP_TABLES,
+    build_rollup,
+    fold_new_orders,
+)
+from src.star_schema import (
+    FACT_SOURCE_TABLES,
+    FACT_TABLE,
+    build_fact_order_items,
+    get_fact_watermark,
+    is_fact_current,
+    mark_fact_current,
+)
+from src.config import (
+    DATASET_ROOT_PATH,
+    LOAD_CHUNK_SIZE,
+    PUBLIC_HOLIDAYS_URL,
+    SQLITE_BD_ABSOLUTE_PATH,
+    SCHEMA_VERSION,
+    STREAM_CHUNK_SIZE,
+    get_csv_to_table_mapping,
+    get_table_schemas,
+)
 
 # Mapeo opcional por si te llegan nombres "cortos" desde extract()
 TABLE_NAME_MAPPING = {
@@ -18,7 +56,52 @@ TABLE_NAME_MAPPING = {
     # Si ya llegan con *_dataset, se respetan tal cual
 }
 
-def load(data_frames: Dict[str, DataFrame], database: Engine) -> None:
+# Vistas de compatibilidad -> tabla (nombre corto) de la que dependen
+COMPAT_VIEWS = {
+    "olist_orders": "olist_orders",
+    "olist_order_items": "olist_order_items",
+    "olist_products": "olist_products",
+    "olist_order_reviews": "olist_order_reviews",
+}
+
+# Tablas derivadas en orden de construcción: (tabla, dependencias, builder).
+# Se reconstruyen después de cada carga si cambió alguna de sus dependencias.
+DERIVED_TABLES = [
+    (FACT_TABLE, FACT_SOURCE_TABLES, build_fact_order_items),
+    *(
+        (name, ROLLUP_SOURCE_TABLES, partial(build_rollup, table_name=name))
+        for name in ROLLUP_TABLES
+    ),
+]
+
+# Manifiesto de carga incremental: una fila por tabla con la huella del csv
+MANIFEST_TABLE = "etl_manifest"
+
+def get_sql_dtypes(table_name: str) -> Dict[str, TypeEngine]:
+    """
+    Traduce el registro de esquemas (src.config.get_table_schemas) a tipos SQL
+    para to_sql, así las columnas no dependen de la inferencia de pandas.
+    Devuelve un dict vacío para tablas sin esquema (p. ej. public_holidays).
+    """
+    schema = get_table_schemas().get(table_name)
+    if schema is None:
+        return {}
+
+    sql_dtypes: Dict[str, TypeEngine] = {}
+    for column, dtype in schema["dtype"].items():
+        if dtype.startswith("int"):
+            sql_dtypes[column] = Integer()
+        elif dtype.startswith("float"):
+            sql_dtypes[column] = Float()
+        else:
+            sql_dtypes[column] = Text()
+    for column in schema["parse_dates"]:
+        sql_dtypes[column] = DateTime()
+    return sql_dtypes
+
+def load(
+    data_frames: Dict[str, DataFrame], database: Engine, build_derived: bool = True
+) -> None:
     """
     Carga los DataFrames en SQLite usando las claves del dict como nombres de tabla
     (o las traduce a *_dataset con TABLE_NAME_MAPPING). Reemplaza si ya existen.
@@ -26,43 +109,348 @@ def load(data_frames: Dict[str, DataFrame], database: Engine) -> None:
       - olist_orders -> olist_orders_dataset
       - olist_order_items -> olist_order_items_dataset
       - olist_products -> olist_products_dataset
+    y, como pasos post-carga, los índices que usan las consultas + ANALYZE,
+    las tablas derivadas (DERIVED_TABLES) que dependen de lo cargado y una
+    nueva versión de datos para la caché de resultados (src.query_cache).
+    Con build_derived=False no se reconstruyen las tablas derivadas (el modo
+    particionado las construye después en paralelo, ver src.partitioned) y
+    run_queries() vuelve a leer de las tablas crudas hasta entonces.
     """
-    # 1) Cargar tablas
+    # 1) Cargar tablas (carga masiva nativa en SQLite, to_sql en otros motores)
     for table_name, df in data_frames.items():
         if not isinstance(df, DataFrame):
             raise TypeError(f"El valor para '{table_name}' no es un DataFrame")
-        final_name = TABLE_NAME_MAPPING.get(table_name, table_name)
-        df.to_sql(name=final_name, con=database, if_exists="replace", index=False)
+    was_current = is_fact_current(database)
+
+    if database.dialect.name == "sqlite":
+        bulk_load(data_frames, database, TABLE_NAME_MAPPING)
+    else:
+        for table_name, df in data_frames.items():
+            df.to_sql(
+                name=TABLE_NAME_MAPPING.get(table_name, table_name),
+                con=database,
+                if_exists="replace",
+                index=False,
+                dtype=get_sql_dtypes(table_name),
+                chunksize=LOAD_CHUNK_SIZE,
+            )
 
     # 2) Vistas de compatibilidad para no tocar transform.py
+    create_compat_views(database, tables=data_frames.keys())
+
+    # 3) Índices + estadísticas de las tablas recién cargadas
+    build_indexes(
+        database,
+        tables=[TABLE_NAME_MAPPING.get(name, name) for name in data_frames],
+    )
+
+    # 4) Tablas derivadas (tabla de hechos, ...)
+    built = []
+    if build_derived:
+        built = build_derived_tables(database, data_frames.keys())
+
+    # 5) Nueva versión de datos: invalida la caché de resultados de consultas
+    finish_load(
+        database,
+        build_derived and (was_current or len(built) == len(DERIVED_TABLES)),
+    )
+
+def load_stream(
+    chunks: Iterable[Tuple[str, DataFrame]], database: Engine
+) -> Dict[str, int]:
+    """
+    Carga un flujo de (tabla, chunk) en SQLite agregando cada chunk apenas llega,
+    sin acumular la tabla completa en memoria. El primer chunk de cada tabla
+    la reemplaza y los siguientes se agregan (if_exists="append").
+    Devuelve la cantidad de filas cargadas por tabla.
+    """
+    was_current = is_fact_current(database)
+    if database.dialect.name == "sqlite":
+        rows_loaded = bulk_load_chunks(chunks, database, TABLE_NAME_MAPPING)
+    else:
+        rows_loaded: Dict[str, int] = {}
+        for table_name, chunk in chunks:
+            if not isinstance(chunk, DataFrame):
+                raise TypeError(f"El valor para '{table_name}' no es un DataFrame")
+            chunk.to_sql(
+                name=TABLE_NAME_MAPPING.get(table_name, table_name),
+                con=database,
+                if_exists="append" if table_name in rows_loaded else "replace",
+                index=False,
+                dtype=get_sql_dtypes(table_name),
+                chunksize=LOAD_CHUNK_SIZE,
+            )
+            rows_loaded[table_name] = rows_loaded.get(table_name, 0) + len(chunk)
+
+    create_compat_views(database)
+    build_indexes(
+        database,
+        tables=[TABLE_NAME_MAPPING.get(name, name) for name in rows_loaded],
+    )
+    built = build_derived_tables(database, rows_loaded.keys())
+    finish_load(database, was_current or len(built) == len(DERIVED_TABLES))
+    return rows_loaded
+
+def load_append(data_frames: Dict[str, DataFrame], database: Engine) -> Dict[str, int]:
+    """
+    Agrega filas nuevas (p. ej. el lote semanal de pedidos e ítems) a tablas ya
+    cargadas sin reemplazarlas, y pliega solo los pedidos nuevos en la tabla de
+    hechos y en los rollups (src.rollups.fold_new_orders) en vez de
+    reconstruirlos. Si el lote no se puede plegar (can_fold_orders), reconstruye
+    las tablas derivadas completas como load(). Si los rollups estaban al día,
+    siguen marcados así (finish_load) y run_queries() los sigue usando.
+    Devuelve la cantidad de filas agregadas por tabla.
+    """
+    for table_name, df in data_frames.items():
+        if not isinstance(df, DataFrame):
+            raise TypeError(f"El valor para '{table_name}' no es un DataFrame")
+    was_current = is_fact_current(database)
+    foldable = can_fold_orders(data_frames, get_fact_watermark(database))
+
+    if database.dialect.name == "sqlite":
+        rows_loaded = bulk_load(
+            data_frames, database, TABLE_NAME_MAPPING, append=True
+        )
+    else:
+        rows_loaded = {}
+        for table_name, df in data_frames.items():
+            df.to_sql(
+                name=TABLE_NAME_MAPPING.get(table_name, table_name),
+                con=database,
+                if_exists="append",
+                index=False,
+                dtype=get_sql_dtypes(table_name),
+                chunksize=LOAD_CHUNK_SIZE,
+            )
+            rows_loaded[table_name] = len(df)
+
+    # El fold mantiene al día los rollups que ya lo estaban
+    if foldable:
+        fold_new_orders(database)
+        derived_current = was_current
+    else:
+        built = build_derived_tables(database, data_frames.keys())
+        derived_current = was_current or len(built) == len(DERIVED_TABLES)
+    finish_load(database, derived_current)
+    return rows_loaded
+
+def finish_load(database: Engine, derived_current: bool) -> str:
+    """
+    Último paso de cada carga: escribe una nueva versión de datos (invalida la
+    caché de resultados) y, si la tabla de hechos y los rollups quedaron al día
+    con lo cargado, la registra con mark_fact_current para que run_queries() y
+    el cubo del dashboard lean de los rollups. Devuelve la nueva versión.
+    """
+    data_version = bump_data_version(database)
+    if derived_current:
+        mark_fact_current(database, data_version)
+    return data_version
+
+def can_fold_orders(
+    data_frames: Dict[str, DataFrame], watermark: Optional[float]
+) -> bool:
+    """
+    Indica si un lote de filas nuevas se puede plegar de forma incremental: ya
+    hay marca de agua, todos los pedidos del lote tienen fecha de compra
+    posterior a ella y los ítems del lote son de esos mismos pedidos.
+    """
+    if watermark is None:
+        return False
+    frames = {
+        TABLE_NAME_MAPPING.get(name, name): df for name, df in data_frames.items()
+    }
+    orders = frames.get("olist_orders_dataset")
+    items = frames.get("olist_order_items_dataset")
+    order_ids = set() if orders is None else set(orders["order_id"])
+    if items is not None and not set(items["order_id"]) <= order_ids:
+        return False
+    if orders is None or orders.empty:
+        return True
+    purchase = orders["order_purchase_timestamp"]
+    return not purchase.isna().any() and to_julian_day(purchase.min()) > watermark
+
+def create_compat_views(
+    database: Engine, tables: Optional[Iterable[str]] = None
+) -> None:
+    """
+    Crea vistas de compatibilidad para transform.py:
+      - olist_orders -> olist_orders_dataset
+      - olist_order_items -> olist_order_items_dataset
+      - olist_products -> olist_products_dataset
+      - olist_order_reviews -> olist_order_reviews_dataset
+    Las fechas que la carga masiva guarda como día juliano (REAL) se exponen
+    legibles ('YYYY-MM-DD HH:MM:SS') con datetime(); las columnas numéricas
+    quedan disponibles en la tabla física.
+    Si se indica `tables`, solo recrea las vistas que dependen de esas tablas.
+    """
+    tables = None if tables is None else set(tables)
+    inspector = inspect(database)
+    existing_tables = set(inspector.get_table_names())
     with database.connect() as conn:
-        conn.exec_driver_sql("DROP VIEW IF EXISTS olist_orders;")
-        conn.exec_driver_sql("DROP VIEW IF EXISTS olist_order_items;")
-        conn.exec_driver_sql("DROP VIEW IF EXISTS olist_products;")
+        for view_name, table_name in COMPAT_VIEWS.items():
+            if tables is not None and table_name not in tables:
+                continue
+            final_name = TABLE_NAME_MAPPING.get(table_name, table_name)
+            if final_name not in existing_tables:
+                continue
+            timestamps = set(get_timestamp_columns(table_name))
+            columns = []
+            for column in inspector.get_columns(final_name):
+                name = column["name"]
+                if name in timestamps and str(column["type"]) == "REAL":
+                    columns.append(f'datetime("{name}") AS "{name}"')
+                else:
+                    columns.append(f'"{name}"')
+            conn.exec_driver_sql(f"DROP VIEW IF EXISTS {view_name};")
+            conn.exec_driver_sql(f"""
+                CREATE VIEW {view_name} AS
+                SELECT {", ".join(columns)} FROM {final_name};
+            """)
 
-        conn.exec_driver_sql("""
-            CREATE VIEW olist_orders AS
-            SELECT * FROM olist_orders_dataset;
-        """)
-        conn.exec_driver_sql("""
-            CREATE VIEW olist_order_items AS
-            SELECT * FROM olist_order_items_dataset;
-        """)
-        conn.exec_driver_sql("""
-            CREATE VIEW olist_products AS
-            SELECT * FROM olist_products_dataset;
+def build_derived_tables(database: Engine, tables: Iterable[str]) -> List[str]:
+    """
+    Reconstruye, en orden, las tablas de DERIVED_TABLES que dependen de alguna
+    de las tablas recién cargadas (y de las derivadas reconstruidas antes).
+    Se omiten las que todavía no tienen todas sus dependencias en la base.
+    Devuelve los nombres de las tablas reconstruidas.
+    """
+    changed = {TABLE_NAME_MAPPING.get(name, name) for name in tables}
+    existing = set(inspect(database).get_table_names())
+    built = []
+    for table_name, dependencies, builder in DERIVED_TABLES:
+        if not changed & set(dependencies) or not set(dependencies) <= existing:
+            continue
+        builder(database)
+        changed.add(table_name)
+        existing.add(table_name)
+        built.append(table_name)
+    return built
+
+def get_source_fingerprint(csv_path: Path) -> Dict[str, Any]:
+    """Huella de un csv: tamaño, mtime, sha256 y versión del esquema."""
+    stat = os.stat(csv_path)
+    return {
+        "source_file": csv_path.name,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "sha256": hash_file(csv_path),
+        "schema_version": SCHEMA_VERSION,
+    }
+
+def read_manifest(database: Engine) -> Dict[str, Dict[str, Any]]:
+    """Lee el manifiesto de carga (vacío si todavía no existe)."""
+    if not inspect(database).has_table(MANIFEST_TABLE):
+        return {}
+    with database.connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"SELECT table_name, source_file, size, mtime, sha256, schema_version "
+            f"FROM {MANIFEST_TABLE};"
+        ).fetchall()
+    return {
+        row[0]: {
+            "source_file": row[1],
+            "size": row[2],
+            "mtime": row[3],
+            "sha256": row[4],
+            "schema_version": row[5],
+        }
+        for row in rows
+    }
+
+def update_manifest(database: Engine, fingerprints: Dict[str, Dict[str, Any]]) -> None:
+    """Registra (o reemplaza) la huella de cada tabla cargada."""
+    loaded_at = datetime.now().isoformat(timespec="seconds")
+    with database.begin() as conn:
+        conn.exec_driver_sql(f"""
+            CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+                table_name TEXT PRIMARY KEY,
+                source_file TEXT,
+                size INTEGER,
+                mtime REAL,
+                sha256 TEXT,
+                schema_version INTEGER,
+                loaded_at TEXT
+            );
         """)
+        for table_name, fp in fingerprints.items():
+            conn.exec_driver_sql(
+                f"INSERT OR REPLACE INTO {MANIFEST_TABLE} "
+                "VALUES (?, ?, ?, ?, ?, ?, ?);",
+                (
+                    table_name,
+                    fp["source_file"],
+                    fp["size"],
+                    fp["mtime"],
+                    fp["sha256"],
+                    fp["schema_version"],
+                    loaded_at,
+                ),
+            )
+
+def get_changed_tables(
+    database: Engine, csv_folder: str, csv_table_mapping: Dict[str, str]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compara cada csv con el manifiesto y devuelve {tabla: huella} de las tablas
+    que hay que volver a cargar: csv nuevo o modificado, cambio de esquema o
+    tabla ausente en la base. Si tamaño y mtime coinciden no se recalcula el
+    hash; si solo cambió el mtime pero el contenido es igual, se actualiza el
+    manifiesto sin recargar la tabla.
+    """
+    manifest = read_manifest(database)
+    existing = set(inspect(database).get_table_names())
+    changed: Dict[str, Dict[str, Any]] = {}
+    touched: Dict[str, Dict[str, Any]] = {}
+
+    for csv_file, table_name in csv_table_mapping.items():
+        csv_path = Path(csv_folder) / csv_file
+        previous = manifest.get(table_name)
+        final_name = TABLE_NAME_MAPPING.get(table_name, table_name)
+        if (
+            previous is None
+            or final_name not in existing
+            or previous["schema_version"] != SCHEMA_VERSION
+        ):
+            changed[table_name] = get_source_fingerprint(csv_path)
+            continue
+
+        stat = os.stat(csv_path)
+        if previous["size"] == stat.st_size and previous["mtime"] == stat.st_mtime:
+            continue
+
+        fingerprint = get_source_fingerprint(csv_path)
+        if fingerprint["sha256"] == previous["sha256"]:
+            touched[table_name] = fingerprint
+        else:
+            changed[table_name] = fingerprint
 
-def run_all(data_frames=None):
-    """Ejecuta la fase de carga de datos en SQLite"""
+    if touched:
+        update_manifest(database, touched)
+    return changed
+
+def run_all(
+    data_frames=None,
+    fingerprints=None,
+    engine: Optional[Engine] = None,
+    build_derived: bool = True,
+):
+    """
+    Ejecuta la fase de carga de datos en SQLite. Si se reciben `fingerprints`
+    (de get_changed_tables), se registran en el manifiesto tras la carga.
+    Con `engine` se usa esa conexión en vez de abrir una nueva; con
+    build_derived=False no se construyen las tablas derivadas (ver load).
+    """
     print("🔹 [LOAD] Iniciando carga de datos en la base de datos...")
 
     try:
-        engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
 
         # Si se llamó sin data_frames (por prueba), no hace nada
         if data_frames:
-            load(data_frames, engine)
+            load(data_frames, engine, build_derived=build_derived)
+            if fingerprints:
+                update_manifest(engine, fingerprints)
             print(f"✅ [LOAD] Datos cargados exitosamente en {SQLITE_BD_ABSOLUTE_PATH}")
         else:
             print("ℹ [LOAD] No se recibieron dataframes, solo se conectó la base de datos.")
@@ -70,4 +458,106 @@ def run_all(data_frames=None):
 
     except Exception as e:
         print(f"❌ [LOAD] Error al cargar los datos: {e}")
-        raise
\ No newline at end of file
+        raise
+
+def run_stream(chunksize: int = STREAM_CHUNK_SIZE, engine: Optional[Engine] = None):
+    """
+    Ejecuta extracción y carga en modo streaming (memoria acotada por chunk).
+    Devuelve la cantidad de filas cargadas por tabla.
+    """
+    from src.extract import extract_stream
+
+    print(f"🔹 [LOAD] Carga en streaming (chunks de {chunksize} filas)...")
+
+    try:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        chunks = extract_stream(
+            DATASET_ROOT_PATH,
+            get_csv_to_table_mapping(),
+            PUBLIC_HOLIDAYS_URL,
+            chunksize=chunksize,
+        )
+        rows_loaded = load_stream(chunks, engine)
+        print(
+            f"✅ [LOAD] {sum(rows_loaded.values())} filas cargadas en "
+            f"{len(rows_loaded)} tablas en {SQLITE_BD_ABSOLUTE_PATH}"
+        )
+        return rows_loaded
+
+    except Exception as e:
+        print(f"❌ [LOAD] Error en la carga en streaming: {e}")
+        raise
+
+
+def run_artifacts(
+    manifest: Dict[str, Dict[str, Any]],
+    fingerprints=None,
+    engine: Optional[Engine] = None,
+):
+    """
+    Carga las tablas que extract dejó como archivos (src.artifacts) leyéndolas
+    por lotes, en vez de recibir los DataFrames completos (p. ej. por XCom).
+    Si se reciben `fingerprints`, se registran en el manifiesto tras la carga.
+    Devuelve la cantidad de filas cargadas por tabla.
+    """
+    print("🔹 [LOAD] Cargando tablas desde los archivos de extracción...")
+
+    try:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        if not manifest:
+            print("ℹ [LOAD] El manifiesto de extracción está vacío, no se carga nada.")
+            return {}
+
+        rows_loaded = load_stream(iter_artifact_chunks(manifest), engine)
+        if fingerprints:
+            update_manifest(engine, fingerprints)
+        print(
+            f"✅ [LOAD] {sum(rows_loaded.values())} filas cargadas en "
+            f"{len(rows_loaded)} tablas en {SQLITE_BD_ABSOLUTE_PATH}"
+        )
+        return rows_loaded
+
+    except Exception as e:
+        print(f"❌ [LOAD] Error al cargar los archivos de extracción: {e}")
+        raise
+
+
+def run_incremental(use_cache: bool = True, engine: Optional[Engine] = None):
+    """
+    Extrae y carga solo las tablas cuyo csv cambió desde la última carga
+    (según el manifiesto) y reconstruye lo que depende de ellas.
+    Devuelve la cantidad de filas cargadas por tabla (vacío si no hubo cambios).
+    """
+    from src import extract
+
+    print("🔹 [LOAD] Carga incremental: comparando csv con el manifiesto...")
+
+    try:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        fingerprints = get_changed_tables(
+            engine, DATASET_ROOT_PATH, get_csv_to_table_mapping()
+        )
+        tables = set(fingerprints)
+        if not inspect(engine).has_table("public_holidays"):
+            tables.add("public_holidays")
+
+        if not tables:
+            print("✅ [LOAD] Sin cambios en las fuentes, no se recarga nada.")
+            return {}
+
+        print(f"ℹ [LOAD] Tablas a recargar: {', '.join(sorted(tables))}")
+        data_frames = extract.run_all(use_cache=use_cache, tables=tables)
+        load(data_frames, engine)
+        update_manifest(engine, fingerprints)
+        print(
+            f"✅ [LOAD] {len(data_frames)} tablas recargadas en "
+            f"{SQLITE_BD_ABSOLUTE_PATH}"
+        )
+        return {table_name: len(df) for table_name, df in data_frames.items()}
+
+    except Exception as e:
+        print(f"❌ [LOAD] Error en la carga incremental: {e}")
+        raise
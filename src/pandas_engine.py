@@ -0,0 +1,330 @@
+# src/pandas_engine.py
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame, Series
+from sqlalchemy.engine.base import Engine
+from src.sqlite_bulk import UNIX_EPOCH_JULIAN_MS, MS_PER_DAY
+
+# Número de día juliano (floor(jd + 0.5)) del 1970-01-01
+UNIX_EPOCH_JULIAN_DAY = int(UNIX_EPOCH_JULIAN_MS / MS_PER_DAY + 0.5)
+
+
+def read_columns(database: Engine, table: str, columns: List[str]) -> DataFrame:
+    """
+    Lee solo `columns` de una tabla física (proyección de columnas). No pasa
+    por la caché de resultados: son columnas crudas, no resultados de consultas.
+    """
+    column_list = ", ".join(f'"{column}"' for column in columns)
+    return pd.read_sql(f'SELECT {column_list} FROM "{table}"', database)
+
+
+def lookup_codes(keys: Series, dimension: DataFrame, key: str) -> np.ndarray:
+    """
+    Join categórico contra una dimensión de clave única: las categorías son las
+    claves de la dimensión, así que el código de cada valor es su fila en
+    `dimension` (-1 si no está).
+    """
+    return pd.Categorical(keys, categories=dimension[key]).codes
+
+
+def take(dimension: DataFrame, column: str, codes: np.ndarray) -> Series:
+    """Valores de `column` en las filas `codes` de la dimensión (NaN si es -1)."""
+    values = dimension[column].iloc[np.where(codes >= 0, codes, 0)]
+    return values.reset_index(drop=True).where(codes >= 0)
+
+
+def julian_day_number(julian_days: Series) -> Series:
+    """Día calendario (entero) de fechas en día juliano, como DATE() en SQLite."""
+    return np.floor(julian_days + 0.5)
+
+
+def sqlite_round(values, decimals: int = 2):
+    """
+    ROUND(x, decimals) de SQLite: suma media unidad del último decimal más un
+    3e-16 relativo (como su printf) y trunca, así que las mitades se alejan del
+    cero aunque el float quede apenas debajo (5.264999999999999 da 5.27). El
+    .round() de pandas redondea al par sobre el valor binario (5.265 da 5.26),
+    lo que cambia valores y el orden de las filas empatadas.
+    """
+    scaled = np.abs(values) * 10.0**decimals
+    return np.sign(values) * np.floor(scaled + scaled * 3e-16 + 0.5) / 10.0**decimals
+
+
+def _delivered_orders(database: Engine, columns: List[str]) -> DataFrame:
+    """Pedidos 'delivered' con fecha real de entrega, con las columnas pedidas."""
+    needed = ["order_status", "order_delivered_customer_date", *columns]
+    orders = read_columns(
+        database, "olist_orders_dataset", list(dict.fromkeys(needed))
+    )
+    mask = (orders["order_status"] == "delivered") & orders[
+        "order_delivered_customer_date"
+    ].notna()
+    return orders.loc[mask, columns].reset_index(drop=True)
+
+
+def _delivered_items(database: Engine, columns: List[str]) -> DataFrame:
+    """Ítems de pedidos entregados: order_id, price, freight_value y `columns`."""
+    orders = _delivered_orders(database, ["order_id", *columns])
+    items = read_columns(
+        database,
+        "olist_order_items_dataset",
+        ["order_id", "product_id", "price", "freight_value"],
+    )
+    codes = lookup_codes(items["order_id"], orders, "order_id")
+    items = items[codes >= 0].reset_index(drop=True)
+    codes = codes[codes >= 0]
+    for column in columns:
+        items[column] = take(orders, column, codes)
+    return items
+
+
+def _item_categories(database: Engine, items: DataFrame) -> Series:
+    """Categoría en inglés de cada ítem (NaN si no tiene traducción)."""
+    products = read_columns(
+        database, "olist_products_dataset", ["product_id", "product_category_name"]
+    )
+    translation = read_columns(
+        database,
+        "product_category_name_translation",
+        ["product_category_name", "product_category_name_english"],
+    )
+    category_pt = take(
+        products,
+        "product_category_name",
+        lookup_codes(items["product_id"], products, "product_id"),
+    )
+    return take(
+        translation,
+        "product_category_name_english",
+        lookup_codes(category_pt, translation, "product_category_name"),
+    )
+
+
+def delivery_date_difference(database: Engine) -> DataFrame:
+    orders = _delivered_orders(
+        database,
+        [
+            "customer_id",
+            "order_delivered_customer_date",
+            "order_estimated_delivery_date",
+        ],
+    )
+    orders = orders[orders["order_estimated_delivery_date"].notna()]
+    customers = read_columns(
+        database, "olist_customers_dataset", ["customer_id", "customer_state"]
+    )
+    codes = lookup_codes(orders["customer_id"], customers, "customer_id")
+    difference = julian_day_number(
+        orders["order_estimated_delivery_date"]
+    ) - julian_day_number(orders["order_delivered_customer_date"])
+    df = DataFrame(
+        {
+            "State": take(customers, "customer_state", codes).to_numpy(),
+            "difference": difference.to_numpy(),
+        }
+    )[codes >= 0]
+    result = df.groupby("State", as_index=False)["difference"].mean()
+    result["Delivery_Difference"] = np.trunc(result.pop("difference")).astype("int64")
+    return result.sort_values(["Delivery_Difference", "State"]).reset_index(drop=True)
+
+
+def global_ammount_order_status(database: Engine) -> DataFrame:
+    orders = read_columns(database, "olist_orders_dataset", ["order_status"])
+    counts = orders["order_status"].value_counts().sort_index()
+    return DataFrame({"order_status": counts.index, "Ammount": counts.to_numpy()})
+
+
+def revenue_by_month_year(database: Engine) -> DataFrame:
+    from src.transform import DEFAULT_YEAR_RANGE, pivot_month_year
+
+    start_year, end_year = DEFAULT_YEAR_RANGE
+    items = _delivered_items(
+        database, ["order_approved_at_year", "order_approved_at_month"]
+    )
+    items = items[items["order_approved_at_year"].between(start_year, end_year)]
+    revenue = sqlite_round(
+        items.groupby(["order_approved_at_year", "order_approved_at_month"])[
+            "price"
+        ].sum()
+    )
+    df = DataFrame(
+        {
+            "y": revenue.index.get_level_values(0).astype("int64"),
+            "m": revenue.index.get_level_values(1).astype("int64"),
+            "revenue": revenue.to_numpy(),
+        }
+    )
+    return pivot_month_year(df, {"revenue": ""}, start_year, end_year, 0.0)
+
+
+def revenue_per_state(database: Engine) -> DataFrame:
+    items = _delivered_items(database, ["customer_id"])
+    customers = read_columns(
+        database, "olist_customers_dataset", ["customer_id", "customer_state"]
+    )
+    codes = lookup_codes(items["customer_id"], customers, "customer_id")
+    df = DataFrame(
+        {
+            "customer_state": take(customers, "customer_state", codes).to_numpy(),
+            "revenue": (items["price"] + items["freight_value"]).to_numpy(),
+        }
+    )[codes >= 0]
+    revenue = sqlite_round(df.groupby("customer_state")["revenue"].sum())
+    result = DataFrame({"customer_state": revenue.index, "Revenue": revenue.to_numpy()})
+    return (
+        result.sort_values(["Revenue", "customer_state"], ascending=[False, True])
+        .head(10)
+        .reset_index(drop=True)
+    )
+
+
+def _top_10_categories(
+    database: Engine, include_freight: bool, ascending: bool
+) -> DataFrame:
+    items = _delivered_items(database, [])
+    revenue = items["price"].fillna(0)
+    if include_freight:
+        revenue = items["price"] + items["freight_value"]
+    df = DataFrame(
+        {
+            "Category": _item_categories(database, items).to_numpy(),
+            "order_id": items["order_id"].to_numpy(),
+            "revenue": revenue.to_numpy(),
+        }
+    ).dropna(subset=["Category"])
+    grouped = df.groupby("Category")
+    result = DataFrame(
+        {
+            "Num_order": grouped["order_id"].nunique(),
+            "Revenue": sqlite_round(grouped["revenue"].sum()),
+        }
+    ).reset_index()
+    return (
+        result.sort_values(["Revenue", "Category"], ascending=[ascending, True])
+        .head(10)
+        .reset_index(drop=True)
+    )
+
+
+def top_10_least_revenue_categories(database: Engine) -> DataFrame:
+    return _top_10_categories(database, include_freight=True, ascending=True)
+
+
+def top_10_revenue_categories(database: Engine) -> DataFrame:
+    return _top_10_categories(database, include_freight=False, ascending=False)
+
+
+def real_vs_estimated_delivered_time(database: Engine) -> DataFrame:
+    from src.transform import DEFAULT_YEAR_RANGE, pivot_month_year
+
+    start_year, end_year = DEFAULT_YEAR_RANGE
+    orders = _delivered_orders(
+        database,
+        [
+            "order_purchase_timestamp",
+            "order_delivered_customer_date",
+            "order_estimated_delivery_date",
+            "order_purchase_timestamp_year",
+            "order_purchase_timestamp_month",
+        ],
+    )
+    orders = orders[
+        orders["order_estimated_delivery_date"].notna()
+        & orders["order_purchase_timestamp_year"].between(start_year, end_year)
+    ]
+    df = DataFrame(
+        {
+            "y": orders["order_purchase_timestamp_year"].astype("int64"),
+            "m": orders["order_purchase_timestamp_month"].astype("int64"),
+            "real_time": orders["order_delivered_customer_date"]
+            - orders["order_purchase_timestamp"],
+            "estimated_time": orders["order_estimated_delivery_date"]
+            - orders["order_purchase_timestamp"],
+        }
+    )
+    df = df.groupby(["y", "m"], as_index=False).mean()
+    df[["real_time", "estimated_time"]] = sqlite_round(
+        df[["real_time", "estimated_time"]]
+    )
+    return pivot_month_year(
+        df,
+        {"real_time": "_real_time", "estimated_time": "_estimated_time"},
+        start_year,
+        end_year,
+    )
+
+
+def orders_per_day_and_holidays_2017(database: Engine) -> DataFrame:
+    orders = read_columns(
+        database,
+        "olist_orders_dataset",
+        ["order_purchase_timestamp", "order_purchase_timestamp_year"],
+    )
+    purchase_days = julian_day_number(
+        orders.loc[
+            orders["order_purchase_timestamp_year"] == 2017, "order_purchase_timestamp"
+        ]
+    )
+    counts = purchase_days.value_counts().sort_index()
+    dates = pd.to_datetime(counts.index - UNIX_EPOCH_JULIAN_DAY, unit="D")
+    holidays = read_columns(database, "public_holidays", ["date"])
+    holiday_dates = pd.to_datetime(holidays["date"]).dt.normalize()
+    return DataFrame(
+        {
+            "order_count": counts.to_numpy(),
+            "date": dates,
+            "holiday": dates.isin(holiday_dates),
+        }
+    )
+
+
+def get_freight_value_weight_relationship(database: Engine) -> DataFrame:
+    orders = read_columns(
+        database, "olist_orders_dataset", ["order_id", "order_status"]
+    )
+    orders = orders[orders["order_status"] == "delivered"].reset_index(drop=True)
+    items = read_columns(
+        database,
+        "olist_order_items_dataset",
+        ["order_id", "product_id", "freight_value"],
+    )
+    items = items[lookup_codes(items["order_id"], orders, "order_id") >= 0]
+    products = read_columns(
+        database, "olist_products_dataset", ["product_id", "product_weight_g"]
+    )
+    codes = lookup_codes(items["product_id"], products, "product_id")
+    df = DataFrame(
+        {
+            "product_id": items["product_id"].to_numpy(),
+            "product_weight_g": take(products, "product_weight_g", codes).to_numpy(),
+            "freight_value": items["freight_value"].to_numpy(),
+        }
+    ).dropna(subset=["product_weight_g"])
+    result = (
+        df.groupby(["product_id", "product_weight_g"], as_index=False)["freight_value"]
+        .mean()
+        .rename(columns={"freight_value": "avg_freight_value"})
+    )
+    result["avg_freight_value"] = sqlite_round(result["avg_freight_value"])
+    return result.sort_values(
+        ["product_weight_g", "avg_freight_value", "product_id"], kind="mergesort"
+    ).reset_index(drop=True)
+
+
+# Implementación pandas de cada consulta de src.transform.QueryEnum (por nombre)
+PANDAS_QUERIES: Dict[str, Callable[[Engine], DataFrame]] = {
+    query.__name__: query
+    for query in (
+        delivery_date_difference,
+        global_ammount_order_status,
+        revenue_by_month_year,
+        revenue_per_state,
+        top_10_least_revenue_categories,
+        top_10_revenue_categories,
+        real_vs_estimated_delivered_time,
+        orders_per_day_and_holidays_2017,
+        get_freight_value_weight_relationship,
+    )
+}
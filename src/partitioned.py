@@ -0,0 +1,344 @@
+# src/partitioned.py
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from pandas import DataFrame
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine.base import Engine
+from src.config import PARTITION_BY, PARTITION_MAX_WORKERS, SQLITE_BD_ABSOLUTE_PATH
+from src.query_cache import bump_data_version
+from src.rollups import ROLLUP_TABLES, build_rollups, compact_rollup
+from src.sqlite_bulk import to_julian_day
+from src.star_schema import (
+    FACT_TABLE,
+    build_fact_order_items,
+    create_fact_indexes,
+    mark_fact_current,
+    update_fact_watermark,
+)
+from src.transform import run_queries
+
+# Claves de partición de los pedidos: rango de meses de compra o estado del cliente
+PARTITION_KEYS = ("period", "state")
+
+# Esquemas con los que se adjuntan el Data Warehouse (en cada worker) y la base
+# de cada partición (al unir los resultados)
+WAREHOUSE_SCHEMA = "warehouse"
+PARTITION_SCHEMA = "partition"
+
+# Tabla de hechos en construcción durante merge_partitions (reemplaza a la
+# tabla de hechos al final, en la misma transacción que los rollups)
+FACT_MERGE_TABLE = f"{FACT_TABLE}_merge"
+
+# Tablas que cada partición copia con sus filas; el resto de las fuentes de la
+# tabla de hechos (productos, traducción) se leen del Data Warehouse adjunto
+PARTITION_TABLES = {
+    "olist_orders_dataset": "{where}",
+    "olist_order_items_dataset": (
+        "order_id IN (SELECT order_id FROM main.olist_orders_dataset)"
+    ),
+    "olist_customers_dataset": (
+        "customer_id IN (SELECT customer_id FROM main.olist_orders_dataset)"
+    ),
+}
+
+
+def _split_by_period(database: Engine, partitions: int) -> List[Dict[str, Any]]:
+    """
+    Rangos contiguos de meses de compra con una cantidad de pedidos parecida.
+    Los pedidos sin fecha de compra van a la primera partición.
+    """
+    with database.connect() as conn:
+        months = conn.exec_driver_sql(
+            "SELECT order_purchase_timestamp_year, order_purchase_timestamp_month, "
+            "COUNT(*) FROM olist_orders_dataset "
+            "WHERE order_purchase_timestamp IS NOT NULL GROUP BY 1, 2 ORDER BY 1, 2;"
+        ).fetchall()
+
+    total = sum(count for _, _, count in months)
+    bounds: List[float] = []
+    cumulative = 0
+    for year, month, count in months:
+        if cumulative >= total * (len(bounds) + 1) / partitions:
+            bounds.append(to_julian_day(pd.Timestamp(int(year), int(month), 1)))
+        cumulative += count
+
+    plans = []
+    for i in range(len(bounds) + 1):
+        conditions, params = [], {}
+        if i > 0:
+            conditions.append("order_purchase_timestamp >= :start")
+            params["start"] = bounds[i - 1]
+        if i < len(bounds):
+            conditions.append("order_purchase_timestamp < :end")
+            params["end"] = bounds[i]
+        where = " AND ".join(conditions) or "1"
+        if i == 0:
+            where = f"({where}) OR order_purchase_timestamp IS NULL"
+        plans.append({"where": where, "params": params})
+    return plans
+
+
+def _split_by_state(database: Engine, partitions: int) -> List[Dict[str, Any]]:
+    """
+    Grupos de estados del cliente con una cantidad de pedidos parecida (cada
+    estado, de mayor a menor, va al grupo con menos pedidos). Los pedidos sin
+    estado van al grupo del estado NULL.
+    """
+    with database.connect() as conn:
+        counts = conn.exec_driver_sql(
+            "SELECT c.customer_state, COUNT(*) FROM olist_orders_dataset AS o "
+            "LEFT JOIN olist_customers_dataset AS c ON c.customer_id = o.customer_id "
+            "GROUP BY c.customer_state ORDER BY 2 DESC, 1;"
+        ).fetchall()
+
+    groups: List[List[Optional[str]]] = [[] for _ in range(partitions)]
+    loads = [0] * partitions
+    for state, count in counts:
+        lightest = loads.index(min(loads))
+        groups[lightest].append(state)
+        loads[lightest] += count
+
+    plans = []
+    for states in filter(None, groups):
+        names = [state for state in states if state is not None]
+        params = {f"state_{i}": state for i, state in enumerate(names)}
+        conditions = []
+        if names:
+            conditions.append(
+                "customer_id IN (SELECT customer_id FROM "
+                f"{WAREHOUSE_SCHEMA}.olist_customers_dataset WHERE customer_state "
+                f"IN ({', '.join(f':{name}' for name in params)}))"
+            )
+        if len(names) < len(states):
+            conditions.append(
+                "customer_id NOT IN (SELECT customer_id FROM "
+                f"{WAREHOUSE_SCHEMA}.olist_customers_dataset "
+                "WHERE customer_state IS NOT NULL)"
+            )
+        plans.append({"where": " OR ".join(conditions), "params": params})
+    return plans
+
+
+def plan_partitions(
+    database: Engine, by: str = PARTITION_BY, partitions: int = PARTITION_MAX_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Reparte los pedidos del Data Warehouse en hasta `partitions` particiones
+    disjuntas (por rango de meses de compra o por estado del cliente). Cada
+    partición es {"where": filtro sobre olist_orders_dataset, "params": ...}.
+    """
+    if by not in PARTITION_KEYS:
+        raise ValueError(f"Clave de partición no soportada: {by}")
+    if by == "period":
+        return _split_by_period(database, max(1, partitions))
+    return _split_by_state(database, max(1, partitions))
+
+
+def aggregate_partition(
+    warehouse_path: str, partition_path: str, partition: Dict[str, Any]
+) -> Dict[str, int]:
+    """
+    Trabajo de cada proceso: copia a una base propia (partition_path) los
+    pedidos de la partición con sus ítems y clientes, leídos del Data
+    Warehouse adjunto, y construye ahí la tabla de hechos y las tablas resumen
+    con los mismos .sql que load. Devuelve {tabla: filas}.
+    """
+    database = create_engine(f"sqlite:///{partition_path}")
+
+    @event.listens_for(database, "connect")
+    def attach_warehouse(dbapi_connection, _):
+        dbapi_connection.execute(
+            f"ATTACH DATABASE ? AS {WAREHOUSE_SCHEMA};", (warehouse_path,)
+        )
+
+    try:
+        with database.begin() as conn:
+            for table_name, where in PARTITION_TABLES.items():
+                conn.exec_driver_sql(
+                    f"CREATE TABLE {table_name} AS SELECT * FROM "
+                    f"{WAREHOUSE_SCHEMA}.{table_name} "
+                    f"WHERE {where.format(where=partition['where'])};",
+                    partition["params"],
+                )
+        rows = {FACT_TABLE: build_fact_order_items(database)}
+        rows.update(build_rollups(database))
+        return rows
+    finally:
+        database.dispose()
+
+
+def merge_partitions(database: Engine, partition_paths: List[str]) -> Dict[str, int]:
+    """
+    Une en `database` la tabla de hechos y las tablas resumen de cada
+    partición. Las filas de hechos se copian con INSERT ... SELECT desde cada
+    partición adjunta a una tabla auxiliar (FACT_MERGE_TABLE). Como ningún
+    pedido está en dos particiones, las sumas y conteos de los resúmenes
+    (también los de pedidos distintos) se suman con compact_rollup, igual que
+    en fold_new_orders. Al final, en una sola transacción, la tabla auxiliar
+    reemplaza a la de hechos (con sus índices y su marca de agua, así
+    run_fact_queries y un fold posterior con load_append siguen funcionando) y
+    las tablas resumen se reemplazan por la suma de las partes.
+    Devuelve {tabla: filas}.
+    """
+    rows: Dict[str, int] = {}
+    with database.connect() as conn:
+        for i, partition_path in enumerate(partition_paths):
+            conn.exec_driver_sql(
+                f"ATTACH DATABASE ? AS {PARTITION_SCHEMA};", (partition_path,)
+            )
+            try:
+                with conn.begin():
+                    source = f"SELECT * FROM {PARTITION_SCHEMA}.{FACT_TABLE}"
+                    if i == 0:
+                        conn.exec_driver_sql(
+                            f"DROP TABLE IF EXISTS main.{FACT_MERGE_TABLE};"
+                        )
+                        conn.exec_driver_sql(
+                            f"CREATE TABLE main.{FACT_MERGE_TABLE} AS {source};"
+                        )
+                    else:
+                        conn.exec_driver_sql(
+                            f"INSERT INTO main.{FACT_MERGE_TABLE} {source};"
+                        )
+                    for table_name in ROLLUP_TABLES:
+                        source = f"SELECT * FROM {PARTITION_SCHEMA}.{table_name}"
+                        if i == 0:
+                            conn.exec_driver_sql(
+                                f"DROP TABLE IF EXISTS temp.{table_name}_parts;"
+                            )
+                            conn.exec_driver_sql(
+                                f"CREATE TEMP TABLE {table_name}_parts AS {source};"
+                            )
+                        else:
+                            conn.exec_driver_sql(
+                                f"INSERT INTO temp.{table_name}_parts {source};"
+                            )
+            finally:
+                conn.exec_driver_sql(f"DETACH DATABASE {PARTITION_SCHEMA};")
+
+        with conn.begin():
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS {FACT_TABLE};")
+            conn.exec_driver_sql(
+                f"ALTER TABLE {FACT_MERGE_TABLE} RENAME TO {FACT_TABLE};"
+            )
+            create_fact_indexes(conn)
+            update_fact_watermark(conn)
+            rows[FACT_TABLE] = conn.exec_driver_sql(
+                f"SELECT COUNT(*) FROM {FACT_TABLE};"
+            ).scalar()
+            for table_name in ROLLUP_TABLES:
+                parts = f"temp.{table_name}_parts"
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table_name};")
+                conn.exec_driver_sql(
+                    f"CREATE TABLE {table_name} AS SELECT * FROM {parts} WHERE 0;"
+                )
+                compact_rollup(conn, table_name, source=parts)
+                conn.exec_driver_sql(f"ANALYZE {table_name};")
+                conn.exec_driver_sql(f"DROP TABLE {parts};")
+                rows[table_name] = conn.exec_driver_sql(
+                    f"SELECT COUNT(*) FROM {table_name};"
+                ).scalar()
+    return rows
+
+
+def build_partitioned(
+    database: Engine,
+    by: str = PARTITION_BY,
+    max_workers: int = PARTITION_MAX_WORKERS,
+) -> Dict[str, int]:
+    """
+    Reconstruye la tabla de hechos y las tablas resumen repartiendo los
+    pedidos en una partición por proceso (plan_partitions): cada proceso extrae
+    su partición del Data Warehouse y la agrega por separado
+    (aggregate_partition) y después se unen los parciales (merge_partitions).
+    El Data Warehouse debe ser una base SQLite en archivo con las tablas ya
+    cargadas; con una base en memoria o una sola partición se construyen en
+    este proceso, como en load. Al terminar se escribe una nueva versión de
+    datos, como en load_append, para que la caché de resultados no devuelva
+    consultas sobre las tablas resumen anteriores, y se marca que las tablas
+    derivadas están al día con ella (run_queries() lee de los rollups).
+    Devuelve {tabla: filas}.
+    """
+    warehouse_path = database.url.database
+    plans = plan_partitions(database, by, max_workers)
+    if (
+        database.dialect.name != "sqlite"
+        or not warehouse_path
+        or warehouse_path == ":memory:"
+        or len(plans) <= 1
+    ):
+        rows = {FACT_TABLE: build_fact_order_items(database), **build_rollups(database)}
+        mark_fact_current(database, bump_data_version(database))
+        return rows
+
+    warehouse_path = str(Path(warehouse_path).resolve())
+    with tempfile.TemporaryDirectory(prefix="olist_partitions_") as tmp_dir:
+        partition_paths = [
+            str(Path(tmp_dir) / f"partition_{i}.db") for i in range(len(plans))
+        ]
+        with ProcessPoolExecutor(max_workers=len(plans)) as pool:
+            list(
+                pool.map(
+                    aggregate_partition,
+                    [warehouse_path] * len(plans),
+                    partition_paths,
+                    plans,
+                )
+            )
+        rows = merge_partitions(database, partition_paths)
+    mark_fact_current(database, bump_data_version(database))
+    return rows
+
+
+def run_partitioned(
+    database: Engine,
+    by: str = PARTITION_BY,
+    max_workers: int = PARTITION_MAX_WORKERS,
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, DataFrame]:
+    """
+    Modo particionado de transform: reconstruye las tablas derivadas en
+    paralelo (build_partitioned) y ejecuta run_queries(), que con los rollups
+    al día lee de ellos. Si se pasa `timings`, se completa con los segundos de
+    la construcción y de las consultas.
+    """
+    start = perf_counter()
+    build_partitioned(database, by, max_workers)
+    built = perf_counter()
+    results = run_queries(database)
+    if timings is not None:
+        timings.update({"build": built - start, "queries": perf_counter() - built})
+    return results
+
+
+def run_all(engine: Optional[Engine] = None):
+    """
+    Ejecuta la fase de transformación en modo particionado, con PARTITION_BY
+    como clave y PARTITION_MAX_WORKERS procesos
+    """
+    print(
+        f"🔹 [TRANSFORM] Modo particionado por {PARTITION_BY} "
+        f"({PARTITION_MAX_WORKERS} procesos)..."
+    )
+
+    try:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        timings: Dict[str, float] = {}
+        results = run_partitioned(engine, timings=timings)
+        for step, seconds in timings.items():
+            print(f"   ⏱ {step}: {seconds:.2f}s")
+
+        print(
+            f"✅ [TRANSFORM] {len(results)} transformaciones ejecutadas exitosamente."
+        )
+        return results
+
+    except Exception as e:
+        print(f"❌ [TRANSFORM] Error en las transformaciones: {e}")
+        raise
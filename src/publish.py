@@ -0,0 +1,184 @@
+# src/publish.py
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.feather as feather
+from pandas import DataFrame
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+from src.config import SNAPSHOT_KEEP, SNAPSHOT_ROOT_PATH, SQLITE_BD_ABSOLUTE_PATH
+from src.dashboard_cube import DashboardCube, build_cube, dashboard_frames
+from src.query_cache import get_data_version
+
+try:
+    from src.dashboard_figures import build_dashboard_figures
+except ImportError:  # sin plotly: se publican solo los datos del cubo
+    build_dashboard_figures = None
+
+# Versión del formato de los snapshots; incrementar al cambiar sus archivos
+SNAPSHOT_FORMAT = 1
+
+# Archivo de SNAPSHOT_ROOT_PATH con el nombre del snapshot más reciente
+SNAPSHOT_LATEST = "LATEST"
+
+# Manifiesto de cada snapshot: versión de datos, fecha y archivos
+SNAPSHOT_MANIFEST = "manifest.json"
+
+# Tablas del cubo (Feather sin compresión, mapeables) y figuras (Plotly JSON)
+CUBE_FILES = {"sales": "cube_sales.arrow", "deliveries": "cube_deliveries.arrow"}
+FIGURES_FILE = "figures.json"
+
+
+def _write_feather(df: DataFrame, path: Path) -> None:
+    """
+    Escribe una tabla del cubo como Feather (Arrow IPC) sin compresión. Los
+    NaN de las columnas numéricas se guardan como NaN y no como nulos, así al
+    leer con memoria mapeada pandas usa los buffers del archivo sin copiarlos.
+    """
+    table = pa.table(
+        {
+            column: pa.array(df[column])
+            if df[column].dtype.name == "category"
+            else pa.array(df[column].to_numpy(), from_pandas=False)
+            for column in df.columns
+        }
+    )
+    feather.write_feather(table, str(path), compression="uncompressed")
+
+
+def _read_feather(path: Path) -> DataFrame:
+    """Lee una tabla del cubo mapeada en memoria; las columnas son de solo lectura."""
+    return feather.read_table(str(path), memory_map=True).to_pandas(split_blocks=True)
+
+
+def get_latest_snapshot_path(snapshot_root: str = SNAPSHOT_ROOT_PATH) -> Optional[Path]:
+    """Carpeta del snapshot más reciente (SNAPSHOT_LATEST), o None si no hay."""
+    root = Path(snapshot_root)
+    try:
+        name = (root / SNAPSHOT_LATEST).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    path = root / name
+    return path if (path / SNAPSHOT_MANIFEST).exists() else None
+
+
+def read_snapshot_manifest(path: Path) -> dict:
+    """Manifiesto de un snapshot publicado (versión de datos, fecha, archivos)."""
+    with open(path / SNAPSHOT_MANIFEST, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_snapshot(path: Path) -> Tuple[DashboardCube, Optional[Dict[str, Any]], dict]:
+    """
+    Lee un snapshot publicado: el cubo (mapeado en memoria: los workers que
+    leen el mismo snapshot comparten las páginas del archivo), las figuras
+    en formato Plotly JSON si se publicaron y el manifiesto.
+    """
+    manifest = read_snapshot_manifest(path)
+    cube = DashboardCube(
+        **{name: _read_feather(path / file) for name, file in CUBE_FILES.items()}
+    )
+    figures = None
+    if manifest["figures"]:
+        with open(path / FIGURES_FILE, "r", encoding="utf-8") as f:
+            figures = json.load(f)
+    return cube, figures, manifest
+
+
+def prune_snapshots(snapshot_root: str, keep: int = SNAPSHOT_KEEP) -> None:
+    """
+    Borra los snapshots más viejos y conserva los `keep` más recientes (y
+    siempre el de SNAPSHOT_LATEST), por si algún worker todavía los usa.
+    """
+    latest = get_latest_snapshot_path(snapshot_root)
+    snapshots = sorted(
+        (
+            path
+            for path in Path(snapshot_root).iterdir()
+            if path.is_dir() and path.suffix != ".tmp"
+        ),
+        key=lambda path: path.stat().st_mtime,
+        reverse=True,
+    )
+    for path in snapshots[max(keep, 1) :]:
+        if path != latest:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def publish_snapshot(
+    database: Engine,
+    snapshot_root: str = SNAPSHOT_ROOT_PATH,
+    keep: int = SNAPSHOT_KEEP,
+) -> Path:
+    """
+    Publica lo que muestra el dashboard para la versión de datos actual: las
+    tablas del cubo (src.dashboard_cube) en Feather y, si plotly está
+    instalado, las figuras sin filtros en Plotly JSON. Se escribe en una
+    carpeta temporal que se renombra al terminar y después se actualiza
+    SNAPSHOT_LATEST, así el dashboard nunca lee un snapshot a medias. Si la
+    versión de datos ya está publicada, se reutiliza. Devuelve la carpeta.
+    """
+    root = Path(snapshot_root)
+    root.mkdir(parents=True, exist_ok=True)
+    data_version = get_data_version(database)
+    # Sin token de versión (base cargada sin load) se publica siempre uno nuevo
+    token = data_version or datetime.now().strftime("%Y%m%d%H%M%S%f")
+    name = f"v{SNAPSHOT_FORMAT}-{token}"
+    path = root / name
+    if data_version is None or not (path / SNAPSHOT_MANIFEST).exists():
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir()
+        cube = build_cube(database)
+        for field, file in CUBE_FILES.items():
+            _write_feather(getattr(cube, field), tmp_path / file)
+        if build_dashboard_figures is not None:
+            figures = build_dashboard_figures(dashboard_frames(cube))
+            with open(tmp_path / FIGURES_FILE, "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        graph_id: json.loads(figure.to_json())
+                        for graph_id, figure in figures.items()
+                    },
+                    f,
+                )
+        manifest = {
+            "data_version": data_version,
+            "format": SNAPSHOT_FORMAT,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": {field: len(getattr(cube, field)) for field in CUBE_FILES},
+            "figures": build_dashboard_figures is not None,
+        }
+        with open(tmp_path / SNAPSHOT_MANIFEST, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+    latest_tmp = root / f"{SNAPSHOT_LATEST}.{os.getpid()}.tmp"
+    latest_tmp.write_text(name, encoding="utf-8")
+    os.replace(latest_tmp, root / SNAPSHOT_LATEST)
+    prune_snapshots(snapshot_root, keep)
+    return path
+
+
+def run_all(engine: Optional[Engine] = None):
+    """Publica el snapshot del dashboard al final de la transformación"""
+    print(
+        f"🔹 [PUBLISH] Publicando el snapshot del dashboard en {SNAPSHOT_ROOT_PATH}"
+    )
+
+    try:
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        path = publish_snapshot(engine)
+        print(f"✅ [PUBLISH] Snapshot {path.name} publicado.")
+        return path
+
+    except Exception as e:
+        print(f"❌ [PUBLISH] Error al publicar el snapshot: {e}")
+        raise
@@ -0,0 +1,165 @@
+# src/query_baseline.py
+import json
+import sqlite3
+import tempfile
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Dict, List
+
+from pandas import read_sql
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+from src.config import QUERY_BASELINE_PATH, get_csv_to_table_mapping
+from src.extract import extract
+from src.indexes import explain_query_plan, strip_sql_comments
+from src.load import load
+from src.synthetic import generate_dataset, synthetic_public_holidays
+from src.transform import QueryEnum, get_query_sql, read_query
+
+# La baseline se registra y se verifica sobre el mismo dataset sintético
+# (src.synthetic, determinístico), así no depende de la base de cada máquina
+BASELINE_SCALE = 0.1
+BASELINE_SEED = 0
+
+# Una consulta regresa si tarda más que baseline * (1 + tolerancia) y que el
+# piso absoluto; el piso evita falsos positivos en consultas de milisegundos y
+# en máquinas más lentas que la que registró la baseline
+QUERY_TIME_TOLERANCE = 0.5
+QUERY_TIME_FLOOR_SECONDS = 0.25
+
+
+def build_baseline_database(
+    folder: str, scale: float = BASELINE_SCALE, seed: int = BASELINE_SEED
+) -> Engine:
+    """
+    Genera el dataset sintético de la baseline en `folder` y lo carga con
+    load() (tablas derivadas incluidas) en `folder`/baseline.db, sin conexión.
+    """
+    csv_folder = Path(folder) / "csv"
+    generate_dataset(str(csv_folder), scale=scale, seed=seed)
+    data_frames = extract(str(csv_folder), get_csv_to_table_mapping(), None)
+    data_frames["public_holidays"] = synthetic_public_holidays()
+    engine = create_engine(f"sqlite:///{Path(folder) / 'baseline.db'}")
+    load(data_frames=data_frames, database=engine)
+    return engine
+
+
+def profile_query(
+    database: Engine, query_name: str, repeat: int = 3
+) -> Dict[str, Any]:
+    """
+    Ejecuta una consulta de QueryEnum con el SQL y los parámetros que usa
+    run_queries (src.transform.get_query_sql), sin pasar por la caché de
+    resultados, y devuelve el mejor tiempo de `repeat` ejecuciones, las filas
+    devueltas y las líneas de EXPLAIN QUERY PLAN.
+    """
+    sql_name, params = get_query_sql(query_name, database)
+    query = read_query(sql_name)
+    best = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        df = read_sql(query, database, params=params)
+        best = min(best, perf_counter() - start)
+    return {
+        "seconds": round(best, 6),
+        "rows": len(df),
+        "plan": explain_query_plan(database, strip_sql_comments(query.text), params),
+    }
+
+
+def profile_queries(database: Engine, repeat: int = 3) -> Dict[str, Dict[str, Any]]:
+    """Perfil (tiempo, filas y plan) de cada consulta de QueryEnum."""
+    return {
+        query.value: profile_query(database, query.value, repeat) for query in QueryEnum
+    }
+
+
+def save_baseline(
+    profiles: Dict[str, Dict[str, Any]], path: str = QUERY_BASELINE_PATH
+) -> None:
+    """Guarda los perfiles como baseline (JSON) junto a la versión de SQLite."""
+    baseline = {"sqlite_version": sqlite3.sqlite_version, "queries": profiles}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load_baseline(path: str = QUERY_BASELINE_PATH) -> Dict[str, Dict[str, Any]]:
+    """Perfiles de la baseline guardada ({} si todavía no existe)."""
+    if not Path(path).exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["queries"]
+
+
+def is_full_scan(plan_line: str) -> bool:
+    """Paso del plan que recorre una tabla entera o arma un índice automático."""
+    if "AUTOMATIC" in plan_line:
+        return True
+    return (
+        plan_line.startswith("SCAN ")
+        and "INDEX" not in plan_line
+        and "CONSTANT ROW" not in plan_line
+    )
+
+
+def compare_to_baseline(
+    profiles: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    tolerance: float = QUERY_TIME_TOLERANCE,
+    floor_seconds: float = QUERY_TIME_FLOOR_SECONDS,
+) -> Dict[str, List[str]]:
+    """
+    Compara los perfiles actuales con la baseline y devuelve {consulta: problemas}
+    solo para las que regresaron: pasos SCAN completos (o índices automáticos)
+    que no estaban en el plan de la baseline o un tiempo mayor que
+    baseline * (1 + tolerance) y que floor_seconds. Una consulta sin baseline
+    también se reporta.
+    """
+    report: Dict[str, List[str]] = {}
+    for query_name, profile in profiles.items():
+        expected = baseline.get(query_name)
+        if expected is None:
+            report[query_name] = ["sin baseline"]
+            continue
+        problems = [
+            f"nuevo SCAN en el plan: {line}"
+            for line in profile["plan"]
+            if is_full_scan(line) and line not in expected["plan"]
+        ]
+        limit = max(expected["seconds"] * (1 + tolerance), floor_seconds)
+        if profile["seconds"] > limit:
+            problems.append(
+                f"tiempo {profile['seconds']:.3f}s > {limit:.3f}s "
+                f"(baseline {expected['seconds']:.3f}s)"
+            )
+        if problems:
+            report[query_name] = problems
+    return report
+
+
+def run_all(path: str = QUERY_BASELINE_PATH):
+    """
+    Registra la baseline sobre el dataset sintético (build_baseline_database):
+    la primera vez y después de un cambio intencional de consultas o índices.
+    Se versiona con el código.
+    """
+    print(f"🔹 [BASELINE] Perfilando las consultas para {path}")
+
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            engine = build_baseline_database(folder)
+            profiles = profile_queries(engine)
+            engine.dispose()
+        save_baseline(profiles, path)
+        print(f"✅ [BASELINE] {len(profiles)} consultas registradas.")
+        return profiles
+
+    except Exception as e:
+        print(f"❌ [BASELINE] Error al registrar la baseline: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    run_all()
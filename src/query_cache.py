@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from pandas import DataFrame, read_feather, read_sql
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.sql.elements import TextClause
+from src.cache import CACHE_SUFFIX, evict_cache
+from src.config import (
+    QUERY_CACHE_ENABLED,
+    QUERY_CACHE_MAX_BYTES,
+    QUERY_CACHE_ROOT_PATH,
+)
+
+# Single row table with the token that load() replaces after every load
+DATA_VERSION_TABLE = "etl_data_version"
+
+
+def bump_data_version(database: Engine) -> str:
+    """Store a new data version token in the database.
+
+    Called by load once the tables, indexes and derived tables are written, so
+    every cached query result of the previous data becomes unreachable.
+
+    Args:
+        database (Engine): Database connection.
+
+    Returns:
+        str: The new data version token.
+    """
+    data_version = uuid.uuid4().hex
+    with database.begin() as conn:
+        conn.exec_driver_sql(
+            f"CREATE TABLE IF NOT EXISTS {DATA_VERSION_TABLE} "
+            "(data_version TEXT NOT NULL, loaded_at TEXT NOT NULL);"
+        )
+        conn.exec_driver_sql(f"DELETE FROM {DATA_VERSION_TABLE};")
+        conn.exec_driver_sql(
+            f"INSERT INTO {DATA_VERSION_TABLE} (data_version, loaded_at) "
+            "VALUES (?, ?);",
+            (data_version, datetime.now().isoformat(timespec="seconds")),
+        )
+    return data_version
+
+
+def get_data_version(database: Engine) -> Optional[str]:
+    """Read the data version token, or None if the database was never loaded."""
+    if DATA_VERSION_TABLE not in inspect(database).get_table_names():
+        return None
+    with database.connect() as conn:
+        return conn.exec_driver_sql(
+            f"SELECT data_version FROM {DATA_VERSION_TABLE};"
+        ).scalar()
+
+
+def get_query_cache_path(
+    cache_dir: str,
+    sql: str,
+    data_version: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """Build the cache file path of a query result.
+
+    Args:
+        cache_dir (str): Cache folder.
+        sql (str): Query text.
+        data_version (str): Data version token of the database.
+        params (Optional[Dict[str, Any]]): Bind parameters of the query.
+
+    Returns:
+        Path: Path of the Feather file for this query and data version.
+    """
+    key = f"{data_version}\0{sql}\0{json.dumps(params or {}, sort_keys=True)}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+    return Path(cache_dir) / f"{digest[:40]}{CACHE_SUFFIX}"
+
+
+def read_sql_cached(
+    query: Union[str, TextClause],
+    database: Engine,
+    params: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
+    max_bytes: int = QUERY_CACHE_MAX_BYTES,
+) -> DataFrame:
+    """Run a read-only query through the persistent result cache.
+
+    The key is the hash of the SQL text plus the data version token written by
+    load, so results are reused until the next load. Databases without a data
+    version always run the query, as do all calls when QUERY_CACHE_ENABLED is
+    off. Results that Feather cannot store are returned without caching them.
+
+    Args:
+        query (Union[str, TextClause]): Query to run.
+        database (Engine): Database connection.
+        params (Optional[Dict[str, Any]]): Bind parameters, part of the key.
+        cache_dir (Optional[str]): Cache folder. Defaults to the module level
+            QUERY_CACHE_ROOT_PATH, read on every call.
+        max_bytes (int): Maximum total size of the cache folder.
+
+    Returns:
+        DataFrame: Query result.
+    """
+    cache_dir = cache_dir or QUERY_CACHE_ROOT_PATH
+    data_version = get_data_version(database) if QUERY_CACHE_ENABLED else None
+    if data_version is None:
+        return read_sql(query, database, params=params)
+
+    sql = query.text if isinstance(query, TextClause) else query
+    cache_path = get_query_cache_path(cache_dir, sql, data_version, params)
+    if cache_path.exists():
+        df = read_feather(cache_path)
+        os.utime(cache_path)
+        return df
+
+    df = read_sql(query, database, params=params)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(
+        f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        df.to_feather(tmp_path)
+    except (TypeError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+        return df
+    os.replace(tmp_path, cache_path)
+    evict_cache(cache_dir, max_bytes)
+    return df
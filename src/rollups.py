@@ -0,0 +1,193 @@
+# src/rollups.py
+from typing import Dict, Optional
+
+import pandas as pd
+from pandas import read_sql
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine.base import Engine
+from src.config import QUERIES_ROOT_PATH
+from src.star_schema import (
+    FACT_TABLE,
+    build_fact_order_items,
+    get_fact_watermark,
+    read_fact_sql,
+    update_fact_watermark,
+)
+from src.transform import QueryEnum, read_query, run_rollup_queries
+
+# Tablas resumen construidas desde la tabla de hechos (queries/rollups/<tabla>.sql)
+ROLLUP_TABLES = (
+    "rollup_orders_daily",
+    "rollup_sales_daily",
+    "rollup_product_freight",
+    "rollup_deliveries_monthly",
+)
+
+# Columnas de agrupación de cada tabla resumen (el GROUP BY de su .sql); el
+# resto son sumas y conteos que se pueden sumar entre lotes de pedidos
+ROLLUP_KEYS = {
+    "rollup_orders_daily": (
+        "purchase_date",
+        "purchase_year",
+        "purchase_month",
+        "customer_state",
+        "order_status",
+    ),
+    "rollup_sales_daily": (
+        "purchase_date",
+        "customer_state",
+        "category",
+        "approved_year",
+        "approved_month",
+        "is_delivered",
+    ),
+    "rollup_product_freight": ("product_id", "product_weight_g"),
+    "rollup_deliveries_monthly": (
+        "purchase_year",
+        "purchase_month",
+        "customer_state",
+        "category",
+        "all_categories",
+    ),
+}
+
+# Los rollups se alimentan solo de la tabla de hechos
+ROLLUP_SOURCE_TABLES = (FACT_TABLE,)
+
+# Tabla temporal con las filas de hechos de los pedidos nuevos de un fold
+FACT_DELTA_TABLE = "fact_order_items_delta"
+
+# Tolerancia de la verificación: los montos y promedios se redondean a 2
+# decimales y sumar en otro orden puede mover el último dígito
+ROLLUP_TOLERANCE = 0.011
+
+
+def read_rollup_sql(table_name: str) -> str:
+    """SELECT que materializa una tabla resumen (queries/rollups/<tabla>.sql)."""
+    with open(
+        f"{QUERIES_ROOT_PATH}/rollups/{table_name}.sql", "r", encoding="utf-8"
+    ) as f:
+        return f.read().strip().rstrip(";")
+
+
+def build_rollup(database: Engine, table_name: str) -> int:
+    """
+    Materializa una tabla resumen de ROLLUP_TABLES a partir de fact_order_items
+    y devuelve su cantidad de filas. Son unos pocos miles de filas frente a los
+    más de 100k ítems de pedido, así que las consultas de queries/rollups/
+    agregan sobre sumas y conteos ya calculados.
+    """
+    rollup_sql = read_rollup_sql(table_name)
+    with database.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table_name};")
+        conn.exec_driver_sql(f"CREATE TABLE {table_name} AS {rollup_sql};")
+        conn.exec_driver_sql(f"ANALYZE {table_name};")
+        rows = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {table_name};").scalar()
+    return rows
+
+
+def build_rollups(database: Engine) -> Dict[str, int]:
+    """Reconstruye todas las tablas resumen. Devuelve {tabla: filas}."""
+    return {
+        table_name: build_rollup(database, table_name) for table_name in ROLLUP_TABLES
+    }
+
+
+def compact_rollup(
+    conn: Connection, table_name: str, source: Optional[str] = None
+) -> None:
+    """
+    Vuelve a agregar una tabla resumen por sus ROLLUP_KEYS, sumando las filas
+    que un fold agregó para claves que ya existían (una fila por clave). Con
+    `source`, la tabla se reemplaza por las filas de esa otra tabla (con las
+    mismas columnas) agregadas del mismo modo, p. ej. los resúmenes parciales
+    del modo particionado (src.partitioned).
+    """
+    keys = ROLLUP_KEYS[table_name]
+    columns = [
+        row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table_name});")
+    ]
+    select_list = ", ".join(
+        column if column in keys else f"SUM({column}) AS {column}"
+        for column in columns
+    )
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS temp.{table_name}_compact;")
+    conn.exec_driver_sql(
+        f"CREATE TEMP TABLE {table_name}_compact AS SELECT {select_list} "
+        f"FROM {source or table_name} GROUP BY {', '.join(keys)};"
+    )
+    conn.exec_driver_sql(f"DELETE FROM {table_name};")
+    conn.exec_driver_sql(
+        f"INSERT INTO {table_name} SELECT * FROM temp.{table_name}_compact;"
+    )
+    conn.exec_driver_sql(f"DROP TABLE temp.{table_name}_compact;")
+
+
+def fold_new_orders(database: Engine) -> int:
+    """
+    Modo incremental: agrega a fact_order_items y a las tablas resumen solo los
+    pedidos comprados después de la marca de agua, en vez de reconstruirlas.
+    Las filas de hechos nuevas se agregan con el mismo .sql de cada rollup y se
+    suman a las existentes (compact_rollup); como cada pedido llega completo en
+    un solo lote, los conteos de pedidos distintos también se pueden sumar.
+    Supone que los datos solo crecen: pedidos ya incluidos que cambian, o
+    pedidos nuevos con fecha anterior a la marca, requieren reconstruir todo
+    (build_fact_order_items + build_rollups), que es lo que se hace si todavía
+    no hay marca de agua.
+    Devuelve la cantidad de filas de hechos agregadas.
+    """
+    watermark = get_fact_watermark(database)
+    if watermark is None:
+        rows = build_fact_order_items(database)
+        build_rollups(database)
+        return rows
+
+    with database.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS temp.{FACT_DELTA_TABLE};")
+        conn.exec_driver_sql(
+            f"CREATE TEMP TABLE {FACT_DELTA_TABLE} AS {read_fact_sql()};",
+            {"watermark": watermark},
+        )
+        rows = conn.exec_driver_sql(
+            f"SELECT COUNT(*) FROM temp.{FACT_DELTA_TABLE};"
+        ).scalar()
+        if rows:
+            for table_name in ROLLUP_TABLES:
+                delta_sql = read_rollup_sql(table_name).replace(
+                    f"FROM {FACT_TABLE}", f"FROM temp.{FACT_DELTA_TABLE}"
+                )
+                conn.exec_driver_sql(f"INSERT INTO {table_name} {delta_sql};")
+                compact_rollup(conn, table_name)
+            conn.exec_driver_sql(
+                f"INSERT INTO {FACT_TABLE} SELECT * FROM temp.{FACT_DELTA_TABLE};"
+            )
+        conn.exec_driver_sql(f"DROP TABLE temp.{FACT_DELTA_TABLE};")
+        update_fact_watermark(conn)
+    return rows
+
+
+def check_rollup_consistency(
+    database: Engine, tolerance: float = ROLLUP_TOLERANCE
+) -> Dict[str, str]:
+    """
+    Compara cada consulta de queries/ (sobre las filas crudas) con su versión
+    sobre las tablas resumen. Devuelve {consulta: diferencia} solo para las que
+    no coinciden; un dict vacío significa que los rollups están al día.
+    """
+    mismatches: Dict[str, str] = {}
+    rollup_results = run_rollup_queries(database)
+    for query in QueryEnum:
+        raw = read_sql(read_query(query.value), database)
+        try:
+            pd.testing.assert_frame_equal(
+                raw,
+                rollup_results[query.value],
+                check_dtype=False,
+                check_exact=False,
+                rtol=0,
+                atol=tolerance,
+            )
+        except AssertionError as error:
+            mismatches[query.value] = str(error)
+    return mismatches
+
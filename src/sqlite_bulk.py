@@ -0,0 +1,225 @@
+# src/sqlite_bulk.py
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from pandas import DataFrame, Timestamp
+from pandas.api.types import (
+    is_bool_dtype,
+    is_datetime64_any_dtype,
+    is_float_dtype,
+    is_integer_dtype,
+)
+from sqlalchemy.engine.base import Engine
+from src.config import LOAD_CHUNK_SIZE, get_table_schemas
+
+# julianday('1970-01-01') en milisegundos, igual que el iJD interno de SQLite
+UNIX_EPOCH_JULIAN_MS = 210866760000000
+MS_PER_DAY = 86400000.0
+
+# PRAGMAs para la carga masiva; se restauran los valores previos al terminar
+LOAD_PRAGMAS = {
+    "journal_mode": "MEMORY",
+    "synchronous": "OFF",
+    "cache_size": -256000,  # ~256 MB de page cache
+    "temp_store": "MEMORY",
+}
+
+
+def get_timestamp_columns(table_name: str) -> List[str]:
+    """Columnas de fecha del registro de esquemas; se guardan como día juliano."""
+    schema = get_table_schemas().get(table_name)
+    return list(schema["parse_dates"]) if schema is not None else []
+
+
+def get_date_part_columns(table_name: str) -> List[str]:
+    """Columnas de fecha que además se guardan como <col>_year y <col>_month."""
+    schema = get_table_schemas().get(table_name)
+    return list(schema.get("date_parts", [])) if schema is not None else []
+
+
+def get_column_types(table_name: str, df: DataFrame) -> Dict[str, str]:
+    """
+    Tipos SQLite explícitos para cada columna. Usa el registro de esquemas
+    (src.config.get_table_schemas) y, para tablas sin esquema, el dtype de pandas.
+    Las fechas del registro se guardan como día juliano (REAL, indexable y
+    aceptado tal cual por julianday()/date()/strftime()) y se agregan las
+    columnas enteras <col>_year y <col>_month declaradas en "date_parts".
+    """
+    schema = get_table_schemas().get(table_name)
+    column_types: Dict[str, str] = {}
+    for column in df.columns:
+        if schema is not None and column in schema["parse_dates"]:
+            column_types[column] = "REAL"
+        elif schema is not None and column in schema["dtype"]:
+            dtype = schema["dtype"][column]
+            if dtype.startswith("int"):
+                column_types[column] = "INTEGER"
+            elif dtype.startswith("float"):
+                column_types[column] = "REAL"
+            else:
+                column_types[column] = "TEXT"
+        elif is_datetime64_any_dtype(df[column]):
+            column_types[column] = "TIMESTAMP"
+        elif is_integer_dtype(df[column]) or is_bool_dtype(df[column]):
+            column_types[column] = "INTEGER"
+        elif is_float_dtype(df[column]):
+            column_types[column] = "REAL"
+        else:
+            column_types[column] = "TEXT"
+    for column in get_date_part_columns(table_name):
+        column_types[f"{column}_year"] = "INTEGER"
+        column_types[f"{column}_month"] = "INTEGER"
+    return column_types
+
+
+def get_create_table_sql(final_name: str, column_types: Dict[str, str]) -> str:
+    """DDL explícito (sin inferencia) para la tabla destino."""
+    columns = ",\n  ".join(
+        f'"{column}" {sql_type}' for column, sql_type in column_types.items()
+    )
+    return f'CREATE TABLE IF NOT EXISTS "{final_name}" (\n  {columns}\n);'
+
+
+def to_julian_day(timestamp: Timestamp) -> float:
+    """Día juliano (REAL) de un timestamp, igual que lo guarda la carga masiva."""
+    ms = np.datetime64(timestamp, "ms").astype("int64")
+    return (ms + UNIX_EPOCH_JULIAN_MS) / MS_PER_DAY
+
+
+def _column_values(
+    df: DataFrame, column: str, as_julian_day: bool = False
+) -> np.ndarray:
+    """Valores de una columna como objetos Python, con None en lugar de NaN/NaT."""
+    series = df[column]
+    missing = series.isna().to_numpy()
+    if as_julian_day:
+        ms = series.to_numpy(dtype="datetime64[ms]").astype("int64")
+        values = ((ms + UNIX_EPOCH_JULIAN_MS) / MS_PER_DAY).astype(object)
+    elif is_datetime64_any_dtype(series):
+        values = series.dt.strftime("%Y-%m-%d %H:%M:%S").to_numpy(dtype=object)
+    elif is_float_dtype(series):
+        values = series.astype("float64").to_numpy(dtype=object)
+    else:
+        values = series.astype(object).to_numpy(dtype=object)
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def _date_part_values(df: DataFrame, column: str, part: str) -> np.ndarray:
+    """Año o mes (enteros) de una columna de fecha, con None en lugar de NaT."""
+    series = getattr(df[column].dt, part)
+    missing = series.isna().to_numpy()
+    values = series.fillna(0).astype("int64").to_numpy(dtype=object)
+    if missing.any():
+        values[missing] = None
+    return values
+
+
+def iter_rows(
+    df: DataFrame, table_name: str = "", chunksize: int = LOAD_CHUNK_SIZE
+) -> Iterator[List[tuple]]:
+    """
+    Convierte el DataFrame en lotes de tuplas tipadas listos para executemany,
+    en el orden de columnas de get_column_types().
+    """
+    timestamps = set(get_timestamp_columns(table_name))
+    date_parts = get_date_part_columns(table_name)
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start : start + chunksize]
+        columns = [
+            _column_values(chunk, column, as_julian_day=column in timestamps)
+            for column in chunk.columns
+        ]
+        for column in date_parts:
+            columns.append(_date_part_values(chunk, column, "year"))
+            columns.append(_date_part_values(chunk, column, "month"))
+        yield list(zip(*columns))
+
+
+def _set_pragmas(cursor, pragmas: Dict[str, object]) -> Dict[str, object]:
+    """Aplica los PRAGMAs y devuelve los valores que tenían antes."""
+    previous = {}
+    for name, value in pragmas.items():
+        previous[name] = cursor.execute(f"PRAGMA {name};").fetchone()[0]
+        cursor.execute(f"PRAGMA {name} = {value};")
+    return previous
+
+
+def bulk_load_chunks(
+    chunks: Iterable[Tuple[str, DataFrame]],
+    database: Engine,
+    table_name_mapping: Optional[Dict[str, str]] = None,
+    chunksize: int = LOAD_CHUNK_SIZE,
+    append: bool = False,
+) -> Dict[str, int]:
+    """
+    Carga masiva en SQLite sin pasar por to_sql/SQLAlchemy:
+      - PRAGMAs de carga (journal_mode, synchronous, cache_size, temp_store),
+        restaurados al final aunque haya errores.
+      - DROP + CREATE TABLE con DDL explícito la primera vez que aparece cada tabla
+        (con append=True se conservan las tablas existentes y se agregan filas).
+      - executemany sobre tuplas tipadas.
+      - Una transacción por tabla: se confirma al pasar a la tabla siguiente, así
+        un flujo de chunks (load_stream) también escribe cada tabla de una vez.
+    Devuelve la cantidad de filas cargadas por tabla.
+    """
+    table_name_mapping = table_name_mapping or {}
+    rows_loaded: Dict[str, int] = {}
+    raw_conn = database.raw_connection()
+    cursor = raw_conn.cursor()
+    previous_pragmas = _set_pragmas(cursor, LOAD_PRAGMAS)
+    current_table = None
+
+    try:
+        for table_name, df in chunks:
+            if not isinstance(df, DataFrame):
+                raise TypeError(f"El valor para '{table_name}' no es un DataFrame")
+            final_name = table_name_mapping.get(table_name, table_name)
+
+            if table_name != current_table:
+                if current_table is not None:
+                    raw_conn.commit()
+                cursor.execute("BEGIN;")
+                current_table = table_name
+
+            column_types = get_column_types(table_name, df)
+            if table_name not in rows_loaded:
+                if not append:
+                    cursor.execute(f'DROP TABLE IF EXISTS "{final_name}";')
+                cursor.execute(get_create_table_sql(final_name, column_types))
+                rows_loaded[table_name] = 0
+
+            placeholders = ", ".join("?" for _ in column_types)
+            columns = ", ".join(f'"{col}"' for col in column_types)
+            insert_sql = (
+                f'INSERT INTO "{final_name}" ({columns}) VALUES ({placeholders});'
+            )
+            for rows in iter_rows(df, table_name, chunksize):
+                cursor.executemany(insert_sql, rows)
+            rows_loaded[table_name] += len(df)
+
+        if current_table is not None:
+            raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        _set_pragmas(cursor, previous_pragmas)
+        cursor.close()
+        raw_conn.close()
+
+    return rows_loaded
+
+
+def bulk_load(
+    data_frames: Dict[str, DataFrame],
+    database: Engine,
+    table_name_mapping: Optional[Dict[str, str]] = None,
+    chunksize: int = LOAD_CHUNK_SIZE,
+    append: bool = False,
+) -> Dict[str, int]:
+    """Carga masiva de un dict {tabla: DataFrame}. Ver bulk_load_chunks."""
+    return bulk_load_chunks(
+        data_frames.items(), database, table_name_mapping, chunksize, append
+    )
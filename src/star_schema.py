@@ -0,0 +1,127 @@
+# src/star_schema.py
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+from sqlalchemy.engine.base import Engine
+from src.config import QUERIES_ROOT_PATH
+from src.query_cache import get_data_version
+
+FACT_TABLE = "fact_order_items"
+
+# Marca de agua (watermark) de la tabla de hechos: fecha de compra (día juliano)
+# del pedido más reciente ya incluido. Una sola fila, escrita en cada build o fold,
+# con la versión de datos (src.query_cache) con la que la tabla de hechos y los
+# rollups quedaron al día (NULL hasta que la carga la registra)
+FACT_WATERMARK_TABLE = "etl_fact_watermark"
+
+# Tablas físicas de las que se alimenta la tabla de hechos
+FACT_SOURCE_TABLES = (
+    "olist_orders_dataset",
+    "olist_order_items_dataset",
+    "olist_customers_dataset",
+    "olist_products_dataset",
+    "product_category_name_translation",
+)
+
+# Índices de la tabla de hechos para los filtros más comunes
+FACT_INDEXES = {
+    f"idx_{FACT_TABLE}__is_delivered": ("is_delivered",),
+    f"idx_{FACT_TABLE}__purchase_year": ("purchase_year", "purchase_date"),
+    f"idx_{FACT_TABLE}__order_status": ("order_status", "is_order_row"),
+}
+
+
+def read_fact_sql() -> str:
+    """SELECT que materializa la tabla de hechos (queries/fact/fact_order_items.sql)."""
+    with open(
+        f"{QUERIES_ROOT_PATH}/fact/{FACT_TABLE}.sql", "r", encoding="utf-8"
+    ) as f:
+        return f.read().strip().rstrip(";")
+
+
+def build_fact_order_items(database: Engine) -> int:
+    """
+    Materializa fact_order_items (esquema estrella) a partir de las tablas
+    cargadas: estado del cliente, categoría en inglés, año/mes de compra y de
+    aprobación y diferencias de días ya calculadas como números. Así las
+    consultas de queries/fact/ no repiten joins ni strftime()/julianday() por fila.
+    Registra también la marca de agua para los folds incrementales
+    (src.rollups.fold_new_orders).
+    Devuelve la cantidad de filas de la tabla de hechos.
+    """
+    fact_sql = read_fact_sql()
+    with database.begin() as conn:
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS {FACT_TABLE};")
+        conn.exec_driver_sql(
+            f"CREATE TABLE {FACT_TABLE} AS {fact_sql};", {"watermark": None}
+        )
+        create_fact_indexes(conn)
+        update_fact_watermark(conn)
+        rows = conn.exec_driver_sql(f"SELECT COUNT(*) FROM {FACT_TABLE};").scalar()
+    return rows
+
+
+def create_fact_indexes(conn: Connection) -> None:
+    """Crea los índices de FACT_INDEXES sobre la tabla de hechos y la analiza."""
+    for index_name, columns in FACT_INDEXES.items():
+        conn.exec_driver_sql(
+            f"CREATE INDEX {index_name} ON {FACT_TABLE} ({', '.join(columns)});"
+        )
+    conn.exec_driver_sql(f"ANALYZE {FACT_TABLE};")
+
+
+def update_fact_watermark(conn: Connection) -> None:
+    """
+    Guarda como marca de agua la fecha de compra más reciente de
+    olist_orders_dataset; se llama cuando la tabla de hechos ya incluye todos
+    los pedidos cargados.
+    """
+    conn.exec_driver_sql(f"DROP TABLE IF EXISTS {FACT_WATERMARK_TABLE};")
+    conn.exec_driver_sql(
+        f"CREATE TABLE {FACT_WATERMARK_TABLE} (watermark REAL, data_version TEXT);"
+    )
+    conn.exec_driver_sql(
+        f"INSERT INTO {FACT_WATERMARK_TABLE} (watermark) "
+        "SELECT MAX(order_purchase_timestamp) FROM olist_orders_dataset;"
+    )
+
+
+def get_fact_watermark(database: Engine) -> Optional[float]:
+    """Marca de agua de la tabla de hechos (None si nunca se construyó)."""
+    if not inspect(database).has_table(FACT_WATERMARK_TABLE):
+        return None
+    with database.connect() as conn:
+        return conn.exec_driver_sql(
+            f"SELECT watermark FROM {FACT_WATERMARK_TABLE};"
+        ).scalar()
+
+
+def mark_fact_current(database: Engine, data_version: str) -> None:
+    """
+    Registra que la tabla de hechos y los rollups están al día con
+    `data_version` (la versión que acaba de escribir bump_data_version).
+    """
+    with database.begin() as conn:
+        conn.exec_driver_sql(
+            f"UPDATE {FACT_WATERMARK_TABLE} SET data_version = ?;", (data_version,)
+        )
+
+
+def is_fact_current(database: Engine) -> bool:
+    """
+    Indica si la tabla de hechos y los rollups corresponden a la versión de
+    datos actual. Una carga sin tablas derivadas (build_derived=False) o una
+    versión nueva escrita a mano los dejan desactualizados.
+    """
+    inspector = inspect(database)
+    if not inspector.has_table(FACT_WATERMARK_TABLE):
+        return False
+    columns = {column["name"] for column in inspector.get_columns(FACT_WATERMARK_TABLE)}
+    if "data_version" not in columns:
+        return False
+    with database.connect() as conn:
+        fact_version = conn.exec_driver_sql(
+            f"SELECT data_version FROM {FACT_WATERMARK_TABLE};"
+        ).scalar()
+    return fact_version is not None and fact_version == get_data_version(database)
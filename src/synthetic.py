@@ -0,0 +1,515 @@
+# src/synthetic.py
+"""
+Generador determinístico de las nueve tablas de Olist (más los feriados) a
+cualquier factor de escala, sin conexión a internet. Escala 1 reproduce el
+tamaño del dataset de Kaggle; 10 y 100 multiplican todas las tablas salvo la
+traducción de categorías. Las distribuciones de estado del pedido, estado
+(UF) del cliente, categoría de producto y fechas de compra siguen las del
+dataset original, y todas las claves foráneas apuntan a filas existentes.
+"""
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas import DataFrame
+from src.config import get_csv_to_table_mapping
+
+# Filas de cada tabla en el dataset de Kaggle (escala 1)
+BASE_ROWS = {
+    "olist_orders": 99441,
+    "olist_products": 32951,
+    "olist_sellers": 3095,
+    "olist_geolocation": 1000163,
+}
+
+# Filas por lote al escribir los csv; con la misma semilla, escala y tamaño de
+# lote los archivos generados son idénticos byte a byte
+GENERATOR_CHUNK_ROWS = 200_000
+
+CSV_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# (UF, % de clientes, capital, latitud, longitud)
+STATES = [
+    ("SP", 41.98, "sao paulo", -23.55, -46.63),
+    ("RJ", 12.92, "rio de janeiro", -22.91, -43.17),
+    ("MG", 11.70, "belo horizonte", -19.92, -43.94),
+    ("RS", 5.50, "porto alegre", -30.03, -51.23),
+    ("PR", 5.07, "curitiba", -25.43, -49.27),
+    ("SC", 3.66, "florianopolis", -27.59, -48.55),
+    ("BA", 3.40, "salvador", -12.97, -38.50),
+    ("DF", 2.15, "brasilia", -15.79, -47.88),
+    ("ES", 2.04, "vitoria", -20.32, -40.34),
+    ("GO", 2.03, "goiania", -16.69, -49.26),
+    ("PE", 1.66, "recife", -8.05, -34.88),
+    ("CE", 1.34, "fortaleza", -3.73, -38.53),
+    ("PA", 0.98, "belem", -1.46, -48.49),
+    ("MT", 0.91, "cuiaba", -15.60, -56.10),
+    ("MA", 0.75, "sao luis", -2.53, -44.30),
+    ("MS", 0.72, "campo grande", -20.44, -54.65),
+    ("PB", 0.54, "joao pessoa", -7.12, -34.86),
+    ("PI", 0.50, "teresina", -5.09, -42.80),
+    ("RN", 0.49, "natal", -5.79, -35.21),
+    ("AL", 0.42, "maceio", -9.67, -35.74),
+    ("SE", 0.35, "aracaju", -10.91, -37.07),
+    ("TO", 0.28, "palmas", -10.18, -48.33),
+    ("RO", 0.25, "porto velho", -8.76, -63.90),
+    ("AM", 0.15, "manaus", -3.12, -60.02),
+    ("AC", 0.08, "rio branco", -9.97, -67.81),
+    ("AP", 0.07, "macapa", 0.03, -51.07),
+    ("RR", 0.05, "boa vista", 2.82, -60.67),
+]
+
+# % de pedidos por estado del pedido
+ORDER_STATUS = {
+    "delivered": 97.02,
+    "shipped": 1.11,
+    "canceled": 0.63,
+    "unavailable": 0.61,
+    "invoiced": 0.32,
+    "processing": 0.30,
+    "created": 0.005,
+    "approved": 0.002,
+}
+
+# (categoría, traducción, cantidad de productos en el dataset original); None
+# es la categoría nula y pc_gamer no tiene traducción, como en el original
+CATEGORIES = [
+    ("cama_mesa_banho", "bed_bath_table", 3029),
+    ("esporte_lazer", "sports_leisure", 2867),
+    ("moveis_decoracao", "furniture_decor", 2657),
+    ("beleza_saude", "health_beauty", 2444),
+    ("utilidades_domesticas", "housewares", 2335),
+    ("automotivo", "auto", 1900),
+    ("informatica_acessorios", "computers_accessories", 1639),
+    ("brinquedos", "toys", 1411),
+    ("relogios_presentes", "watches_gifts", 1329),
+    ("telefonia", "telephony", 1134),
+    ("bebes", "baby", 919),
+    ("perfumaria", "perfumery", 868),
+    ("fashion_bolsas_e_acessorios", "fashion_bags_accessories", 849),
+    ("papelaria", "stationery", 849),
+    ("cool_stuff", "cool_stuff", 789),
+    ("ferramentas_jardim", "garden_tools", 753),
+    ("pet_shop", "pet_shop", 719),
+    ("eletronicos", "electronics", 517),
+    ("construcao_ferramentas_construcao", "construction_tools_construction", 400),
+    ("eletrodomesticos", "home_appliances", 370),
+    ("malas_acessorios", "luggage_accessories", 349),
+    ("consoles_games", "consoles_games", 317),
+    ("livros_interesse_geral", "books_general_interest", 516),
+    ("alimentos", "food", 82),
+    ("pc_gamer", None, 3),
+    (None, None, 610),
+]
+
+# Pedidos por mes de compra en el dataset original
+MONTHLY_ORDERS = {
+    "2016-09": 4,
+    "2016-10": 324,
+    "2016-12": 1,
+    "2017-01": 800,
+    "2017-02": 1780,
+    "2017-03": 2682,
+    "2017-04": 2404,
+    "2017-05": 3700,
+    "2017-06": 3245,
+    "2017-07": 4026,
+    "2017-08": 4331,
+    "2017-09": 4285,
+    "2017-10": 4631,
+    "2017-11": 7544,
+    "2017-12": 5673,
+    "2018-01": 7269,
+    "2018-02": 6728,
+    "2018-03": 7211,
+    "2018-04": 6939,
+    "2018-05": 6873,
+    "2018-06": 6167,
+    "2018-07": 6292,
+    "2018-08": 6512,
+    "2018-09": 16,
+    "2018-10": 4,
+}
+
+# Ítems por pedido (los pedidos "unavailable" no tienen ítems)
+ITEMS_PER_ORDER = {1: 90.1, 2: 7.6, 3: 1.3, 4: 0.5, 5: 0.2, 6: 0.3}
+
+PAYMENT_TYPES = {"credit_card": 73.9, "boleto": 19.0, "voucher": 5.6, "debit_card": 1.5}
+
+REVIEW_SCORES = {5: 57.8, 4: 19.3, 3: 8.2, 2: 3.2, 1: 11.5}
+REVIEW_TITLES = ["recomendo", "otimo", "bom", "ruim", "nao recebi"]
+REVIEW_MESSAGES = [
+    "produto chegou antes do prazo",
+    "muito bom, recomendo",
+    "entrega atrasada",
+    "produto diferente do anunciado",
+    "ainda nao recebi o produto",
+]
+
+# Feriados nacionales de Brasil de 2017, con las columnas que devuelve
+# extract.get_public_holidays
+HOLIDAYS_2017 = [
+    ("2017-01-01", "Confraternização Universal", "New Year's Day"),
+    ("2017-02-27", "Carnaval", "Carnival"),
+    ("2017-02-28", "Carnaval", "Carnival"),
+    ("2017-04-14", "Sexta-feira Santa", "Good Friday"),
+    ("2017-04-16", "Domingo de Páscoa", "Easter Sunday"),
+    ("2017-04-21", "Dia de Tiradentes", "Tiradentes"),
+    ("2017-05-01", "Dia do Trabalhador", "Labour Day"),
+    ("2017-06-15", "Corpus Christi", "Corpus Christi"),
+    ("2017-07-09", "Revolução Constitucionalista", "Constitutionalist Revolution"),
+    ("2017-09-07", "Dia da Independência", "Independence Day"),
+    ("2017-10-12", "Nossa Senhora Aparecida", "Our Lady of Aparecida"),
+    ("2017-11-02", "Dia de Finados", "All Souls' Day"),
+    ("2017-11-15", "Proclamação da República", "Republic Proclamation Day"),
+    ("2017-12-25", "Natal", "Christmas Day"),
+]
+
+# Semilla de cada tabla, para que los generadores no compartan números
+_TABLE_SEEDS = {"products": 1, "sellers": 2, "geolocation": 3, "orders": 4}
+
+
+def _weights(values) -> np.ndarray:
+    weights = np.asarray(values, dtype="float64")
+    return weights / weights.sum()
+
+
+def _ids(tag: str, index: np.ndarray) -> np.ndarray:
+    """Identificadores hexadecimales de 32 caracteres como los de Olist."""
+    return np.array([f"{tag}{i:031x}" for i in index], dtype=object)
+
+
+def _rng(seed: int, table: str, chunk: int = 0) -> np.random.Generator:
+    return np.random.default_rng([seed, _TABLE_SEEDS[table], chunk])
+
+
+def _chunks(rows: int, chunk_rows: int) -> Iterator[Tuple[int, int, int]]:
+    """(número de lote, primera fila, filas) de cada lote."""
+    for chunk, start in enumerate(range(0, rows, chunk_rows)):
+        yield chunk, start, min(chunk_rows, rows - start)
+
+
+def get_scaled_rows(scale: float) -> Dict[str, int]:
+    """Filas de las tablas base (pedidos, productos, vendedores, geolocalización)."""
+    if scale <= 0:
+        raise ValueError(f"El factor de escala debe ser positivo: {scale}")
+    return {table: max(1, round(rows * scale)) for table, rows in BASE_ROWS.items()}
+
+
+def synthetic_public_holidays() -> DataFrame:
+    """Feriados de 2017 sin consultar la API (mismo formato que extract)."""
+    df = DataFrame(HOLIDAYS_2017, columns=["date", "localName", "name"])
+    df["date"] = pd.to_datetime(df["date"])
+    df["countryCode"] = "BR"
+    df["fixed"] = False
+    df["global"] = df["localName"] != "Revolução Constitucionalista"
+    df["launchYear"] = None
+    return df
+
+
+def _state_columns(rng: np.random.Generator, rows: int) -> Tuple[np.ndarray, ...]:
+    """UF, ciudad y código postal de `rows` clientes o vendedores."""
+    state_index = rng.choice(len(STATES), rows, p=_weights([s[1] for s in STATES]))
+    states = np.array([s[0] for s in STATES], dtype=object)[state_index]
+    cities = np.array([s[2] for s in STATES], dtype=object)[state_index]
+    zip_codes = rng.integers(1000, 99990, rows, dtype="int32")
+    return states, cities, zip_codes
+
+
+def generate_products(rows: int, seed: int = 0) -> DataFrame:
+    rng = _rng(seed, "products")
+    category = rng.choice(len(CATEGORIES), rows, p=_weights([c[2] for c in CATEGORIES]))
+    names = pd.Series([c[0] for c in CATEGORIES], dtype=object)[category].to_numpy()
+    no_category = pd.isna(names)
+
+    def described(values: np.ndarray) -> np.ndarray:
+        # Los productos sin categoría tampoco tienen nombre, descripción ni fotos
+        return np.where(no_category, np.nan, values)
+
+    return DataFrame(
+        {
+            "product_id": _ids("b", np.arange(rows)),
+            "product_category_name": names,
+            "product_name_lenght": described(
+                np.clip(rng.normal(48, 10, rows), 5, 76).round()
+            ),
+            "product_description_lenght": described(
+                np.clip(rng.lognormal(6.4, 0.7, rows), 4, 3992).round()
+            ),
+            "product_photos_qty": described(rng.geometric(0.45, rows).clip(1, 20)),
+            "product_weight_g": np.clip(rng.lognormal(6.6, 1.2, rows), 50, 40425)
+            .round(),
+            "product_length_cm": rng.integers(16, 105, rows).astype("float64"),
+            "product_height_cm": rng.integers(2, 105, rows).astype("float64"),
+            "product_width_cm": rng.integers(6, 118, rows).astype("float64"),
+        }
+    )
+
+
+def generate_sellers(rows: int, seed: int = 0) -> DataFrame:
+    states, cities, zip_codes = _state_columns(_rng(seed, "sellers"), rows)
+    return DataFrame(
+        {
+            "seller_id": _ids("5", np.arange(rows)),
+            "seller_zip_code_prefix": zip_codes,
+            "seller_city": cities,
+            "seller_state": states,
+        }
+    )
+
+
+def generate_geolocation(rows: int, seed: int, chunk: int) -> DataFrame:
+    rng = _rng(seed, "geolocation", chunk)
+    state_index = rng.choice(len(STATES), rows, p=_weights([s[1] for s in STATES]))
+    return DataFrame(
+        {
+            "geolocation_zip_code_prefix": rng.integers(1000, 99990, rows),
+            "geolocation_lat": (
+                np.array([s[3] for s in STATES])[state_index]
+                + rng.normal(0, 0.8, rows)
+            ).round(6),
+            "geolocation_lng": (
+                np.array([s[4] for s in STATES])[state_index]
+                + rng.normal(0, 0.8, rows)
+            ).round(6),
+            "geolocation_city": np.array([s[2] for s in STATES])[state_index],
+            "geolocation_state": np.array([s[0] for s in STATES])[state_index],
+        }
+    )
+
+
+def _purchase_timestamps(rng: np.random.Generator, rows: int) -> pd.Series:
+    months = pd.PeriodIndex(list(MONTHLY_ORDERS), freq="M")
+    month = rng.choice(len(months), rows, p=_weights(list(MONTHLY_ORDERS.values())))
+    start = months.start_time.to_numpy()[month]
+    seconds = months.days_in_month.to_numpy()[month] * 86400
+    offset = (rng.random(rows) * seconds).astype("int64")
+    return pd.Series(start + offset.astype("timedelta64[s]"))
+
+
+def _days(rng: np.random.Generator, mean: float, rows: int) -> pd.Series:
+    """Demoras aleatorias (gamma) de media `mean` días, a la precisión de segundos."""
+    seconds = rng.gamma(2.0, mean / 2.0, rows) * 86400
+    return pd.Series(pd.to_timedelta(seconds.round(), unit="s"))
+
+
+def generate_orders(
+    start: int,
+    rows: int,
+    scaled_rows: Dict[str, int],
+    product_weights: np.ndarray,
+    seed: int,
+    chunk: int,
+) -> Dict[str, DataFrame]:
+    """
+    Un lote de pedidos con sus clientes, ítems, pagos y reseñas. Cada pedido
+    tiene su propio cliente (como en Olist) y los ítems referencian productos y
+    vendedores existentes, con algunos mucho más populares que otros.
+    """
+    rng = _rng(seed, "orders", chunk)
+    index = np.arange(start, start + rows)
+    order_ids = _ids("a", index)
+    customer_ids = _ids("c", index)
+
+    states, cities, zip_codes = _state_columns(rng, rows)
+    # ~3 % de los clientes repite compra
+    unique_customers = max(1, round(scaled_rows["olist_orders"] * 0.966))
+    customers = DataFrame(
+        {
+            "customer_id": customer_ids,
+            "customer_unique_id": _ids("d", rng.integers(0, unique_customers, rows)),
+            "customer_zip_code_prefix": zip_codes,
+            "customer_city": cities,
+            "customer_state": states,
+        }
+    )
+
+    status = np.array(list(ORDER_STATUS), dtype=object)[
+        rng.choice(len(ORDER_STATUS), rows, p=_weights(list(ORDER_STATUS.values())))
+    ]
+    purchase = _purchase_timestamps(rng, rows)
+    approved = (purchase + _days(rng, 0.4, rows)).where(status != "created")
+    carrier = (approved + _days(rng, 2.8, rows)).where(
+        np.isin(status, ["shipped", "delivered"])
+    )
+    delivered = (carrier + _days(rng, 9.3, rows)).where(status == "delivered")
+    estimated = (purchase + _days(rng, 23.7, rows)).dt.normalize()
+    orders = DataFrame(
+        {
+            "order_id": order_ids,
+            "customer_id": customer_ids,
+            "order_status": status,
+            "order_purchase_timestamp": purchase,
+            "order_approved_at": approved,
+            "order_delivered_carrier_date": carrier,
+            "order_delivered_customer_date": delivered,
+            "order_estimated_delivery_date": estimated,
+        }
+    )
+
+    item_counts = np.array(list(ITEMS_PER_ORDER))[
+        rng.choice(
+            len(ITEMS_PER_ORDER), rows, p=_weights(list(ITEMS_PER_ORDER.values()))
+        )
+    ]
+    item_counts[status == "unavailable"] = 0
+    item_order = np.repeat(np.arange(rows), item_counts)
+    n_items = len(item_order)
+    item_number = np.arange(n_items) - np.repeat(
+        np.cumsum(item_counts) - item_counts, item_counts
+    ) + 1
+    # Popularidad sesgada: pocos productos y vendedores concentran las ventas
+    product = (rng.random(n_items) ** 3 * len(product_weights)).astype("int64")
+    seller = (rng.random(n_items) ** 2 * scaled_rows["olist_sellers"]).astype("int64")
+    price = np.clip(rng.lognormal(4.3, 0.85, n_items), 0.85, 6735).round(2)
+    freight = np.clip(
+        7.0 + product_weights[product] * 0.0015 + rng.normal(0, 4, n_items), 0, 410
+    ).round(2)
+    items = DataFrame(
+        {
+            "order_id": order_ids[item_order],
+            "order_item_id": item_number,
+            "product_id": _ids("b", product),
+            "seller_id": _ids("5", seller),
+            "shipping_limit_date": purchase.to_numpy()[item_order]
+            + np.timedelta64(6, "D"),
+            "price": price,
+            "freight_value": freight,
+        }
+    )
+
+    # El total de pagos de cada pedido coincide con precio + flete de sus ítems
+    totals = np.bincount(item_order, weights=price + freight, minlength=rows)
+    no_items = totals == 0
+    totals[no_items] = rng.lognormal(4.5, 0.8, no_items.sum())
+    payment_type = np.array(list(PAYMENT_TYPES), dtype=object)[
+        rng.choice(len(PAYMENT_TYPES), rows, p=_weights(list(PAYMENT_TYPES.values())))
+    ]
+    installments = np.where(
+        payment_type == "credit_card", rng.geometric(0.35, rows).clip(1, 24), 1
+    )
+    # ~3 % de los pedidos paga una parte con un voucher
+    split = rng.random(rows) < 0.03
+    voucher = (totals * rng.uniform(0.1, 0.6, rows)).round(2) * split
+    payments = pd.concat(
+        [
+            DataFrame(
+                {
+                    "order_id": order_ids,
+                    "payment_sequential": 1,
+                    "payment_type": payment_type,
+                    "payment_installments": installments,
+                    "payment_value": (totals - voucher).round(2),
+                }
+            ),
+            DataFrame(
+                {
+                    "order_id": order_ids[split],
+                    "payment_sequential": 2,
+                    "payment_type": "voucher",
+                    "payment_installments": 1,
+                    "payment_value": voucher[split],
+                }
+            ),
+        ]
+    ).sort_values(["order_id", "payment_sequential"], kind="stable")
+
+    reviewed = np.flatnonzero(rng.random(rows) < 0.9978)
+    n_reviews = len(reviewed)
+    created = (
+        delivered.fillna(estimated).iloc[reviewed].dt.normalize()
+        + pd.Timedelta(days=1)
+    ).reset_index(drop=True)
+    reviews = DataFrame(
+        {
+            "review_id": _ids("e", index[reviewed]),
+            "order_id": order_ids[reviewed],
+            "review_score": np.array(list(REVIEW_SCORES))[
+                rng.choice(
+                    len(REVIEW_SCORES),
+                    n_reviews,
+                    p=_weights(list(REVIEW_SCORES.values())),
+                )
+            ],
+            "review_comment_title": pd.Series(
+                np.array(REVIEW_TITLES, dtype=object)[
+                    rng.integers(0, len(REVIEW_TITLES), n_reviews)
+                ]
+            ).where(rng.random(n_reviews) < 0.12),
+            "review_comment_message": pd.Series(
+                np.array(REVIEW_MESSAGES, dtype=object)[
+                    rng.integers(0, len(REVIEW_MESSAGES), n_reviews)
+                ]
+            ).where(rng.random(n_reviews) < 0.41),
+            "review_creation_date": created,
+            "review_answer_timestamp": created + _days(rng, 3.1, n_reviews),
+        }
+    )
+
+    return {
+        "olist_customers": customers,
+        "olist_orders": orders,
+        "olist_order_items": items,
+        "olist_order_payments": payments,
+        "olist_order_reviews": reviews,
+    }
+
+
+def generate_dataset(
+    csv_folder: str,
+    scale: float = 1.0,
+    seed: int = 0,
+    chunk_rows: int = GENERATOR_CHUNK_ROWS,
+) -> Dict[str, int]:
+    """
+    Escribe en `csv_folder` los nueve csv de Olist (con los nombres de
+    get_csv_to_table_mapping) para el factor de escala indicado. Los pedidos y
+    la geolocalización se generan y escriben por lotes de `chunk_rows` filas,
+    así la memoria no crece con la escala. Devuelve {tabla: filas}.
+    """
+    folder = Path(csv_folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = {table: folder / csv for csv, table in get_csv_to_table_mapping().items()}
+    scaled_rows = get_scaled_rows(scale)
+    rows: Dict[str, int] = {}
+
+    def write(table_name: str, df: DataFrame, append: bool) -> None:
+        df.to_csv(
+            paths[table_name],
+            mode="a" if append else "w",
+            header=not append,
+            index=False,
+            date_format=CSV_DATE_FORMAT,
+        )
+        rows[table_name] = rows.get(table_name, 0) + len(df)
+
+    translation = DataFrame(
+        [(pt, en) for pt, en, _ in CATEGORIES if pt is not None and en is not None],
+        columns=["product_category_name", "product_category_name_english"],
+    )
+    write("product_category_name_translation", translation, False)
+
+    products = generate_products(scaled_rows["olist_products"], seed)
+    write("olist_products", products, False)
+    product_weights = products["product_weight_g"].fillna(0).to_numpy()
+    del products
+    write("olist_sellers", generate_sellers(scaled_rows["olist_sellers"], seed), False)
+
+    for chunk, start, chunk_size in _chunks(
+        scaled_rows["olist_geolocation"], chunk_rows
+    ):
+        write(
+            "olist_geolocation",
+            generate_geolocation(chunk_size, seed, chunk),
+            chunk > 0,
+        )
+
+    for chunk, start, chunk_size in _chunks(scaled_rows["olist_orders"], chunk_rows):
+        tables = generate_orders(
+            start, chunk_size, scaled_rows, product_weights, seed, chunk
+        )
+        for table_name, df in tables.items():
+            write(table_name, df, chunk > 0)
+
+    return rows
@@ -1,11 +1,23 @@
 from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from enum import Enum
-from typing import Callable, Dict, List
+from pathlib import Path
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import pandas as pd
-from pandas import DataFrame, read_sql
+from pandas import DataFrame
 from sqlalchemy import text, create_engine
 from sqlalchemy.engine.base import Engine
-from src.config import QUERIES_ROOT_PATH, SQLITE_BD_ABSOLUTE_PATH
+from sqlalchemy.pool import QueuePool
+from src.config import (
+    QUERIES_ROOT_PATH,
+    QUERY_ENGINE,
+    SQLITE_BD_ABSOLUTE_PATH,
+    TRANSFORM_EXECUTOR,
+    TRANSFORM_MAX_WORKERS,
+)
+from src.query_cache import read_sql_cached
+from src.star_schema import is_fact_current
 
 # ---------------------------------------------------------------
 # Definiciones generales
@@ -24,6 +36,23 @@ class QueryEnum(Enum):
     ORDERS_PER_DAY_AND_HOLIDAYS_2017 = "orders_per_day_and_holidays_2017"
     GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP = "get_freight_value_weight_relationship"
 
+# Motor de cada consulta: "sql" (queries/*.sql en SQLite) o "pandas"
+# (src.pandas_engine). Se puede cambiar por consulta antes de run_queries().
+QUERY_ENGINES: Dict[str, str] = {query.value: QUERY_ENGINE for query in QueryEnum}
+
+def get_query_engine(query_name: str, engine: Optional[str] = None) -> str:
+    """Motor a usar: el indicado o, si es None, el de QUERY_ENGINES."""
+    engine = engine or QUERY_ENGINES[query_name]
+    if engine not in ("sql", "pandas"):
+        raise ValueError(f"Motor de consultas no soportado: {engine}")
+    return engine
+
+def run_pandas_query(database: Engine, query_name: str) -> QueryResult:
+    """Ejecuta la implementación pandas (src.pandas_engine) de una consulta."""
+    from src.pandas_engine import PANDAS_QUERIES
+
+    return QueryResult(query=query_name, result=PANDAS_QUERIES[query_name](database))
+
 # ---------------------------------------------------------------
 # Función de lectura de archivos SQL
 # ---------------------------------------------------------------
@@ -34,66 +63,273 @@ def read_query(query_name: str) -> str:
         sql = text(sql_file)
     return sql
 
+def run_sql_query(database: Engine, query_name: str) -> QueryResult:
+    """Ejecuta el .sql de una consulta (get_query_sql) con la caché de resultados."""
+    sql_name, params = get_query_sql(query_name, database)
+    return QueryResult(
+        query=query_name,
+        result=read_sql_cached(read_query(sql_name), database, params=params or None),
+    )
+
 # ---------------------------------------------------------------
 # Consultas principales
 # ---------------------------------------------------------------
-def query_delivery_date_difference(database: Engine) -> QueryResult:
+def query_delivery_date_difference(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.DELIVERY_DATE_DIFFERECE.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return run_sql_query(database, query_name)
 
-def query_global_ammount_order_status(database: Engine) -> QueryResult:
+def query_global_ammount_order_status(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.GLOBAL_AMMOUNT_ORDER_STATUS.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return run_sql_query(database, query_name)
 
-def query_revenue_by_month_year(database: Engine) -> QueryResult:
+def query_revenue_by_month_year(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.REVENUE_BY_MONTH_YEAR.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return query_year_pivot(database, query_name)
 
-def query_revenue_per_state(database: Engine) -> QueryResult:
+def query_revenue_per_state(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.REVENUE_PER_STATE.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return run_sql_query(database, query_name)
 
-def query_top_10_least_revenue_categories(database: Engine) -> QueryResult:
+def query_top_10_least_revenue_categories(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.TOP_10_LEAST_REVENUE_CATEGORIES.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return run_sql_query(database, query_name)
 
-def query_top_10_revenue_categories(database: Engine) -> QueryResult:
+def query_top_10_revenue_categories(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.TOP_10_REVENUE_CATEGORIES.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return run_sql_query(database, query_name)
 
-def query_real_vs_estimated_delivered_time(database: Engine) -> QueryResult:
+def query_real_vs_estimated_delivered_time(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.REAL_VS_ESTIMATED_DELIVERED_TIME.value
-    query = read_query(query_name)
-    return QueryResult(query=query_name, result=read_sql(query, database))
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return query_year_pivot(database, query_name)
 
 # ---------------------------------------------------------------
-# Consultas pandas avanzadas (todavía pendientes)
+# Pivotes por rango de años
 # ---------------------------------------------------------------
-def query_freight_value_weight_relationship(database: Engine) -> QueryResult:
-    query_name = QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP.value
-    # Tablas de referencia (vistas creadas en load.py)
-    orders = read_sql("SELECT * FROM olist_orders", database)
-    items = read_sql("SELECT * FROM olist_order_items", database)
-    products = read_sql("SELECT * FROM olist_products", database)
+MONTH_NAMES = (
+    "Jan", "Feb", "Mar", "Apr", "May", "Jun",
+    "Jul", "Aug", "Sep", "Oct", "Nov", "Dec",
+)
+
+# Años de las columnas Year<año> de las consultas originales
+DEFAULT_YEAR_RANGE = (2016, 2018)
+
+# values: {columna agregada: sufijo de la columna Year<año><sufijo>}
+YearPivot = namedtuple("YearPivot", ["values", "fill_value"])
 
-    # TODO: implementar correctamente las fusiones según tu práctica
-    aggregations = pd.DataFrame()
-    return QueryResult(query=query_name, result=aggregations)
+YEAR_PIVOTS = {
+    QueryEnum.REVENUE_BY_MONTH_YEAR.value: YearPivot(
+        values={"revenue": ""}, fill_value=0.0
+    ),
+    QueryEnum.REAL_VS_ESTIMATED_DELIVERED_TIME.value: YearPivot(
+        values={"real_time": "_real_time", "estimated_time": "_estimated_time"},
+        fill_value=None,
+    ),
+}
+
+def pivot_month_year(
+    df: DataFrame,
+    values: Dict[str, str],
+    start_year: int,
+    end_year: int,
+    fill_value: Optional[float] = None,
+) -> DataFrame:
+    """
+    Pivotea un agregado largo (columnas y, m y las de `values`) a una fila por
+    mes (month_no '01'..'12', month) y una columna Year<año><sufijo> por cada
+    valor y año del rango, en el orden valor -> año. Los meses/años sin datos
+    quedan en NaN o en `fill_value`.
+    """
+    years = range(start_year, end_year + 1)
+    wide = (
+        df.set_index(["m", "y"])[list(values)]
+        .unstack("y")
+        .reindex(
+            index=range(1, 13),
+            columns=pd.MultiIndex.from_product([list(values), years]),
+        )
+    )
+    if fill_value is not None:
+        wide = wide.fillna(fill_value)
+    wide.columns = [f"Year{year}{values[value]}" for value, year in wide.columns]
+
+    months = DataFrame(
+        {"month_no": [f"{m:02d}" for m in range(1, 13)], "month": MONTH_NAMES}
+    )
+    return pd.concat([months, wide.reset_index(drop=True).astype("float64")], axis=1)
+
+# Rango de años de orders_per_day_and_holidays_2017
+ORDERS_PER_DAY_YEARS = (2017, 2017)
+
+def get_query_sql(
+    query_name: str, database: Optional[Engine] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Archivo de queries/ (sin .sql) y parámetros que ejecuta el motor SQL para
+    una consulta de QueryEnum: las de YEAR_PIVOTS y la de pedidos por día usan
+    las versiones por rango de años de queries/pivot/, el resto su archivo.
+    Si se pasa `database` y sus rollups están al día con la versión de datos
+    (src.star_schema.is_fact_current), devuelve la versión del mismo archivo en
+    queries/rollups/, que agrega sobre las tablas resumen en vez de las crudas.
+    """
+    if query_name in YEAR_PIVOTS:
+        sql_name, years = f"pivot/{query_name}", DEFAULT_YEAR_RANGE
+    elif query_name == QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value:
+        sql_name, years = "pivot/orders_per_day", ORDERS_PER_DAY_YEARS
+    else:
+        sql_name, years = query_name, None
+    if database is not None and is_fact_current(database):
+        sql_name = f"rollups/{sql_name}"
+    if years is None:
+        return sql_name, {}
+    return sql_name, {"start_year": years[0], "end_year": years[1]}
+
+def query_year_pivot(
+    database: Engine,
+    query_name: str,
+    start_year: int = DEFAULT_YEAR_RANGE[0],
+    end_year: int = DEFAULT_YEAR_RANGE[1],
+) -> QueryResult:
+    """
+    Versión parametrizada por rango de años de una consulta de YEAR_PIVOTS:
+    agrega en una sola pasada con queries/pivot/<consulta>.sql (filtrando por
+    año con parámetros) y pivotea con pivot_month_year(). El costo es lineal en
+    los datos para cualquier cantidad de años.
+    """
+    pivot = YEAR_PIVOTS[query_name]
+    sql_name, _ = get_query_sql(query_name, database)
+    df = read_sql_cached(
+        read_query(sql_name),
+        database,
+        params={"start_year": start_year, "end_year": end_year},
+    )
+    return QueryResult(
+        query=query_name,
+        result=pivot_month_year(
+            df, pivot.values, start_year, end_year, pivot.fill_value
+        ),
+    )
+
+def query_orders_per_day_and_holidays(
+    database: Engine, start_year: int, end_year: int
+) -> QueryResult:
+    """
+    Pedidos por día de compra entre start_year y end_year (solo días con
+    pedidos), con columnas order_count, date (datetime) y holiday (si el día
+    está en public_holidays).
+    """
+    sql_name, _ = get_query_sql(
+        QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value, database
+    )
+    orders = read_sql_cached(
+        read_query(sql_name),
+        database,
+        params={"start_year": start_year, "end_year": end_year},
+    )
+    holidays = read_sql_cached("SELECT date FROM public_holidays", database)
+    dates = pd.to_datetime(orders["date"])
+    holiday_dates = pd.to_datetime(holidays["date"]).dt.normalize()
+    result = DataFrame(
+        {
+            "order_count": orders["order_count"],
+            "date": dates,
+            "holiday": dates.isin(holiday_dates),
+        }
+    )
+    suffix = str(start_year) if start_year == end_year else f"{start_year}_{end_year}"
+    return QueryResult(query=f"orders_per_day_and_holidays_{suffix}", result=result)
+
+# ---------------------------------------------------------------
+# Consultas originalmente en pandas
+# ---------------------------------------------------------------
+def query_freight_value_weight_relationship(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
+    query_name = QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP.value
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return run_sql_query(database, query_name)
 
-def query_orders_per_day_and_holidays_2017(database: Engine) -> QueryResult:
+def query_orders_per_day_and_holidays_2017(
+    database: Engine, engine: Optional[str] = None
+) -> QueryResult:
     query_name = QueryEnum.ORDERS_PER_DAY_AND_HOLIDAYS_2017.value
-    holidays = read_sql("SELECT * FROM public_holidays", database)
-    orders = read_sql("SELECT * FROM olist_orders", database)
+    if get_query_engine(query_name, engine) == "pandas":
+        return run_pandas_query(database, query_name)
+    return query_orders_per_day_and_holidays(database, *ORDERS_PER_DAY_YEARS)
+
+# ---------------------------------------------------------------
+# Lotes de consultas con base compartida
+# ---------------------------------------------------------------
+# {base (queries/batch/<base>.sql): consultas que se evalúan sobre esa base}
+QUERY_BATCHES: Dict[str, Tuple[QueryEnum, ...]] = {
+    "delivered_items_base": (
+        QueryEnum.REVENUE_BY_MONTH_YEAR,
+        QueryEnum.REVENUE_PER_STATE,
+        QueryEnum.TOP_10_REVENUE_CATEGORIES,
+        QueryEnum.TOP_10_LEAST_REVENUE_CATEGORIES,
+        QueryEnum.GET_FREIGHT_VALUE_WEIGHT_RELATIONSHIP,
+    ),
+}
 
-    # TODO: implementar correctamente los pasos indicados
-    result_df = pd.DataFrame()
-    return QueryResult(query=query_name, result=result_df)
+def run_query_batch(
+    database: Engine,
+    base_name: str,
+    queries: Tuple[QueryEnum, ...],
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, DataFrame]:
+    """
+    Materializa una vez la base compartida (queries/batch/<base_name>.sql) como
+    tabla temporal y evalúa sobre ella las versiones queries/batch/ de cada
+    consulta del lote, todo en la misma conexión. La tabla temporal se borra
+    al terminar. Si se pasa `timings`, registra la base y cada consulta.
+    """
+    base_sql = read_query(f"batch/{base_name}").text.strip().rstrip(";")
+    results: Dict[str, DataFrame] = {}
+    with database.connect() as conn:
+        start = perf_counter()
+        conn.exec_driver_sql(f"DROP TABLE IF EXISTS temp.{base_name};")
+        conn.exec_driver_sql(f"CREATE TEMP TABLE {base_name} AS {base_sql};")
+        if timings is not None:
+            timings[base_name] = perf_counter() - start
+        try:
+            for query in queries:
+                start = perf_counter()
+                results[query.value] = pd.read_sql(
+                    read_query(f"batch/{query.value}"), conn
+                )
+                if timings is not None:
+                    timings[query.value] = perf_counter() - start
+        finally:
+            conn.exec_driver_sql(f"DROP TABLE IF EXISTS temp.{base_name};")
+    return results
 
 # ---------------------------------------------------------------
 # Ejecutor general de queries
@@ -111,25 +347,169 @@ def get_all_queries() -> List[Callable[[Engine], QueryResult]]:
         query_freight_value_weight_relationship,
     ]
 
-def run_queries(database: Engine) -> Dict[str, DataFrame]:
-    """Ejecuta todas las consultas y devuelve los resultados en un diccionario."""
-    query_results = {}
-    for query in get_all_queries():
-        query_result = query(database)
-        query_results[query_result.query] = query_result.result
-    return query_results
+def get_read_only_url(database: Engine) -> Optional[str]:
+    """
+    URL de solo lectura (mode=ro) de una base SQLite en archivo. Devuelve None
+    si la base no es un archivo SQLite (p. ej. "sqlite://" en memoria, que no
+    se puede compartir entre conexiones).
+    """
+    path = database.url.database
+    if database.dialect.name != "sqlite" or not path or path == ":memory:":
+        return None
+    return f"sqlite:///file:{Path(path).resolve()}?mode=ro&uri=true"
+
+def _timed_query(
+    query: Callable[[Engine], QueryResult], database: Engine
+) -> Tuple[QueryResult, float]:
+    start = perf_counter()
+    query_result = query(database)
+    return query_result, perf_counter() - start
+
+def get_query_tasks(database: Engine) -> List[str]:
+    """
+    Tareas de run_queries(): el nombre de la base de cada lote de QUERY_BATCHES
+    que conviene ejecutar como lote y el de la función (get_all_queries()) de
+    cada consulta restante. Los lotes solo se usan cuando las consultas leen de
+    las tablas crudas (los rollups no están al día) y todas usan el motor "sql".
+    """
+    batched = set()
+    tasks = []
+    if not is_fact_current(database):
+        for base_name, queries in QUERY_BATCHES.items():
+            if all(get_query_engine(query.value) == "sql" for query in queries):
+                tasks.append(base_name)
+                batched.update(query.value for query in queries)
+    # get_all_queries() sigue el orden de QueryEnum
+    for query, query_function in zip(QueryEnum, get_all_queries()):
+        if query.value not in batched:
+            tasks.append(query_function.__name__)
+    return tasks
+
+def _run_task(
+    task: str, database: Engine
+) -> Tuple[List[QueryResult], Dict[str, float]]:
+    """Ejecuta una tarea de get_query_tasks(); devuelve resultados y segundos."""
+    if task in QUERY_BATCHES:
+        timings: Dict[str, float] = {}
+        results = run_query_batch(database, task, QUERY_BATCHES[task], timings)
+        batch = [QueryResult(query=name, result=df) for name, df in results.items()]
+        return batch, timings
+    queries = {query.__name__: query for query in get_all_queries()}
+    query_result, seconds = _timed_query(queries[task], database)
+    return [query_result], {query_result.query: seconds}
+
+# Conexión de solo lectura de cada proceso del pool (ver _init_query_worker)
+_worker_database: Optional[Engine] = None
+
+def _init_query_worker(read_only_url: str) -> None:
+    global _worker_database
+    _worker_database = create_engine(read_only_url)
+
+def _run_task_in_worker(task: str) -> Tuple[List[QueryResult], Dict[str, float]]:
+    return _run_task(task, _worker_database)
+
+def run_queries(
+    database: Engine,
+    max_workers: int = 1,
+    executor: str = "thread",
+    timings: Optional[Dict[str, float]] = None,
+) -> Dict[str, DataFrame]:
+    """
+    Ejecuta todas las consultas y devuelve los resultados en un diccionario.
+    Las que comparten base (QUERY_BATCHES) se evalúan juntas sobre la base
+    materializada una sola vez, salvo que lean de los rollups (get_query_tasks).
+    Con max_workers > 1 y una base SQLite en archivo, las tareas (todas de
+    solo lectura e independientes) corren en paralelo sobre conexiones de solo
+    lectura: un pool de hilos que comparte un pool de max_workers conexiones, o
+    un pool de procesos con una conexión por proceso. En otro caso corren en
+    secuencia sobre `database`. Si se pasa `timings`, se completa con los
+    segundos de cada consulta (y de la base de cada lote).
+    """
+    if executor not in ("thread", "process"):
+        raise ValueError(f"Tipo de executor no soportado: {executor}")
+
+    tasks = get_query_tasks(database)
+    read_only_url = get_read_only_url(database)
+    results: List[Tuple[List[QueryResult], Dict[str, float]]]
+    if max_workers <= 1 or read_only_url is None:
+        results = [_run_task(task, database) for task in tasks]
+    elif executor == "thread":
+        read_only_database = create_engine(
+            read_only_url,
+            poolclass=QueuePool,
+            pool_size=max_workers,
+            max_overflow=0,
+            connect_args={"check_same_thread": False},
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [
+                    pool.submit(_run_task, task, read_only_database) for task in tasks
+                ]
+                results = [future.result() for future in futures]
+        finally:
+            read_only_database.dispose()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_query_worker,
+            initargs=(read_only_url,),
+        ) as pool:
+            results = list(pool.map(_run_task_in_worker, tasks))
+
+    query_results = {
+        query_result.query: query_result.result
+        for task_results, _ in results
+        for query_result in task_results
+    }
+    if timings is not None:
+        for _, task_timings in results:
+            timings.update(task_timings)
+    return {query.value: query_results[query.value] for query in QueryEnum}
+
+def run_fact_queries(database: Engine) -> Dict[str, DataFrame]:
+    """
+    Ejecuta las versiones de queries/fact/ (sobre la tabla fact_order_items
+    materializada en load) y devuelve los resultados con las mismas claves
+    que run_queries().
+    """
+    return {
+        query.value: read_sql_cached(read_query(f"fact/{query.value}"), database)
+        for query in QueryEnum
+    }
+
+def run_rollup_queries(database: Engine) -> Dict[str, DataFrame]:
+    """
+    Ejecuta las versiones de queries/rollups/ (sobre las tablas resumen de
+    src.rollups) y devuelve los resultados con las mismas claves que run_queries().
+    """
+    return {
+        query.value: read_sql_cached(read_query(f"rollups/{query.value}"), database)
+        for query in QueryEnum
+    }
 
 # ---------------------------------------------------------------
 # Orquestador local (para el pipeline)
 # ---------------------------------------------------------------
-def run_all():
-    """Ejecuta todas las transformaciones SQL definidas en /queries"""
+def run_all(engine: Optional[Engine] = None):
+    """
+    Ejecuta todas las transformaciones SQL definidas en /queries (sobre `engine`
+    si se indica, o sobre una conexión nueva a SQLITE_BD_ABSOLUTE_PATH)
+    """
     print("🔹 [TRANSFORM] Ejecutando transformaciones y consultas SQL...")
 
     try:
-        # Evita importación circular
-        engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
-        results = run_queries(engine)
+        if engine is None:
+            engine = create_engine(f"sqlite:///{SQLITE_BD_ABSOLUTE_PATH}")
+        timings: Dict[str, float] = {}
+        results = run_queries(
+            engine,
+            max_workers=min(TRANSFORM_MAX_WORKERS, len(QueryEnum)),
+            executor=TRANSFORM_EXECUTOR,
+            timings=timings,
+        )
+        for query_name, seconds in sorted(timings.items(), key=lambda t: -t[1]):
+            print(f"   ⏱ {query_name}: {seconds:.2f}s")
 
         print(f"✅ [TRANSFORM] {len(results)} transformaciones ejecutadas exitosamente.")
         return results
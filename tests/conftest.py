@@ -0,0 +1,21 @@
+from pytest import MonkeyPatch, fixture
+
+
+@fixture(scope="session", autouse=True)
+def isolated_caches(tmp_path_factory):
+    """Point the table and query result caches to a temporary folder.
+
+    Session scoped so it is active before the session database fixture, and
+    pytest never writes into the repository .cache folder.
+    """
+    cache_root = tmp_path_factory.mktemp("cache")
+    with MonkeyPatch.context() as monkeypatch:
+        for module in ("src.config", "src.extract"):
+            monkeypatch.setattr(
+                f"{module}.CACHE_ROOT_PATH", str(cache_root / "tables")
+            )
+        for module in ("src.config", "src.query_cache"):
+            monkeypatch.setattr(
+                f"{module}.QUERY_CACHE_ROOT_PATH", str(cache_root / "queries")
+            )
+        yield cache_root
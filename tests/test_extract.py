@@ -1,5 +1,9 @@
+import pandas as pd
+from pytest import raises
+from src.artifacts import iter_artifact_chunks, read_artifacts, write_artifacts
 from src.config import DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL, get_csv_to_table_mapping
-from src.extract import extract, get_public_holidays
+from src.extract import extract, extract_stream, get_public_holidays
+from src.synthetic import generate_dataset
 
 
 def test_get_public_holidays():
@@ -27,3 +31,125 @@ def test_extract():
     assert dataframes["olist_products"].shape == (32951, 9)
     assert dataframes["olist_sellers"].shape == (3095, 4)
     assert dataframes["product_category_name_translation"].shape == (71, 2)
+
+
+def test_extract_memory_footprint():
+    """Test that the schema registry keeps every table under its memory budget."""
+    csv_folder = DATASET_ROOT_PATH
+    csv_table_mapping = get_csv_to_table_mapping()
+    public_holidays_url = PUBLIC_HOLIDAYS_URL
+    dataframes = extract(csv_folder, csv_table_mapping, public_holidays_url)
+
+    mb = 1024 * 1024
+    max_memory = {
+        "olist_customers": 25 * mb,
+        "olist_geolocation": 20 * mb,
+        "olist_order_items": 22 * mb,
+        "olist_order_payments": 14 * mb,
+        "olist_order_reviews": 45 * mb,
+        "olist_orders": 28 * mb,
+        "olist_products": 6 * mb,
+        "olist_sellers": 1 * mb,
+        "product_category_name_translation": 0.1 * mb,
+    }
+    for table_name, budget in max_memory.items():
+        memory = dataframes[table_name].memory_usage(deep=True).sum()
+        assert memory < budget, f"{table_name} uses {memory / mb:.1f} MB"
+
+    assert dataframes["olist_orders"]["order_status"].dtype == "category"
+    assert dataframes["olist_customers"]["customer_state"].dtype == "category"
+    assert dataframes["olist_products"]["product_category_name"].dtype == "category"
+    assert (
+        dataframes["olist_orders"]["order_purchase_timestamp"].dtype
+        == "datetime64[ns]"
+    )
+
+
+def test_extract_stream():
+    """Test that the streamed chunks add up to the full tables."""
+    csv_table_mapping = get_csv_to_table_mapping()
+    rows = {}
+    for table_name, chunk in extract_stream(
+        DATASET_ROOT_PATH, csv_table_mapping, PUBLIC_HOLIDAYS_URL, chunksize=100_000
+    ):
+        assert len(chunk) <= 100_000
+        rows[table_name] = rows.get(table_name, 0) + len(chunk)
+    assert len(rows) == len(csv_table_mapping) + 1
+    assert rows["olist_geolocation"] == 1000163
+    assert rows["olist_order_items"] == 112650
+    assert rows["public_holidays"] == 14
+
+
+def test_artifact_handoff(tmp_path):
+    """Test that extract output survives the file-based handoff between tasks."""
+    csv_table_mapping = {
+        csv_file: table_name
+        for csv_file, table_name in get_csv_to_table_mapping().items()
+        if table_name in ("olist_orders", "olist_order_items")
+    }
+    dataframes = extract(DATASET_ROOT_PATH, csv_table_mapping, None)
+    manifest = write_artifacts(dataframes, str(tmp_path), chunksize=10_000)
+    assert {table: entry["rows"] for table, entry in manifest.items()} == {
+        "olist_orders": 99441,
+        "olist_order_items": 112650,
+    }
+
+    for table_name, df in read_artifacts(manifest).items():
+        pd.testing.assert_frame_equal(df, dataframes[table_name])
+
+    chunks = {}
+    for table_name, chunk in iter_artifact_chunks(manifest):
+        assert len(chunk) <= 10_000
+        chunks.setdefault(table_name, []).append(chunk)
+    for table_name, table_chunks in chunks.items():
+        pd.testing.assert_frame_equal(
+            pd.concat(table_chunks, ignore_index=True), dataframes[table_name]
+        )
+
+    with open(manifest["olist_orders"]["path"], "ab") as f:
+        f.write(b"0")
+    with raises(ValueError):
+        read_artifacts(manifest)
+
+
+def test_synthetic_dataset(tmp_path):
+    """Test that the generated dataset is reproducible and keeps its foreign keys."""
+    rows = generate_dataset(str(tmp_path / "a"), scale=0.01, seed=7, chunk_rows=300)
+    generate_dataset(str(tmp_path / "b"), scale=0.01, seed=7, chunk_rows=300)
+    for csv_file in get_csv_to_table_mapping():
+        assert (tmp_path / "a" / csv_file).read_bytes() == (
+            tmp_path / "b" / csv_file
+        ).read_bytes()
+
+    dataframes = extract(str(tmp_path / "a"), get_csv_to_table_mapping(), None)
+    assert {name: len(df) for name, df in dataframes.items()} == rows
+    assert rows["olist_orders"] == 994
+    orders = dataframes["olist_orders"]
+    items = dataframes["olist_order_items"]
+    customers = dataframes["olist_customers"]
+    assert orders["customer_id"].isin(customers["customer_id"]).all()
+    assert items["order_id"].isin(orders["order_id"]).all()
+    assert items["product_id"].isin(dataframes["olist_products"]["product_id"]).all()
+    assert items["seller_id"].isin(dataframes["olist_sellers"]["seller_id"]).all()
+    assert dataframes["olist_order_payments"]["order_id"].isin(orders["order_id"]).all()
+    assert dataframes["olist_order_reviews"]["order_id"].isin(orders["order_id"]).all()
+
+
+def test_extract_cache_keyed_on_schema(tmp_path):
+    """Test that a custom schema does not hit an entry parsed with another one."""
+    generate_dataset(str(tmp_path / "csv"), scale=0.01, seed=7)
+    csv_table_mapping = {"olist_sellers_dataset.csv": "olist_sellers"}
+    cache_dir = str(tmp_path / "cache")
+    csv_folder = str(tmp_path / "csv")
+    default = extract(csv_folder, csv_table_mapping, None, cache_dir=cache_dir)
+    custom = extract(
+        csv_folder,
+        csv_table_mapping,
+        None,
+        table_schemas={"olist_sellers": {"usecols": ["seller_id"]}},
+        cache_dir=cache_dir,
+    )
+    assert len(default["olist_sellers"].columns) == 4
+    assert list(custom["olist_sellers"].columns) == ["seller_id"]
+    # Both entries stay cached side by side; only evict_cache() removes them
+    assert len(list((tmp_path / "cache").glob("*.feather"))) == 2
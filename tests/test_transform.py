@@ -1,5 +1,6 @@
+import numpy as np
 import pandas as pd
-from pytest import fixture
+from pytest import fail, fixture, raises
 from src.config import QUERY_RESULTS_ROOT_PATH, DATASET_ROOT_PATH, PUBLIC_HOLIDAYS_URL
 from sqlalchemy import create_engine
 from sqlalchemy.engine.base import Engine
@@ -16,10 +17,42 @@ from src.transform import (
     query_orders_per_day_and_holidays_2017,
     query_freight_value_weight_relationship,
 )
-from src.load import load
+from src.checkpoints import run_checkpointed
+from src.dashboard_cube import (
+    DASHBOARD_QUERIES,
+    build_cube,
+    dashboard_frames,
+    get_filter_options,
+)
+from src.dashboard_data import DashboardData
+from src.export import export_queries, read_export
+from src.indexes import check_query_plans
+from src.pandas_engine import sqlite_round
+from src.partitioned import PARTITION_KEYS, run_partitioned
+from src.publish import publish_snapshot
+from src.query_cache import bump_data_version, get_data_version
+from src.query_baseline import (
+    build_baseline_database,
+    compare_to_baseline,
+    load_baseline,
+    profile_queries,
+)
+from src.rollups import ROLLUP_TOLERANCE, check_rollup_consistency
+from src.star_schema import get_fact_watermark, is_fact_current
+from src.load import load, load_append
 from src.extract import extract
 from src.config import get_csv_to_table_mapping
-from src.transform import QueryResult
+from src.transform import (
+    QueryEnum,
+    QueryResult,
+    get_all_queries,
+    get_query_sql,
+    get_query_tasks,
+    query_year_pivot,
+    read_query,
+    run_fact_queries,
+    run_queries,
+)
 
 TOLERANCE = 0.1
 
@@ -40,14 +73,19 @@ def float_vectors_are_close(a: list, b: list, tolerance: float = TOLERANCE) -> b
     return all([math.isclose(a[i], b[i], abs_tol=tolerance) for i in range(len(a))])
 
 
-@fixture(scope="session", autouse=True)
-def database() -> Engine:
-    """Initialize the database for testing."""
-    engine = create_engine("sqlite://")
+@fixture(scope="session")
+def csv_dataframes() -> dict:
+    """Extract the dataset once for the tests that load it."""
     csv_folder = DATASET_ROOT_PATH
     public_holidays_url = PUBLIC_HOLIDAYS_URL
     csv_table_mapping = get_csv_to_table_mapping()
-    csv_dataframes = extract(csv_folder, csv_table_mapping, public_holidays_url)
+    return extract(csv_folder, csv_table_mapping, public_holidays_url)
+
+
+@fixture(scope="session", autouse=True)
+def database(csv_dataframes: dict) -> Engine:
+    """Initialize the database for testing."""
+    engine = create_engine("sqlite://")
     load(data_frames=csv_dataframes, database=engine)
     return engine
 
@@ -206,3 +244,302 @@ def test_query_get_freight_value_weight_relationship(database: Engine):
     actual: QueryResult = query_freight_value_weight_relationship(database)
     expected = read_query_result(query_name)
     assert pandas_to_json_object(actual.result) == expected
+
+
+def test_query_joins_use_indexes(database: Engine):
+    report = check_query_plans(database)
+    automatic_indexes = [
+        (query_name, problem)
+        for query_name, problems in report.items()
+        for problem in problems
+        if "AUTOMATIC" in problem
+    ]
+    assert automatic_indexes == []
+
+
+def test_rollups_match_raw_queries(database: Engine):
+    assert check_rollup_consistency(database) == {}
+
+
+def test_queries_read_rollups_while_current(database: Engine):
+    assert is_fact_current(database)
+    for query in QueryEnum:
+        sql_name, _ = get_query_sql(query.value, database)
+        assert sql_name == f"rollups/{get_query_sql(query.value)[0]}"
+
+
+def test_batched_queries_match_run_queries(csv_dataframes: dict, database: Engine):
+    # Sin tablas derivadas, run_queries evalúa QUERY_BATCHES sobre las crudas
+    engine = create_engine("sqlite://")
+    load(data_frames=csv_dataframes, database=engine, build_derived=False)
+    assert "delivered_items_base" in get_query_tasks(engine)
+    expected = run_queries(database)
+    actual = run_queries(engine)
+    assert list(actual) == list(expected)
+    for query_name in expected:
+        pd.testing.assert_frame_equal(
+            actual[query_name],
+            expected[query_name],
+            check_dtype=False,
+            check_exact=False,
+            rtol=0,
+            atol=ROLLUP_TOLERANCE,
+        )
+
+
+def test_year_pivot_extends_year_range(database: Engine):
+    query_name = "revenue_by_month_year"
+    default = query_revenue_by_month_year(database).result
+    extended = query_year_pivot(database, query_name, 2016, 2025).result
+    assert list(extended.columns) == ["month_no", "month"] + [
+        f"Year{year}" for year in range(2016, 2026)
+    ]
+    pd.testing.assert_frame_equal(extended[default.columns], default)
+
+
+def test_pandas_engine_matches_sql(database: Engine):
+    for query in get_all_queries():
+        pd.testing.assert_frame_equal(
+            query(database, "sql").result,
+            query(database, "pandas").result,
+            check_dtype=False,
+            check_exact=False,
+            rtol=0,
+            atol=0.011,
+        )
+
+
+def test_sqlite_round_matches_sqlite_on_halves():
+    values = np.array(
+        [5.265, 7.584999999999999, 1.004999999999999, 0.125, -5.265, -0.125, 2.675]
+    )
+    assert list(sqlite_round(values)) == [5.27, 7.59, 1.0, 0.13, -5.27, -0.13, 2.68]
+
+    # Toda mitad x.xx5 entre -1000 y 1000 redondea igual que ROUND() de SQLite
+    halves = (np.arange(-100_000, 100_000) * 10 + 5) / 1000
+    engine = create_engine("sqlite://")
+    pd.DataFrame({"x": halves}).to_sql("halves", engine, index=False)
+    expected = pd.read_sql("SELECT ROUND(x, 2) AS x FROM halves ORDER BY rowid", engine)
+    np.testing.assert_array_equal(sqlite_round(halves), expected["x"].to_numpy())
+
+
+def test_incremental_fold_matches_full_rebuild(
+    database: Engine, csv_dataframes: dict
+):
+    orders = csv_dataframes["olist_orders"]
+    items = csv_dataframes["olist_order_items"]
+    purchase = orders["order_purchase_timestamp"]
+    cuts = [pd.Timestamp.min, *purchase.quantile([0.7, 0.8, 0.9]), purchase.max()]
+    batches = []
+    for start, end in zip(cuts, cuts[1:]):
+        batch_orders = orders[(purchase > start) & (purchase <= end)]
+        batch_items = items[items["order_id"].isin(batch_orders["order_id"])]
+        batches.append(
+            {"olist_orders": batch_orders, "olist_order_items": batch_items}
+        )
+
+    incremental = create_engine("sqlite://")
+    load(data_frames={**csv_dataframes, **batches[0]}, database=incremental)
+    for batch in batches[1:]:
+        load_append(batch, incremental)
+
+    # Con los rollups al día, run_queries y el cubo leen de ellos en las dos bases
+    assert is_fact_current(incremental)
+    results = [
+        (run_queries(incremental), run_queries(database)),
+        (
+            dashboard_frames(build_cube(incremental)),
+            dashboard_frames(build_cube(database)),
+        ),
+    ]
+    for actual_results, expected in results:
+        for query_name, actual in actual_results.items():
+            pd.testing.assert_frame_equal(
+                actual,
+                expected[query_name],
+                check_dtype=False,
+                check_exact=False,
+                rtol=0,
+                atol=ROLLUP_TOLERANCE,
+            )
+
+    assert check_rollup_consistency(incremental) == {}
+
+
+def test_exported_results_match_queries(database: Engine, tmp_path):
+    for fmt in ("parquet", "arrow"):
+        export_dir = str(tmp_path / fmt)
+        export_queries(database, export_dir, fmt, chunksize=100)
+        for query in QueryEnum:
+            exported = read_export(query.value, export_dir, fmt)
+            pd.testing.assert_frame_equal(
+                exported.drop(columns="year", errors="ignore"),
+                pd.read_sql(read_query(query.value), database),
+                check_dtype=False,
+            )
+
+
+def test_checkpoints_resume_from_failed_stage():
+    engine = create_engine("sqlite://")
+
+    def failing_transform():
+        raise RuntimeError("no such table: olist_orders")
+
+    with raises(RuntimeError):
+        run_checkpointed(engine, "transform", "v1", failing_transform)
+    assert run_checkpointed(engine, "transform", "v1", lambda: 9) == (True, 9)
+    assert run_checkpointed(engine, "transform", "v1", lambda: 0) == (False, 9)
+    assert run_checkpointed(engine, "transform", "v2", lambda: 8) == (True, 8)
+
+
+@fixture(scope="session")
+def baseline_database(tmp_path_factory) -> Engine:
+    """Deterministic synthetic database the query baseline is recorded on."""
+    engine = build_baseline_database(str(tmp_path_factory.mktemp("baseline")))
+    yield engine
+    engine.dispose()
+
+
+def test_query_plans_and_times_match_baseline(baseline_database: Engine):
+    baseline = load_baseline()
+    if not baseline:
+        fail(
+            "falta tests/query_baseline.json: regístrala con "
+            "`python -m src.query_baseline` y agrégala al repositorio"
+        )
+    assert compare_to_baseline(profile_queries(baseline_database), baseline) == {}
+
+
+def test_partitioned_build_matches_queries(csv_dataframes: dict, tmp_path):
+    # Una base por clave: la caché de resultados de una no responde por la otra
+    for by in PARTITION_KEYS:
+        engine = create_engine(f"sqlite:///{tmp_path / f'partitioned_{by}.db'}")
+        load(data_frames=csv_dataframes, database=engine, build_derived=False)
+        expected = run_queries(engine)
+        data_version = get_data_version(engine)
+        for query_name, actual in run_partitioned(engine, by, 3).items():
+            pd.testing.assert_frame_equal(
+                actual,
+                expected[query_name],
+                check_dtype=False,
+                check_exact=False,
+                rtol=0,
+                atol=ROLLUP_TOLERANCE,
+            )
+        assert get_data_version(engine) != data_version
+        assert check_rollup_consistency(engine) == {}
+        # La tabla de hechos unida sigue sirviendo a sus consultas y a los folds
+        assert is_fact_current(engine) and get_fact_watermark(engine) is not None
+        for query_name, actual in run_fact_queries(engine).items():
+            pd.testing.assert_frame_equal(
+                actual,
+                pd.read_sql(read_query(query_name), engine),
+                check_dtype=False,
+                check_exact=False,
+                rtol=0,
+                atol=ROLLUP_TOLERANCE,
+            )
+        engine.dispose()
+
+
+def test_dashboard_data_refreshes_on_new_data_version(
+    csv_dataframes: dict, tmp_path, monkeypatch
+):
+    db_path = tmp_path / "dashboard.db"
+    data = DashboardData(str(db_path), refresh_seconds=3600, snapshot_root=None)
+    assert data.snapshot().version is None
+    assert data.snapshot().cube is None
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    load(data_frames=csv_dataframes, database=engine)
+    assert data.refresh()
+    snapshot = data.snapshot()
+    assert snapshot.error == ""
+    assert not data.refresh()
+
+    bump_data_version(engine)
+    with monkeypatch.context() as m:
+        m.setattr("src.dashboard_data.build_cube", lambda _: 1 / 0)
+        assert not data.refresh()
+        assert data.snapshot() == snapshot
+    # El error no deja guardada la marca: se reintenta sin que cambie el archivo
+    assert data.refresh()
+    assert data.snapshot().version != snapshot.version
+    data.stop()
+    engine.dispose()
+
+
+def test_dashboard_cube_matches_queries(database: Engine):
+    cube = build_cube(database)
+    frames = dashboard_frames(cube)
+    for query_name in DASHBOARD_QUERIES:
+        pd.testing.assert_frame_equal(
+            frames[query_name],
+            pd.read_sql(read_query(query_name), database),
+            check_dtype=False,
+            check_exact=False,
+            rtol=0,
+            atol=ROLLUP_TOLERANCE,
+        )
+
+    options = get_filter_options(cube)
+    revenue_2017 = dashboard_frames(cube, years=[2017])["revenue_by_month_year"]
+    pd.testing.assert_frame_equal(
+        revenue_2017, frames["revenue_by_month_year"][["month_no", "month", "Year2017"]]
+    )
+    every_category = dashboard_frames(cube, categories=options["category"])
+    pd.testing.assert_frame_equal(
+        every_category["top_10_revenue_categories"],
+        frames["top_10_revenue_categories"],
+    )
+
+
+def test_published_snapshot_serves_dashboard_without_sqlite(
+    database: Engine, tmp_path
+):
+    path = publish_snapshot(database, str(tmp_path))
+    assert publish_snapshot(database, str(tmp_path)) == path
+
+    data = DashboardData(
+        str(tmp_path / "missing.db"), refresh_seconds=3600, snapshot_root=str(tmp_path)
+    )
+    snapshot = data.snapshot()
+    assert snapshot.version == path.name
+    assert not snapshot.cube.sales["revenue"].to_numpy().flags.writeable
+    expected = dashboard_frames(build_cube(database))
+    actual = dashboard_frames(snapshot.cube)
+    for query_name in DASHBOARD_QUERIES:
+        pd.testing.assert_frame_equal(actual[query_name], expected[query_name])
+    data.stop()
+
+
+def test_dashboard_data_reads_published_snapshots_without_sqlite(
+    csv_dataframes: dict, tmp_path, monkeypatch
+):
+    db_path = tmp_path / "dashboard.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    load(data_frames=csv_dataframes, database=engine)
+    path = publish_snapshot(engine, str(tmp_path / "snapshots"))
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the dashboard opened SQLite")
+
+    # With a published snapshot neither startup nor refresh opens SQLite
+    monkeypatch.setattr("src.dashboard_data.create_engine", fail)
+    data = DashboardData(
+        str(db_path), refresh_seconds=3600, snapshot_root=str(tmp_path / "snapshots")
+    )
+    assert data.snapshot().version == path.name
+    assert not data.refresh()
+
+    # A reload without the publish step keeps serving the latest snapshot
+    bump_data_version(engine)
+    assert not data.refresh()
+    assert data.snapshot().version == path.name
+
+    path = publish_snapshot(engine, str(tmp_path / "snapshots"))
+    assert data.refresh()
+    assert data.snapshot().version == path.name
+    assert not data.snapshot().error
+    data.stop()
+    engine.dispose()